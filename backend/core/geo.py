@@ -0,0 +1,132 @@
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+ARQUIVO_MUNICIPIOS = Path(__file__).resolve().parent / 'dados' / 'municipios.csv'
+
+RAIO_TERRA_KM = 6371.0
+
+UFS = {
+    'ac', 'al', 'ap', 'am', 'ba', 'ce', 'df', 'es', 'go', 'ma', 'mt', 'ms', 'mg', 'pa',
+    'pb', 'pr', 'pe', 'pi', 'rj', 'rn', 'rs', 'ro', 'rr', 'sc', 'sp', 'se', 'to',
+}
+
+# Palavras finais ignoradas ao procurar a localidade e a UF no fim do endereço
+SUFIXOS_IGNORADOS = {'brasil', 'brazil'}
+
+# Separadores entre logradouro, bairro e cidade
+SEPARADORES = re.compile(r'[,;/\n]|\s[-–]\s')
+
+
+class Municipio(NamedTuple):
+    nome: str
+    uf: str
+    latitude: float
+    longitude: float
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e apenas letras separadas por um espaço"""
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.findall(r'[a-z]+', texto.lower()))
+
+
+class Gazetteer:
+    """Localiza municípios em endereços livres a partir da base local em CSV.
+
+    O arquivo é ordenado por população: em nomes repetidos sem UF informada
+    vence o município maior.
+    """
+
+    def __init__(self, municipios: List[Municipio]):
+        self.por_nome: Dict[str, List[Municipio]] = {}
+        for municipio in municipios:
+            self.por_nome.setdefault(normalizar(municipio.nome), []).append(municipio)
+
+    @classmethod
+    def carregar(cls, caminho: Path = ARQUIVO_MUNICIPIOS) -> 'Gazetteer':
+        with open(caminho, encoding='utf-8') as arquivo:
+            municipios = [
+                Municipio(linha['municipio'], linha['uf'].lower(),
+                          float(linha['latitude']), float(linha['longitude']))
+                for linha in csv.DictReader(arquivo)
+            ]
+        return cls(municipios)
+
+    def localizar(self, endereco: str) -> Optional[Municipio]:
+        """Município do endereço, ou None se não for possível identificá-lo com segurança.
+
+        Só a localidade no fim do endereço é considerada: o último componente
+        (separado por vírgula, barra ou " - "), ou o anterior à UF ("Campinas -
+        SP", "Rua X, 10 - Santos/SP", "Campinas SP"). Nomes de cidade em nomes
+        de rua ("Rua Santos, 12 - Atibaia - SP") nunca são usados: se a
+        localidade não é um município da base (da UF, quando informada), o
+        resultado é None.
+        """
+        localidade, uf = self._localidade(endereco)
+        candidatos = self.por_nome.get(localidade, [])
+        if uf is not None:
+            candidatos = [municipio for municipio in candidatos if municipio.uf == uf]
+        return candidatos[0] if candidatos else None
+
+    @staticmethod
+    def _localidade(endereco: str) -> Tuple[Optional[str], Optional[str]]:
+        """(localidade normalizada, UF) do fim do endereço"""
+        componentes = [normalizar(componente) for componente in SEPARADORES.split(endereco or '')]
+        # Sem letras (número, CEP) o componente fica vazio
+        componentes = [componente for componente in componentes if componente]
+        while componentes and componentes[-1] in SUFIXOS_IGNORADOS:
+            componentes.pop()
+        if not componentes:
+            return None, None
+
+        palavras = componentes[-1].split()
+        while palavras and palavras[-1] in SUFIXOS_IGNORADOS:
+            palavras.pop()
+        uf = None
+        if palavras and palavras[-1] in UFS:
+            uf = palavras.pop()
+            if not palavras:
+                # UF em componente próprio: a localidade é o componente anterior
+                componentes.pop()
+                palavras = componentes[-1].split() if componentes else []
+        return ' '.join(palavras) or None, uf
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    return Gazetteer.carregar()
+
+
+def coordenadas(endereco: str) -> Tuple[Optional[float], Optional[float]]:
+    """(latitude, longitude) do município do endereço, ou (None, None)"""
+    municipio = gazetteer().localizar(endereco)
+    if municipio is None:
+        return None, None
+    return municipio.latitude, municipio.longitude
+
+
+def distancia_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distância em km pela fórmula de haversine"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def caixa_delimitadora(latitude: float, longitude: float, raio_km: float) -> Tuple[float, float, float, float]:
+    """(lat_min, lat_max, lon_min, lon_max) que contém o círculo de `raio_km` em torno do ponto"""
+    angulo = raio_km / RAIO_TERRA_KM
+    delta_lat = math.degrees(angulo)
+    cos_lat = math.cos(math.radians(latitude))
+    if math.sin(angulo) < cos_lat:
+        delta_lon = math.degrees(math.asin(math.sin(angulo) / cos_lat))
+    else:
+        # Círculo alcança um polo: todas as longitudes
+        delta_lon = 180.0
+    return latitude - delta_lat, latitude + delta_lat, longitude - delta_lon, longitude + delta_lon
@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase
+
+from core.geo import coordenadas, gazetteer
+
+
+class LocalizarMunicipioTests(SimpleTestCase):
+    def assertMunicipio(self, endereco, nome, uf):
+        municipio = gazetteer().localizar(endereco)
+        self.assertIsNotNone(municipio, endereco)
+        self.assertEqual((municipio.nome, municipio.uf), (nome, uf))
+
+    def test_cidade_antes_da_uf(self):
+        self.assertMunicipio('Campinas - SP', 'Campinas', 'sp')
+        self.assertMunicipio('Rua X, 10 - Santos/SP', 'Santos', 'sp')
+        self.assertMunicipio('Campinas-SP', 'Campinas', 'sp')
+        self.assertMunicipio('Campinas, SP, Brasil', 'Campinas', 'sp')
+        self.assertMunicipio('Rua Belém, 5 - São Paulo - SP', 'São Paulo', 'sp')
+
+    def test_cidade_no_fim_sem_uf(self):
+        self.assertMunicipio('São Paulo', 'São Paulo', 'sp')
+        self.assertMunicipio('Rua A, 10, Campinas, 13000-000', 'Campinas', 'sp')
+        self.assertMunicipio('Rio de Janeiro, Brasil', 'Rio de Janeiro', 'rj')
+
+    def test_rua_com_nome_de_cidade_nao_e_a_cidade(self):
+        for endereco in (
+            'Rua Santos, 12 - Atibaia - SP',
+            'Avenida Campinas 100, Bragança Paulista/SP',
+            'Rua Goiânia 10, Trindade - GO',
+            'Avenida Belém 30, Atibaia',
+            'Rua Santos, 12',
+        ):
+            with self.subTest(endereco=endereco):
+                self.assertIsNone(gazetteer().localizar(endereco))
+                self.assertEqual(coordenadas(endereco), (None, None))
+
+    def test_uf_incompativel(self):
+        self.assertIsNone(gazetteer().localizar('Campinas - RJ'))
+
+    def test_endereco_vazio(self):
+        self.assertIsNone(gazetteer().localizar(''))
+        self.assertIsNone(gazetteer().localizar('SP'))
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db import transaction
 from .models import (
     Curriculo, Escolaridade, ExperienciaProfissional, 
     Habilidade, Curso, Idioma, TipoVagaProcurada
@@ -87,6 +88,7 @@ class CurriculoCreateSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('trabalhador',)
     
+    @transaction.atomic
     def create(self, validated_data):
         # Extrair dados dos relacionamentos
         escolaridades_data = validated_data.pop('escolaridades', [])
@@ -120,6 +122,7 @@ class CurriculoCreateSerializer(serializers.ModelSerializer):
         
         return curriculo
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         # Extrair dados dos relacionamentos
         escolaridades_data = validated_data.pop('escolaridades', None)
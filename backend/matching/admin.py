@@ -1,10 +1,10 @@
 from django.contrib import admin
-from .models import MatchingResult, HistoricoMatching
+from .models import MatchingResult, HistoricoMatching, MatchingJob, ConfiguracaoMatching, ExecucaoRematch
 
 @admin.register(MatchingResult)
 class MatchingResultAdmin(admin.ModelAdmin):
-    list_display = ('trabalhador', 'vaga', 'score_total', 'data_calculo')
-    list_filter = ('data_calculo', 'score_total')
+    list_display = ('trabalhador', 'vaga', 'score_total', 'config_versao', 'data_calculo')
+    list_filter = ('data_calculo', 'score_total', 'config_versao')
     search_fields = ('trabalhador__first_name', 'trabalhador__last_name', 'vaga__titulo')
     ordering = ['-score_total']
 
@@ -14,3 +14,28 @@ class HistoricoMatchingAdmin(admin.ModelAdmin):
     list_filter = ('data_execucao',)
     search_fields = ('vaga__titulo',)
     date_hierarchy = 'data_execucao'
+
+@admin.register(MatchingJob)
+class MatchingJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'vaga', 'status', 'candidatos_processados', 'total_candidatos', 'data_criacao', 'data_fim')
+    list_filter = ('status', 'data_criacao')
+    search_fields = ('vaga__titulo', 'task_id')
+
+@admin.register(ConfiguracaoMatching)
+class ConfiguracaoMatchingAdmin(admin.ModelAdmin):
+    """Versões são imutáveis; novas versões são criadas pela API de configuração"""
+    list_display = ('versao', 'peso_experiencia', 'peso_habilidades', 'peso_escolaridade',
+                    'peso_localizacao', 'peso_salario', 'peso_texto', 'score_minimo_top', 'score_compativel',
+                    'criado_por', 'data_criacao')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(ExecucaoRematch)
+class ExecucaoRematchAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'config_versao', 'vagas_processadas', 'total_vagas',
+                    'candidatos_avaliados', 'duracao_segundos', 'sessoes', 'data_inicio', 'data_fim')
+    list_filter = ('status', 'data_inicio')
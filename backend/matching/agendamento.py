@@ -0,0 +1,28 @@
+from django.db import transaction
+
+
+def agendar_apos_commit(chave, funcao, *args):
+    """Agenda `funcao(*args)` para o fim da transação atual, uma vez por chave.
+
+    Várias alterações no mesmo currículo dentro de uma transação (por exemplo a
+    criação aninhada do CurriculoCreateSerializer) geram uma única execução.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        # Fora de transação on_commit executa na hora: não há o que agrupar
+        transaction.on_commit(lambda: funcao(*args))
+        return
+
+    # As chaves valem enquanto a lista de callbacks da conexão for a mesma:
+    # commit, rollback e rollback de savepoint trocam a lista, e as chaves de
+    # callbacks que não vão mais rodar não podem bloquear novos agendamentos.
+    # (Após o rollback de um savepoint, uma chave que sobreviveu pode ser
+    # agendada de novo; a execução repetida é inofensiva.)
+    callbacks, pendentes = getattr(connection, 'matching_agendados', (None, None))
+    if callbacks is not connection.run_on_commit:
+        pendentes = set()
+        connection.matching_agendados = (connection.run_on_commit, pendentes)
+    if chave in pendentes:
+        return
+    pendentes.add(chave)
+    transaction.on_commit(lambda: funcao(*args))
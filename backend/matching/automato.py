@@ -0,0 +1,61 @@
+from collections import deque
+from typing import Iterable, Set
+
+
+class AhoCorasick:
+    """Automato de Aho-Corasick para buscar vários padrões em uma única passada.
+
+    `encontrar(texto)` retorna exatamente os padrões `p` para os quais
+    `p in texto` seria verdadeiro, em tempo linear no tamanho do texto.
+    """
+
+    def __init__(self, padroes: Iterable[str]):
+        self.transicoes = [{}]
+        self.falha = [0]
+        self.saida = [set()]
+
+        for padrao in set(padroes):
+            self._inserir(padrao)
+        self._construir_falhas()
+
+    def _inserir(self, padrao: str):
+        estado = 0
+        for caractere in padrao:
+            proximo = self.transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self.transicoes)
+                self.transicoes.append({})
+                self.falha.append(0)
+                self.saida.append(set())
+                self.transicoes[estado][caractere] = proximo
+            estado = proximo
+        self.saida[estado].add(padrao)
+
+    def _construir_falhas(self):
+        fila = deque(self.transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self.transicoes[estado].items():
+                fila.append(proximo)
+                falha = self.falha[estado]
+                while falha and caractere not in self.transicoes[falha]:
+                    falha = self.falha[falha]
+                destino = self.transicoes[falha].get(caractere, 0)
+                self.falha[proximo] = destino if destino != proximo else 0
+                self.saida[proximo] |= self.saida[self.falha[proximo]]
+
+    def encontrar(self, texto: str) -> Set[str]:
+        """Retorna o conjunto de padrões que ocorrem no texto"""
+        encontrados = set(self.saida[0])
+        transicoes = self.transicoes
+        falha = self.falha
+        estado = 0
+
+        for caractere in texto:
+            while estado and caractere not in transicoes[estado]:
+                estado = falha[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            if self.saida[estado]:
+                encontrados |= self.saida[estado]
+
+        return encontrados
@@ -0,0 +1,295 @@
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.geo import distancia_km
+from vagas.models import Vaga
+from .automato import AhoCorasick
+from .models import CurriculoFeatures
+from .requisitos import compilar_requisitos
+
+
+class BatchScorer:
+    """Calcula os scores de uma vaga para uma população inteira de currículos.
+
+    Lê um registro de CurriculoFeatures por candidato. As comparações de texto
+    continuam sendo feitas por currículo, mas apenas para extrair as colunas
+    numéricas; toda a aritmética dos cinco scores e do score total é feita de
+    uma vez sobre arrays NumPy, na mesma ordem de operações do cálculo linha a
+    linha para que os resultados sejam idênticos.
+    """
+
+    NIVEL_EXPERIENCIA_ANOS = {
+        'estagiario': 0,
+        'junior': 2,
+        'pleno': 5,
+        'senior': 8,
+        'especialista': 12
+    }
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def calcular(self, features: List[CurriculoFeatures], vaga: Vaga) -> List[Dict]:
+        """Retorna os dados de score de cada currículo, na ordem recebida"""
+        return self.montar(self.pontuar(list(features), vaga))
+
+    def pontuar(self, features: List[CurriculoFeatures], vaga: Vaga,
+                relevancias: Dict[int, float] = None) -> List[Tuple]:
+        """Calcula os scores de cada currículo.
+
+        Cada linha é (score_total, score_experiencia, score_habilidades,
+        score_escolaridade, score_localizacao, score_salario, score_texto), já
+        arredondada.
+        `relevancias` (curriculo_id -> BM25) evita consultar o índice de texto,
+        como nos workers de matching.paralelo.
+        """
+        if not features:
+            return []
+
+        colunas = self._extrair_colunas(features, vaga)
+
+        score_experiencia = self._score_experiencia(colunas, vaga)
+        score_habilidades = self._score_habilidades(colunas)
+        score_escolaridade = self._score_escolaridade(colunas)
+        score_localizacao = self._score_localizacao(colunas, vaga)
+        score_salario = self._score_salario(colunas, vaga)
+        score_texto = self._score_texto(features, vaga, relevancias)
+
+        pesos = self.engine.pesos
+        score_total = (
+            score_experiencia * pesos['experiencia'] +
+            score_habilidades * pesos['habilidades'] +
+            score_escolaridade * pesos['escolaridade'] +
+            score_localizacao * pesos['localizacao'] +
+            score_salario * pesos['salario'] +
+            score_texto * pesos['texto']
+        )
+
+        # round() do Python em vez de np.round para preservar o arredondamento
+        # exato do cálculo linha a linha
+        return [
+            (round(total, 2), round(experiencia, 2), round(habilidades, 2),
+             round(escolaridade, 2), round(localizacao, 2), round(salario, 2), round(texto, 2))
+            for total, experiencia, habilidades, escolaridade, localizacao, salario, texto in zip(
+                score_total.tolist(), score_experiencia.tolist(), score_habilidades.tolist(),
+                score_escolaridade.tolist(), score_localizacao.tolist(), score_salario.tolist(),
+                score_texto.tolist()
+            )
+        ]
+
+    def montar(self, linhas: List[Tuple]) -> List[Dict]:
+        """Monta os dados de score das linhas informadas"""
+        return [
+            {
+                'score_total': linha[0],
+                'score_experiencia': linha[1],
+                'score_habilidades': linha[2],
+                'score_escolaridade': linha[3],
+                'score_localizacao': linha[4],
+                'score_salario': linha[5],
+                'score_texto': linha[6],
+            }
+            for linha in linhas
+        ]
+
+    def detalhes(self, features: List[CurriculoFeatures], vaga: Vaga, requisitos=None) -> List[Dict]:
+        """Monta detalhes_matching de cada currículo, na ordem recebida.
+
+        Equivalente a MatchingEngine._detalhes_curriculo_vaga. Não faz parte
+        da pontuação: é chamado apenas para os resultados exibidos.
+        """
+        if requisitos is None:
+            requisitos = vaga.requisitos_detalhados.all()
+        plano = compilar_requisitos(requisitos)
+        area = vaga.area.lower()
+        hoje = date.today()
+        anos_nivel = self.NIVEL_EXPERIENCIA_ANOS.get(vaga.nivel_experiencia, 0)
+        pretensao = np.array([
+            float(registro.pretensao_salarial) if registro.pretensao_salarial else np.nan
+            for registro in features
+        ])
+        salario_compativel = self._score_salario({'pretensao': pretensao}, vaga) > 0.5
+
+        return [
+            {
+                'area_compativel': registro.areas_interesse is not None and area in registro.areas_interesse,
+                'nivel_experiencia_compativel': registro.total_anos(hoje) >= anos_nivel,
+                **plano.avaliar(registro.habilidades, registro.tem_habilitacao, registro.maior_nivel_escolaridade),
+                'salario_compativel': salario_ok,
+            }
+            for registro, salario_ok in zip(features, salario_compativel.tolist())
+        ]
+
+    def _extrair_colunas(self, features: List[CurriculoFeatures], vaga: Vaga) -> Dict[str, np.ndarray]:
+        """Extrai as features numéricas de cada currículo em arrays colunares"""
+        n = len(features)
+        tem_experiencia = np.zeros(n, dtype=bool)
+        total_anos = np.zeros(n)
+        bonus_experiencia = np.zeros(n)
+        total_habilidades = np.zeros(n, dtype=np.int64)
+        habilidades_encontradas = np.zeros(n, dtype=np.int64)
+        tem_escolaridade = np.zeros(n, dtype=bool)
+        maior_nivel = np.zeros(n)
+        curso_relacionado = np.zeros(n, dtype=bool)
+        tem_perfil = np.zeros(n, dtype=bool)
+        endereco_similar = np.zeros(n, dtype=bool)
+        distancia = np.full(n, np.nan)
+        disponibilidade_mudanca = np.zeros(n, dtype=bool)
+        pretensao = np.full(n, np.nan)
+
+        hoje = date.today()
+        area = vaga.area.lower()
+        requisitos_texto = f"{vaga.requisitos} {vaga.descricao}".lower()
+        local_vaga = vaga.local_trabalho.lower()
+        similar = self.engine._similar_text
+
+        # O texto da vaga é varrido uma única vez contra todo o vocabulário de
+        # habilidades; por candidato resta apenas consultar o conjunto de acertos
+        vocabulario = {h for registro in features for h in registro.habilidades}
+        habilidades_no_texto = AhoCorasick(vocabulario).encontrar(requisitos_texto)
+
+        for i, registro in enumerate(features):
+            tem_experiencia[i] = bool(registro.experiencias)
+            total_anos[i] = registro.total_anos(hoje)
+            bonus = 0.0
+            for _, _, cargo, descricao in registro.experiencias:
+                if similar(cargo, vaga.titulo) > 0.6:
+                    bonus += 0.3
+                if area in descricao:
+                    bonus += 0.2
+            bonus_experiencia[i] = bonus
+
+            habilidades = registro.habilidades
+            total_habilidades[i] = len(habilidades)
+            habilidades_encontradas[i] = sum(1 for h in habilidades if h in habilidades_no_texto)
+
+            if registro.maior_nivel_escolaridade:
+                tem_escolaridade[i] = True
+                maior_nivel[i] = registro.maior_nivel_escolaridade
+                curso_relacionado[i] = any(
+                    similar(curso, vaga.area) > 0.5 for curso in registro.cursos
+                )
+
+            if not vaga.aceita_remoto and registro.tem_perfil:
+                tem_perfil[i] = True
+                if registro.latitude is not None and vaga.latitude is not None:
+                    distancia[i] = distancia_km(
+                        registro.latitude, registro.longitude, vaga.latitude, vaga.longitude
+                    )
+                else:
+                    endereco_similar[i] = similar(registro.endereco, local_vaga) > 0.6
+            disponibilidade_mudanca[i] = registro.disponibilidade_mudanca
+
+            if registro.pretensao_salarial:
+                pretensao[i] = float(registro.pretensao_salarial)
+
+        return {
+            'tem_experiencia': tem_experiencia,
+            'total_anos': total_anos,
+            'bonus_experiencia': bonus_experiencia,
+            'total_habilidades': total_habilidades,
+            'habilidades_encontradas': habilidades_encontradas,
+            'tem_escolaridade': tem_escolaridade,
+            'maior_nivel': maior_nivel,
+            'curso_relacionado': curso_relacionado,
+            'tem_perfil': tem_perfil,
+            'endereco_similar': endereco_similar,
+            'distancia': distancia,
+            'disponibilidade_mudanca': disponibilidade_mudanca,
+            'pretensao': pretensao,
+        }
+
+    def _score_experiencia(self, colunas: Dict[str, np.ndarray], vaga: Vaga) -> np.ndarray:
+        anos_requeridos = self.NIVEL_EXPERIENCIA_ANOS.get(vaga.nivel_experiencia, 2)
+        total_anos = colunas['total_anos']
+
+        if anos_requeridos:
+            proporcional = (total_anos / anos_requeridos) * 0.5
+        else:
+            proporcional = np.full_like(total_anos, 0.5)
+
+        score = colunas['bonus_experiencia'] + np.where(
+            total_anos >= anos_requeridos, 0.5, proporcional
+        )
+        score = np.minimum(score, 1.0)
+        return np.where(colunas['tem_experiencia'], score, 0.0)
+
+    def _score_habilidades(self, colunas: Dict[str, np.ndarray]) -> np.ndarray:
+        total = colunas['total_habilidades']
+        encontradas = colunas['habilidades_encontradas']
+
+        # Soma acumulada de 0.1 na mesma ordem do laço original, indexada pela
+        # quantidade de habilidades encontradas
+        acumulado = np.zeros(int(encontradas.max()) + 1)
+        for k in range(1, len(acumulado)):
+            acumulado[k] = acumulado[k - 1] + 0.1
+
+        score = acumulado[encontradas]
+        com_habilidades = total > 0
+        proporcao = np.divide(
+            encontradas, total, out=np.zeros(len(total)), where=com_habilidades
+        )
+        score = np.where(encontradas > 0, score + proporcao * 0.5, score)
+        score = np.minimum(score, 1.0)
+        return np.where(com_habilidades, score, 0.0)
+
+    def _score_escolaridade(self, colunas: Dict[str, np.ndarray]) -> np.ndarray:
+        score = colunas['maior_nivel'] / 10.0
+        score = np.where(colunas['curso_relacionado'], score + 0.2, score)
+        score = np.minimum(score, 1.0)
+        return np.where(colunas['tem_escolaridade'], score, 0.3)
+
+    def _score_localizacao(self, colunas: Dict[str, np.ndarray], vaga: Vaga) -> np.ndarray:
+        n = len(colunas['tem_perfil'])
+        if vaga.aceita_remoto:
+            return np.ones(n)
+
+        alternativa = np.where(colunas['disponibilidade_mudanca'], 0.7, 0.3)
+        score_endereco = np.where(colunas['endereco_similar'], 1.0, alternativa)
+
+        # Mesma faixa de MatchingEngine._score_distancia
+        distancia = colunas['distancia']
+        raio_local = self.engine.raio_local_km
+        raio_deslocamento = self.engine.raio_deslocamento_km
+        score_distancia = np.where(distancia <= raio_local, 1.0, alternativa)
+        if raio_deslocamento > raio_local:
+            proximidade = 1.0 - (distancia - raio_local) / (raio_deslocamento - raio_local) * 0.7
+            intermediario = (distancia > raio_local) & (distancia < raio_deslocamento)
+            score_distancia = np.where(intermediario, np.maximum(proximidade, alternativa), score_distancia)
+
+        score = np.where(np.isnan(distancia), score_endereco, score_distancia)
+        return np.where(colunas['tem_perfil'], score, 0.5)
+
+    def _score_salario(self, colunas: Dict[str, np.ndarray], vaga: Vaga) -> np.ndarray:
+        pretensao = colunas['pretensao']
+        n = len(pretensao)
+
+        if not vaga.salario_min and not vaga.salario_max:
+            return np.full(n, 0.8)
+
+        sem_pretensao = np.isnan(pretensao)
+        pretensao = np.where(sem_pretensao, 0.0, pretensao)
+        salario_min = float(vaga.salario_min or 0)
+        if vaga.salario_max:
+            salario_max = np.full(n, float(vaga.salario_max))
+        else:
+            salario_max = pretensao * 2
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diferenca_percentual = (pretensao - salario_max) / salario_max
+        acima = np.maximum(0.0, 1.0 - diferenca_percentual)
+
+        score = np.where(
+            (salario_min <= pretensao) & (pretensao <= salario_max), 1.0,
+            np.where(pretensao < salario_min, 0.9,
+                     np.where(pretensao > salario_max, acima, 0.5))
+        )
+        return np.where(sem_pretensao, 0.6, score)
+
+    def _score_texto(self, features: List[CurriculoFeatures], vaga: Vaga,
+                     relevancias: Dict[int, float] = None) -> np.ndarray:
+        if relevancias is None:
+            relevancias = self.engine._relevancia(vaga).scores()
+        return np.array([relevancias.get(registro.curriculo_id, 0.0) for registro in features])
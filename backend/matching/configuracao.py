@@ -0,0 +1,113 @@
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, DecimalField
+from django.db.models.functions import Cast, Round
+
+from .models import ConfiguracaoMatching, MatchingResult
+
+_cache = {'configuracao': None, 'expira_em': 0.0}
+
+CAMPOS_PESO = (
+    'peso_experiencia', 'peso_habilidades', 'peso_escolaridade',
+    'peso_localizacao', 'peso_salario', 'peso_texto',
+)
+# Somas mais próximas de 1 que isso são mantidas como informadas
+TOLERANCIA_SOMA_PESOS = 1e-6
+
+
+def configuracao_atual() -> ConfiguracaoMatching:
+    """Versão vigente da configuração, memorizada no processo.
+
+    O cache expira após MATCHING_CONFIG_CACHE_TTL segundos para que outros
+    processos (workers do Celery, outros servidores) vejam novas versões; no
+    processo que cria a versão ele é limpo imediatamente.
+    """
+    agora = time.monotonic()
+    if _cache['configuracao'] is None or agora >= _cache['expira_em']:
+        # Sem nenhuma versão gravada valem os padrões da versão 1
+        _cache['configuracao'] = ConfiguracaoMatching.objects.first() or ConfiguracaoMatching(versao=1)
+        _cache['expira_em'] = agora + getattr(settings, 'MATCHING_CONFIG_CACHE_TTL', 60)
+    return _cache['configuracao']
+
+
+def limpar_cache():
+    _cache['configuracao'] = None
+
+
+def normalizar_pesos(campos: dict) -> dict:
+    """Divide os pesos pela soma para que score_total fique entre 0 e 1.
+
+    Os limiares de classificação, o índice parcial dos top candidatos e as
+    faixas das estatísticas supõem scores nessa escala.
+    """
+    total = sum(campos[campo] for campo in CAMPOS_PESO)
+    if total <= 0:
+        raise ValueError('Ao menos um peso deve ser maior que zero.')
+    if abs(total - 1) <= TOLERANCIA_SOMA_PESOS:
+        return campos
+    return {**campos, **{campo: campos[campo] / total for campo in CAMPOS_PESO}}
+
+
+def nova_versao(criado_por=None, descricao: str = '', **valores) -> ConfiguracaoMatching:
+    """Grava uma nova versão partindo da vigente com os valores alterados.
+
+    `valores` aceita os campos de ConfiguracaoMatching (peso_*, score_minimo_top,
+    score_compativel). Os pesos resultantes são normalizados para somar 1.
+    """
+    # A unicidade de `versao` resolve criações concorrentes: quem perder tenta de novo
+    for _ in range(3):
+        try:
+            with transaction.atomic():
+                # A base é a última versão gravada, não a do cache do processo,
+                # para não desfazer uma versão criada há pouco por outro processo
+                atual = ConfiguracaoMatching.objects.first()
+                campos = normalizar_pesos({
+                    campo: valores.get(campo, getattr(atual or ConfiguracaoMatching(), campo))
+                    for campo in CAMPOS_PESO + ('score_minimo_top', 'score_compativel')
+                })
+                configuracao = ConfiguracaoMatching.objects.create(
+                    versao=(atual.versao if atual else 0) + 1, criado_por=criado_por,
+                    descricao=descricao, **campos
+                )
+            break
+        except IntegrityError:
+            continue
+    else:
+        raise IntegrityError('Não foi possível reservar um número de versão.')
+
+    limpar_cache()
+    return configuracao
+
+
+def recalcular_scores(configuracao: ConfiguracaoMatching = None, vaga_ids=None) -> int:
+    """Recalcula score_total no banco a partir das colunas de componentes.
+
+    Apenas resultados calculados com outra versão são atualizados, em um único
+    UPDATE; os componentes e os detalhes não são pontuados de novo. Retorna a
+    quantidade de resultados atualizados.
+    """
+    configuracao = configuracao or configuracao_atual()
+    pesos = configuracao.pesos
+    soma = (
+        F('score_experiencia') * pesos['experiencia'] +
+        F('score_habilidades') * pesos['habilidades'] +
+        F('score_escolaridade') * pesos['escolaridade'] +
+        F('score_localizacao') * pesos['localizacao'] +
+        F('score_salario') * pesos['salario'] +
+        F('score_texto') * pesos['texto']
+    )
+    # ROUND com casas decimais exige numeric no PostgreSQL
+    score_total = Cast(
+        Round(Cast(soma, DecimalField(max_digits=12, decimal_places=6)), 2), FloatField()
+    )
+
+    resultados = MatchingResult.objects.exclude(config_versao=configuracao.versao)
+    if vaga_ids is not None:
+        resultados = resultados.filter(vaga_id__in=vaga_ids)
+    atualizados = resultados.update(score_total=score_total, config_versao=configuracao.versao)
+
+    from .estatisticas import invalidar_estatisticas
+    invalidar_estatisticas()
+    return atualizados
@@ -0,0 +1,62 @@
+from typing import Dict, Iterable, List
+
+from curriculos.models import Curriculo
+from vagas.models import Vaga
+from .batch import BatchScorer
+from .features import garantir_features
+from .models import CurriculoFeatures, MatchingResult
+
+
+def features_por_trabalhador(trabalhador_ids: Iterable[int]) -> Dict[int, CurriculoFeatures]:
+    """Features dos currículos dos trabalhadores, por trabalhador_id, criando as que faltarem"""
+    trabalhador_ids = set(trabalhador_ids)
+    garantir_features(Curriculo.objects.filter(trabalhador_id__in=trabalhador_ids))
+    return {
+        features.trabalhador_id: features
+        for features in CurriculoFeatures.objects.filter(trabalhador_id__in=trabalhador_ids)
+    }
+
+
+def preencher_detalhes(resultados: Iterable[MatchingResult], engine=None) -> List[MatchingResult]:
+    """Calcula e grava detalhes_matching dos resultados que ainda não têm.
+
+    A pontuação em massa grava apenas os scores (e limpa os detalhes do par
+    pontuado); os detalhes são montados a partir das features atuais quando o
+    resultado é exibido e ficam gravados até a próxima pontuação.
+    """
+    resultados = list(resultados)
+    pendentes = [resultado for resultado in resultados if not resultado.detalhes_matching]
+    if not pendentes:
+        return resultados
+
+    if engine is None:
+        from .engine import MatchingEngine
+        engine = MatchingEngine()
+    scorer = BatchScorer(engine)
+
+    features = features_por_trabalhador(resultado.trabalhador_id for resultado in pendentes)
+    vagas = Vaga.objects.prefetch_related('requisitos_detalhados').in_bulk(
+        {resultado.vaga_id for resultado in pendentes}
+    )
+
+    por_vaga = {}
+    for resultado in pendentes:
+        # Sem currículo não há o que detalhar; o resultado sai como está
+        if resultado.trabalhador_id in features:
+            por_vaga.setdefault(resultado.vaga_id, []).append(resultado)
+
+    calculados = []
+    for vaga_id, grupo in por_vaga.items():
+        vaga = vagas[vaga_id]
+        detalhes = scorer.detalhes(
+            [features[resultado.trabalhador_id] for resultado in grupo], vaga,
+            list(vaga.requisitos_detalhados.all())
+        )
+        for resultado, detalhes_matching in zip(grupo, detalhes):
+            resultado.detalhes_matching = detalhes_matching
+            calculados.append(resultado)
+
+    MatchingResult.objects.bulk_update(
+        [resultado for resultado in calculados if resultado.pk is not None], ['detalhes_matching']
+    )
+    return resultados
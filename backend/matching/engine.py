@@ -1,49 +1,398 @@
 import re
-from typing import List, Dict, Tuple
-from difflib import SequenceMatcher
-from django.db.models import Q
+from functools import wraps
+from typing import Callable, List, Dict, Optional, Tuple
+from django.conf import settings
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value, Window
+from django.db.models.functions import RowNumber
+from core.geo import coordenadas, distancia_km
 from curriculos.models import Curriculo
-from vagas.models import Vaga, RequisitoVaga
-from .models import MatchingResult
+from vagas.models import Vaga
+from .models import MatchingResult, HistoricoMatching, CurriculoFeatures
+from .batch import BatchScorer
+from .configuracao import configuracao_atual
+from .detalhes import features_por_trabalhador
+from .estatisticas import invalidar_estatisticas
+from .features import NIVEL_ESCOLARIDADE, garantir_features
+from .indice import curriculos_relacionados
+from .instrumentacao import Perfilador, fase
+from .similaridade import get_similaridade
+from .paralelo import pode_criar_processos, pontuar_em_paralelo
+from .persistence import MatchingResultWriter
+from .requisitos import PlanoRequisitos, compilar_requisitos
+from .restricoes import aplicar_restricoes, vagas_bloqueadas
+from .selecao import SelecaoResultados
+from .texto import RelevanciaTexto, frequencias_curriculo
+
+# Métodos medidos individualmente quando a instrumentação está ativa
+COMPONENTES_ENGINE = (
+    '_score_experiencia', '_score_habilidades', '_score_escolaridade',
+    '_score_localizacao', '_score_salario', '_score_texto', '_verifica_requisitos', '_similar_text',
+)
+COMPONENTES_BATCH = (
+    '_extrair_colunas', '_score_experiencia', '_score_habilidades', '_score_escolaridade',
+    '_score_localizacao', '_score_salario', '_score_texto', 'montar',
+)
+
+
+def instrumentado(metodo):
+    """Mede a execução com um Perfilador quando o engine tem `instrumentar` ativo"""
+    @wraps(metodo)
+    def executar(self, *args, **kwargs):
+        if not self.instrumentar:
+            return metodo(self, *args, **kwargs)
+        
+        self._perfilador = Perfilador()
+        self._perfilador.instrumentar(self, COMPONENTES_ENGINE)
+        try:
+            with self._perfilador.ativo():
+                return metodo(self, *args, **kwargs)
+        finally:
+            Perfilador.remover(self, COMPONENTES_ENGINE)
+            self.instrumentacao = self._perfilador.relatorio
+            self._perfilador = None
+    return executar
 
 class MatchingEngine:
     """Engine de matching entre currículos e vagas"""
     
-    def __init__(self):
-        self.pesos = {
-            'experiencia': 0.3,
-            'habilidades': 0.25,
-            'escolaridade': 0.2,
-            'localizacao': 0.15,
-            'salario': 0.1
-        }
+    def __init__(self, similaridade: str = None, instrumentar: bool = None,
+                 configuracao=None, raio_local_km: float = None, raio_deslocamento_km: float = None):
+        self.similaridade = get_similaridade(similaridade)
+        # Pesos e limiares da versão vigente de ConfiguracaoMatching; quem já
+        # tem a configuração (como os workers do pontuar_em_paralelo) a informa
+        # e o engine é criado sem acessar o banco
+        self.configuracao = configuracao or configuracao_atual()
+        self.pesos = dict(self.configuracao.pesos)
+        # Até raio_local_km o candidato é local; daí até raio_deslocamento_km o
+        # score de localização cai linearmente
+        if raio_local_km is None:
+            raio_local_km = getattr(settings, 'MATCHING_RAIO_LOCAL_KM', 30)
+        if raio_deslocamento_km is None:
+            raio_deslocamento_km = getattr(settings, 'MATCHING_RAIO_DESLOCAMENTO_KM', 100)
+        self.raio_local_km = raio_local_km
+        self.raio_deslocamento_km = raio_deslocamento_km
+        self.estatisticas_persistencia = {}
+        self.estatisticas_execucao = {}
+        # RelevanciaTexto e PlanoRequisitos por vaga, renovados a cada execução
+        self._relevancias = {}
+        self._planos = {}
+        
+        # Tempo, chamadas e consultas SQL por fase e componente da última execução
+        if instrumentar is None:
+            instrumentar = getattr(settings, 'MATCHING_INSTRUMENTACAO', False)
+        self.instrumentar = instrumentar
+        self.instrumentacao = {}
+        self._perfilador = None
+    
+    @instrumentado
+    def calcular_matching_vaga(self, vaga: Vaga, vetorizado: bool = True,
+                               batch_size: int = None,
+                               pre_filtro_habilidades: bool = None,
+                               restricoes=None,
+                               curriculos_ids=None,
+                               top_k: int = None,
+                               score_minimo: float = None,
+                               workers: int = None,
+                               callback_progresso: Callable[[int, int], None] = None) -> List[MatchingResult]:
+        """Calcula matching para todos os candidatos de uma vaga.
+        
+        Com `top_k` e/ou `score_minimo` apenas os melhores resultados são
+        persistidos, e resultados antigos que deixaram de se qualificar são
+        removidos. Com `workers` > 1 a pontuação vetorizada é distribuída
+        entre processos.
+        
+        `restricoes` (True, ou nomes de matching.restricoes.RESTRICOES) descarta
+        no banco, antes da pontuação, quem viola restrições eliminatórias da
+        vaga; os resultados antigos desses candidatos são removidos.
+        `pre_filtro_habilidades` pontua apenas quem compartilha alguma habilidade
+        ou área com a vaga. Omitidos, ambos vêm das settings MATCHING_RESTRICOES
+        e MATCHING_PRE_FILTRO_HABILIDADES.
+        
+        `callback_progresso(pontuados, total)` é chamado a cada lote de
+        candidatos pontuados.
+        """
+        self._relevancias = {}
+        self._planos = {}
+        with fase(self._perfilador, 'carregar'):
+            # Buscar currículos de trabalhadores ativos e aprovados
+            curriculos = Curriculo.objects.filter(
+                trabalhador__tipo_usuario='trabalhador',
+                trabalhador__aprovado=True,
+                trabalhador__ativo=True
+            )
+            
+            # Recálculo incremental de um subconjunto de candidatos; o top-K só
+            # faz sentido sobre a população inteira
+            if curriculos_ids is not None:
+                curriculos = curriculos.filter(id__in=curriculos_ids)
+                top_k = 0
+            
+            # Pontuar apenas quem compartilha alguma habilidade ou área com a vaga
+            if pre_filtro_habilidades is None:
+                pre_filtro_habilidades = getattr(settings, 'MATCHING_PRE_FILTRO_HABILIDADES', False)
+            if pre_filtro_habilidades:
+                garantir_features(curriculos)
+                curriculos = curriculos.filter(id__in=curriculos_relacionados(vaga))
+            
+            if restricoes is None:
+                restricoes = getattr(settings, 'MATCHING_RESTRICOES', '')
+            curriculos, estatisticas_restricoes = aplicar_restricoes(curriculos, vaga, restricoes)
+        
+        selecao = self._nova_selecao(top_k, score_minimo)
+        if vetorizado:
+            selecionados = self._pontuar_features(
+                curriculos, vaga, selecao, workers=workers, callback_progresso=callback_progresso
+            )
+        else:
+            with fase(self._perfilador, 'carregar'):
+                curriculos = list(curriculos.select_related(
+                    'trabalhador', 'trabalhador__perfil_trabalhador'
+                ).prefetch_related(
+                    'experiencias', 'habilidades', 'escolaridades',
+                    'tipo_vaga_procurada'
+                ))
+            with fase(self._perfilador, 'pontuar'):
+                for posicao, curriculo in enumerate(curriculos, start=1):
+                    score_data = self._calcular_score_curriculo_vaga(curriculo, vaga)
+                    selecao.adicionar(curriculo.id, score_data['score_total'], (curriculo.trabalhador_id, score_data))
+                    if callback_progresso and (posicao % 500 == 0 or posicao == len(curriculos)):
+                        callback_progresso(posicao, len(curriculos))
+                selecionados = selecao.selecionados()
+        self.estatisticas_execucao = {**selecao.estatisticas, **estatisticas_restricoes}
+        
+        with fase(self._perfilador, 'persistir'):
+            # Salvar ou atualizar resultados em lote
+            writer = MatchingResultWriter(batch_size=batch_size, config_versao=self.configuracao.versao)
+            results = writer.salvar(
+                [(vaga.id, trabalhador_id, score_data) for trabalhador_id, score_data in selecionados]
+            )
+            self.estatisticas_persistencia = writer.estatisticas
+            
+            # Quem foi cortado pela seleção, pelas restrições ou pelo pré-filtro
+            # não pode manter o resultado (e o score) de uma execução anterior
+            if selecao.filtrando or estatisticas_restricoes or pre_filtro_habilidades:
+                descartados = MatchingResult.objects.filter(vaga=vaga)
+                if curriculos_ids is not None:
+                    descartados = descartados.filter(trabalhador__curriculo__id__in=curriculos_ids)
+                descartados.exclude(
+                    trabalhador_id__in=[trabalhador_id for trabalhador_id, _ in selecionados]
+                ).delete()
+            invalidar_estatisticas()
+        
+        return sorted(results, key=lambda x: x.score_total, reverse=True)
     
-    def calcular_matching_vaga(self, vaga: Vaga) -> List[MatchingResult]:
-        """Calcula matching para todos os candidatos de uma vaga"""
-        # Buscar currículos de trabalhadores ativos e aprovados
+    def previa_vaga(self, vaga: Vaga, requisitos=None, limit: int = 20,
+                    pre_filtro_habilidades: bool = None, restricoes=None,
+                    workers: int = None) -> List[Tuple[int, Dict]]:
+        """Ranking dos `limit` melhores candidatos de uma vaga sem gravar resultados.
+        
+        A vaga pode não estar salva (rascunho): nesse caso os requisitos
+        detalhados são informados em `requisitos` como instâncias não salvas de
+        RequisitoVaga. Retorna (trabalhador_id, score_data) do maior para o
+        menor score; detalhes_matching só é montado para os candidatos retornados.
+        MatchingResult, histórico e estatísticas em cache não são alterados;
+        apenas as features ausentes de algum currículo podem ser criadas.
+        """
+        self._relevancias = {}
+        self._planos = {}
+        if requisitos is None:
+            requisitos = list(vaga.requisitos_detalhados.all()) if vaga.pk else []
+        if vaga.pk is None:
+            # Vaga.save é quem preenche as coordenadas
+            vaga.latitude, vaga.longitude = coordenadas(vaga.local_trabalho)
+        
         curriculos = Curriculo.objects.filter(
             trabalhador__tipo_usuario='trabalhador',
             trabalhador__aprovado=True,
             trabalhador__ativo=True
-        ).select_related('trabalhador').prefetch_related(
-            'experiencias', 'habilidades', 'escolaridades',
-            'tipo_vaga_procurada'
         )
-        
-        results = []
-        for curriculo in curriculos:
-            score_data = self._calcular_score_curriculo_vaga(curriculo, vaga)
-            
-            # Salvar ou atualizar resultado
-            matching_result, created = MatchingResult.objects.update_or_create(
-                vaga=vaga,
-                trabalhador=curriculo.trabalhador,
-                defaults=score_data
+        if pre_filtro_habilidades is None:
+            pre_filtro_habilidades = getattr(settings, 'MATCHING_PRE_FILTRO_HABILIDADES', False)
+        if pre_filtro_habilidades:
+            garantir_features(curriculos)
+            curriculos = curriculos.filter(id__in=curriculos_relacionados(vaga))
+        if restricoes is None:
+            restricoes = getattr(settings, 'MATCHING_RESTRICOES', '')
+        curriculos, estatisticas_restricoes = aplicar_restricoes(curriculos, vaga, restricoes)
+        
+        selecao = self._nova_selecao(top_k=limit, score_minimo=0.0)
+        selecionados = self._pontuar_features(curriculos, vaga, selecao, workers=workers)
+        self.estatisticas_execucao = {**selecao.estatisticas, **estatisticas_restricoes}
+        
+        features = features_por_trabalhador(trabalhador_id for trabalhador_id, _ in selecionados)
+        detalhes = BatchScorer(self).detalhes(
+            [features[trabalhador_id] for trabalhador_id, _ in selecionados], vaga, requisitos
+        )
+        for (_, score_data), detalhes_matching in zip(selecionados, detalhes):
+            score_data['detalhes_matching'] = detalhes_matching
+        return selecionados
+    
+    def pontuar_curriculo(self, curriculo: Curriculo, vaga: Vaga, detalhes: bool = False) -> Dict:
+        """Dados de score de um currículo para uma vaga, sem gravar resultados"""
+        curriculo = Curriculo.objects.select_related(
+            'trabalhador', 'trabalhador__perfil_trabalhador'
+        ).prefetch_related(
+            'experiencias', 'habilidades', 'escolaridades', 'tipo_vaga_procurada'
+        ).get(id=curriculo.id)
+        score_data = self._calcular_score_curriculo_vaga(curriculo, vaga)
+        if detalhes:
+            score_data['detalhes_matching'] = self._detalhes_curriculo_vaga(curriculo, vaga)
+        return score_data
+    
+    def _nova_selecao(self, top_k: int = None, score_minimo: float = None) -> SelecaoResultados:
+        if top_k is None:
+            top_k = getattr(settings, 'MATCHING_TOP_K', 0)
+        if score_minimo is None:
+            score_minimo = getattr(settings, 'MATCHING_SCORE_MINIMO', 0.0)
+        return SelecaoResultados(
+            top_k=top_k, score_minimo=score_minimo, score_compativel=self.configuracao.score_compativel
+        )
+    
+    def _pontuar_features(self, curriculos, vaga: Vaga, selecao: SelecaoResultados,
+                          chunk_size: int = 2000, workers: int = None,
+                          callback_progresso: Callable[[int, int], None] = None) -> List[Tuple[int, Dict]]:
+        """Pontua os currículos em lotes de features, mantendo só os selecionados"""
+        with fase(self._perfilador, 'carregar'):
+            garantir_features(curriculos)
+        if workers is None:
+            workers = getattr(settings, 'MATCHING_WORKERS', 1)
+        # Dentro do pool prefork do Celery o processo é daemon e não pode
+        # criar processos: a pontuação segue em série
+        if workers > 1 and pode_criar_processos():
+            # Carga e pontuação acontecem juntas nos workers
+            with fase(self._perfilador, 'pontuar'):
+                return pontuar_em_paralelo(
+                    self, curriculos, vaga, selecao, workers, callback_progresso=callback_progresso
+                )
+        
+        total = curriculos.count() if callback_progresso else 0
+        
+        scorer = BatchScorer(self)
+        if self._perfilador is not None:
+            self._perfilador.instrumentar(scorer, COMPONENTES_BATCH, prefixo='batch.')
+        
+        features = CurriculoFeatures.objects.filter(
+            curriculo__in=curriculos.values('id')
+        ).order_by('curriculo_id').iterator(chunk_size=chunk_size)
+        
+        lote = []
+        with fase(self._perfilador, 'carregar'):
+            for registro in features:
+                lote.append(registro)
+                if len(lote) == chunk_size:
+                    self._selecionar_lote(scorer, lote, vaga, selecao)
+                    lote = []
+                    if callback_progresso:
+                        callback_progresso(selecao.avaliados, total)
+        self._selecionar_lote(scorer, lote, vaga, selecao)
+        if callback_progresso:
+            callback_progresso(selecao.avaliados, total)
+        
+        with fase(self._perfilador, 'pontuar'):
+            mantidos = selecao.selecionados()
+            scores = scorer.montar([linha for _, linha in mantidos])
+        return [(registro.trabalhador_id, score_data) for (registro, _), score_data in zip(mantidos, scores)]
+    
+    def _selecionar_lote(self, scorer: BatchScorer, lote: List[CurriculoFeatures], vaga: Vaga,
+                         selecao: SelecaoResultados):
+        with fase(self._perfilador, 'pontuar'):
+            for registro, linha in zip(lote, scorer.pontuar(lote, vaga)):
+                selecao.adicionar(registro.curriculo_id, linha[0], (registro, linha))
+    
+    @instrumentado
+    def calcular_matching_curriculo(self, curriculo: Curriculo, batch_size: int = None,
+                                    score_minimo: float = None,
+                                    restricoes=None) -> List[MatchingResult]:
+        """Calcula o matching de um currículo contra todas as vagas ativas"""
+        self._relevancias = {}
+        self._planos = {}
+        with fase(self._perfilador, 'carregar'):
+            curriculo = Curriculo.objects.select_related(
+                'trabalhador', 'trabalhador__perfil_trabalhador'
+            ).prefetch_related(
+                'experiencias', 'habilidades', 'escolaridades',
+                'tipo_vaga_procurada'
+            ).get(id=curriculo.id)
+        
+        trabalhador = curriculo.trabalhador
+        if not (trabalhador.tipo_usuario == 'trabalhador' and trabalhador.aprovado and trabalhador.ativo):
+            # Trabalhador fora do matching não deve manter recomendações antigas
+            MatchingResult.objects.filter(trabalhador=trabalhador).delete()
+            invalidar_estatisticas()
+            return []
+        
+        with fase(self._perfilador, 'carregar'):
+            vagas = Vaga.objects.filter(
+                status='ativa',
+                empresa__aprovado=True,
+                empresa__ativo=True
             )
-            results.append(matching_result)
+            
+            if restricoes is None:
+                restricoes = getattr(settings, 'MATCHING_RESTRICOES', '')
+            bloqueadas = vagas_bloqueadas(curriculo, vagas, restricoes)
+            vagas = list(vagas)
+        
+        # O top-K é por vaga; aqui vale apenas o score mínimo
+        selecao = self._nova_selecao(top_k=0, score_minimo=score_minimo)
+        with fase(self._perfilador, 'pontuar'):
+            for vaga in vagas:
+                if vaga.id in bloqueadas:
+                    continue
+                score_data = self._calcular_score_curriculo_vaga(curriculo, vaga)
+                selecao.adicionar(vaga.id, score_data['score_total'], (vaga.id, score_data))
+            selecionados = selecao.selecionados()
+        self.estatisticas_execucao = selecao.estatisticas
+        if bloqueadas:
+            self.estatisticas_execucao['vagas_descartadas'] = len(bloqueadas)
+        
+        with fase(self._perfilador, 'persistir'):
+            writer = MatchingResultWriter(batch_size=batch_size, config_versao=self.configuracao.versao)
+            results = writer.salvar([
+                (vaga_id, trabalhador.id, score_data) for vaga_id, score_data in selecionados
+            ])
+            self.estatisticas_persistencia = writer.estatisticas
+            
+            if selecao.filtrando or bloqueadas:
+                MatchingResult.objects.filter(
+                    trabalhador=trabalhador, vaga_id__in=[vaga.id for vaga in vagas]
+                ).exclude(vaga_id__in=[vaga_id for vaga_id, _ in selecionados]).delete()
+            invalidar_estatisticas()
         
         return sorted(results, key=lambda x: x.score_total, reverse=True)
     
+    def registrar_historico(self, vaga: Vaga, resultados: List[MatchingResult],
+                            extras: Dict = None) -> HistoricoMatching:
+        """Registra uma execução de matching no histórico.
+        
+        Usa as estatísticas da população avaliada, que pode ser maior que a
+        lista de resultados persistidos quando há top-K ou score mínimo.
+        `extras` é acrescentado a parametros_utilizados.
+        """
+        estatisticas = self.estatisticas_execucao or {
+            'total_candidatos': len(resultados),
+            'candidatos_compativeis': len([
+                r for r in resultados if r.score_total >= self.configuracao.score_compativel
+            ]),
+            'score_medio': sum([r.score_total for r in resultados]) / len(resultados) if resultados else 0,
+        }
+        parametros = dict(self.pesos)
+        parametros['config_versao'] = self.configuracao.versao
+        if estatisticas.get('restricoes'):
+            parametros['restricoes'] = estatisticas['restricoes']
+            parametros['candidatos_descartados'] = estatisticas['candidatos_descartados']
+        if self.instrumentacao:
+            parametros['instrumentacao'] = self.instrumentacao
+        if extras:
+            parametros.update(extras)
+        return HistoricoMatching.objects.create(
+            vaga=vaga,
+            total_candidatos=estatisticas['total_candidatos'],
+            candidatos_compatíveis=estatisticas['candidatos_compativeis'],
+            score_medio=estatisticas['score_medio'],
+            parametros_utilizados=parametros
+        )
+    
     def _calcular_score_curriculo_vaga(self, curriculo: Curriculo, vaga: Vaga) -> Dict:
         """Calcula o score de compatibilidade entre um currículo e uma vaga"""
         
@@ -53,6 +402,7 @@ class MatchingEngine:
         score_escolaridade = self._score_escolaridade(curriculo, vaga)
         score_localizacao = self._score_localizacao(curriculo, vaga)
         score_salario = self._score_salario(curriculo, vaga)
+        score_texto = self._score_texto(curriculo, vaga)
         
         # Calcular score total
         score_total = (
@@ -60,17 +410,10 @@ class MatchingEngine:
             score_habilidades * self.pesos['habilidades'] +
             score_escolaridade * self.pesos['escolaridade'] +
             score_localizacao * self.pesos['localizacao'] +
-            score_salario * self.pesos['salario']
+            score_salario * self.pesos['salario'] +
+            score_texto * self.pesos['texto']
         )
         
-        # Detalhes para debugging
-        detalhes = {
-            'area_compativel': self._verifica_area_compativel(curriculo, vaga),
-            'nivel_experiencia_compativel': self._verifica_nivel_experiencia(curriculo, vaga),
-            'requisitos_atendidos': self._verifica_requisitos(curriculo, vaga),
-            'salario_compativel': score_salario > 0.5,
-        }
-        
         return {
             'score_total': round(score_total, 2),
             'score_experiencia': round(score_experiencia, 2),
@@ -78,7 +421,16 @@ class MatchingEngine:
             'score_escolaridade': round(score_escolaridade, 2),
             'score_localizacao': round(score_localizacao, 2),
             'score_salario': round(score_salario, 2),
-            'detalhes_matching': detalhes
+            'score_texto': round(score_texto, 2),
+        }
+    
+    def _detalhes_curriculo_vaga(self, curriculo: Curriculo, vaga: Vaga) -> Dict:
+        """Detalhes do matching (detalhes_matching), calculados só quando exibidos"""
+        return {
+            'area_compativel': self._verifica_area_compativel(curriculo, vaga),
+            'nivel_experiencia_compativel': self._verifica_nivel_experiencia(curriculo, vaga),
+            **self._verifica_requisitos(curriculo, vaga),
+            'salario_compativel': self._score_salario(curriculo, vaga) > 0.5,
         }
     
     def _score_experiencia(self, curriculo: Curriculo, vaga: Vaga) -> float:
@@ -192,7 +544,13 @@ class MatchingEngine:
         
         # Se trabalhador tem perfil e endereço
         if hasattr(curriculo.trabalhador, 'perfil_trabalhador'):
-            endereco_trabalhador = curriculo.trabalhador.perfil_trabalhador.endereco.lower()
+            perfil = curriculo.trabalhador.perfil_trabalhador
+            if perfil.latitude is not None and vaga.latitude is not None:
+                distancia = distancia_km(perfil.latitude, perfil.longitude, vaga.latitude, vaga.longitude)
+                return self._score_distancia(distancia, curriculo.disponibilidade_mudanca)
+            
+            # Endereços fora da base de municípios: comparação textual
+            endereco_trabalhador = perfil.endereco.lower()
             local_vaga = vaga.local_trabalho.lower()
             
             # Verificar se são da mesma cidade/região
@@ -207,6 +565,17 @@ class MatchingEngine:
         
         return 0.5  # Score neutro se não informado
     
+    def _score_distancia(self, distancia: float, disponibilidade_mudanca: bool) -> float:
+        """Score de localização pela distância em km entre candidato e vaga"""
+        alternativa = 0.7 if disponibilidade_mudanca else 0.3
+        if distancia <= self.raio_local_km:
+            return 1.0
+        if distancia < self.raio_deslocamento_km:
+            faixa = self.raio_deslocamento_km - self.raio_local_km
+            proximidade = 1.0 - (distancia - self.raio_local_km) / faixa * 0.7
+            return max(proximidade, alternativa)
+        return alternativa
+    
     def _score_salario(self, curriculo: Curriculo, vaga: Vaga) -> float:
         """Calcula score baseado na compatibilidade salarial"""
         # Se vaga não informa salário
@@ -237,6 +606,19 @@ class MatchingEngine:
         
         return 0.5
     
+    def _relevancia(self, vaga: Vaga) -> RelevanciaTexto:
+        if vaga.id not in self._relevancias:
+            self._relevancias[vaga.id] = RelevanciaTexto(vaga)
+        return self._relevancias[vaga.id]
+    
+    def _score_texto(self, curriculo: Curriculo, vaga: Vaga) -> float:
+        """Relevância BM25 do texto do currículo para a vaga"""
+        # O mesmo currículo é pontuado contra várias vagas no matching reverso
+        frequencias = getattr(curriculo, '_frequencias_texto', None)
+        if frequencias is None:
+            frequencias = curriculo._frequencias_texto = frequencias_curriculo(curriculo)
+        return self._relevancia(vaga).score(*frequencias)
+    
     def _verifica_area_compativel(self, curriculo: Curriculo, vaga: Vaga) -> bool:
         """Verifica se a área da vaga é compatível com o interesse do trabalhador"""
         if hasattr(curriculo, 'tipo_vaga_procurada') and curriculo.tipo_vaga_procurada:
@@ -267,56 +649,54 @@ class MatchingEngine:
         
         return total_anos >= nivel_map.get(vaga.nivel_experiencia, 0)
     
+    def _plano_requisitos(self, vaga: Vaga) -> PlanoRequisitos:
+        # Compilado uma vez por vaga e reaproveitado entre os currículos
+        if vaga.id not in self._planos:
+            self._planos[vaga.id] = compilar_requisitos(vaga.requisitos_detalhados.all())
+        return self._planos[vaga.id]
+    
     def _verifica_requisitos(self, curriculo: Curriculo, vaga: Vaga) -> Dict:
         """Verifica quais requisitos da vaga são atendidos pelo currículo"""
-        requisitos_atendidos = {
-            'obrigatorios': 0,
-            'desejaveis': 0,
-            'diferenciais': 0
-        }
-        
-        # Se vaga tem requisitos detalhados
-        if hasattr(vaga, 'requisitos_detalhados'):
-            for requisito in vaga.requisitos_detalhados.all():
-                atendido = self._verifica_requisito_especifico(curriculo, requisito)
-                if atendido:
-                    if requisito.nivel_importancia == 'obrigatorio':
-                        requisitos_atendidos['obrigatorios'] += 1
-                    elif requisito.nivel_importancia == 'desejavel':
-                        requisitos_atendidos['desejaveis'] += 1
-                    else:
-                        requisitos_atendidos['diferenciais'] += 1
-        
-        return requisitos_atendidos
-    
-    def _verifica_requisito_especifico(self, curriculo: Curriculo, requisito) -> bool:
-        """Verifica se um requisito específico é atendido"""
-        if requisito.tipo == 'habilidade':
-            habilidades = [h.nome.lower() for h in curriculo.habilidades.all()]
-            return requisito.descricao.lower() in ' '.join(habilidades)
-        
-        elif requisito.tipo == 'habilitacao':
-            if hasattr(curriculo.trabalhador, 'perfil_trabalhador'):
-                return curriculo.trabalhador.perfil_trabalhador.tem_habilitacao
-        
-        # Implementar outras verificações conforme necessário
-        return False
+        perfil = getattr(curriculo.trabalhador, 'perfil_trabalhador', None)
+        return self._plano_requisitos(vaga).avaliar(
+            [h.nome.lower() for h in curriculo.habilidades.all()],
+            perfil is not None and perfil.tem_habilitacao,
+            max([NIVEL_ESCOLARIDADE.get(e.nivel, 1) for e in curriculo.escolaridades.all()], default=0),
+        )
     
     def _similar_text(self, text1: str, text2: str) -> float:
         """Calcula similaridade entre dois textos"""
-        return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        return self.similaridade(text1, text2)
     
-    def get_top_candidatos(self, vaga: Vaga, limit: int = 10) -> List[MatchingResult]:
-        """Retorna os top candidatos para uma vaga"""
-        return MatchingResult.objects.filter(
+    def get_top_candidatos(self, vaga: Vaga, limit: Optional[int] = 10) -> List[MatchingResult]:
+        """Retorna os top candidatos para uma vaga (todos, para paginar, com limit=None)"""
+        matches = MatchingResult.objects.filter(
             vaga=vaga,
-            score_total__gte=0.3  # Threshold mínimo
-        ).order_by('-score_total')[:limit]
+            score_total__gte=self.configuracao.score_minimo_top
+        ).order_by('-score_total')
+        return matches if limit is None else matches[:limit]
+    
+    def simular_ranking(self, vaga: Vaga, pesos: Dict[str, float], limit: int = 20):
+        """Reordena os resultados já gravados da vaga com pesos alternativos.
+        
+        O score simulado é calculado no banco a partir das colunas score_*
+        persistidas (arredondadas em duas casas), sem pontuar novamente; cada
+        resultado também traz a posição que ocupa no ranking atual.
+        """
+        score_simulado = sum(
+            (F(f'score_{componente}') * Value(float(pesos[componente])) for componente in self.pesos),
+            Value(0.0)
+        )
+        return MatchingResult.objects.filter(vaga=vaga).select_related('trabalhador').annotate(
+            score_simulado=ExpressionWrapper(score_simulado, output_field=FloatField()),
+            posicao_atual=Window(RowNumber(), order_by=[F('score_total').desc(), F('id').asc()]),
+        ).order_by('-score_simulado', 'id')[:limit]
     
-    def get_vagas_recomendadas(self, trabalhador, limit: int = 10) -> List[MatchingResult]:
-        """Retorna vagas recomendadas para um trabalhador"""
-        return MatchingResult.objects.filter(
+    def get_vagas_recomendadas(self, trabalhador, limit: Optional[int] = 10) -> List[MatchingResult]:
+        """Retorna vagas recomendadas para um trabalhador (todas, para paginar, com limit=None)"""
+        matches = MatchingResult.objects.filter(
             trabalhador=trabalhador,
             vaga__status='ativa',
-            score_total__gte=0.3
-        ).order_by('-score_total')[:limit]
+            score_total__gte=self.configuracao.score_minimo_top
+        ).order_by('-score_total')
+        return matches if limit is None else matches[:limit]
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+
+from .configuracao import configuracao_atual
+from .models import MatchingResult
+
+CHAVE_CACHE = 'matching:estatisticas'
+SCORE_ALTA_COMPATIBILIDADE = 0.7
+# Faixas de 0.1 do histograma de score_total
+FAIXAS_HISTOGRAMA = 10
+
+
+def _faixa(indice: int) -> Q:
+    # A primeira e a última faixa são abertas para que a soma bata com o total
+    condicao = Q()
+    if indice > 0:
+        condicao &= Q(score_total__gte=indice / FAIXAS_HISTOGRAMA)
+    if indice < FAIXAS_HISTOGRAMA - 1:
+        condicao &= Q(score_total__lt=(indice + 1) / FAIXAS_HISTOGRAMA)
+    return condicao
+
+
+def calcular_estatisticas() -> dict:
+    """Contagens por faixa de compatibilidade, score médio e histograma em uma única consulta"""
+    score_compativel = configuracao_atual().score_compativel
+    agregados = {
+        'total': Count('id'),
+        'alta': Count('id', filter=Q(score_total__gte=SCORE_ALTA_COMPATIBILIDADE)),
+        'media': Count('id', filter=Q(score_total__gte=score_compativel,
+                                      score_total__lt=SCORE_ALTA_COMPATIBILIDADE)),
+        'score_medio': Avg('score_total'),
+    }
+    for indice in range(FAIXAS_HISTOGRAMA):
+        agregados[f'faixa_{indice}'] = Count('id', filter=_faixa(indice))
+    valores = MatchingResult.objects.aggregate(**agregados)
+
+    return {
+        'total_matches': valores['total'],
+        'alta_compatibilidade': valores['alta'],
+        'media_compatibilidade': valores['media'],
+        'baixa_compatibilidade': valores['total'] - valores['alta'] - valores['media'],
+        'score_medio_geral': round(valores['score_medio'] or 0, 2),
+        'histograma': [
+            {
+                'inicio': round(indice / FAIXAS_HISTOGRAMA, 1),
+                'fim': round((indice + 1) / FAIXAS_HISTOGRAMA, 1),
+                'quantidade': valores[f'faixa_{indice}'],
+            }
+            for indice in range(FAIXAS_HISTOGRAMA)
+        ],
+    }
+
+
+def obter_estatisticas() -> dict:
+    """Estatísticas do matching, guardadas no cache por MATCHING_ESTATISTICAS_CACHE_TTL segundos"""
+    estatisticas = cache.get(CHAVE_CACHE)
+    if estatisticas is None:
+        estatisticas = calcular_estatisticas()
+        cache.set(CHAVE_CACHE, estatisticas, getattr(settings, 'MATCHING_ESTATISTICAS_CACHE_TTL', 30))
+    return estatisticas
+
+
+def invalidar_estatisticas():
+    """Descarta as estatísticas em cache (resultados gravados ou nova configuração)"""
+    cache.delete(CHAVE_CACHE)
@@ -0,0 +1,56 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .paginacao import PaginacaoMatching
+
+# Campo exportado e a coluna lida do banco
+CAMPOS_EXPORTACAO = (
+    ('id', 'id'),
+    ('vaga_id', 'vaga_id'),
+    ('vaga_titulo', 'vaga__titulo'),
+    ('empresa_id', 'vaga__empresa_id'),
+    ('trabalhador_id', 'trabalhador_id'),
+    ('trabalhador_primeiro_nome', 'trabalhador__first_name'),
+    ('trabalhador_sobrenome', 'trabalhador__last_name'),
+    ('score_total', 'score_total'),
+    ('score_experiencia', 'score_experiencia'),
+    ('score_habilidades', 'score_habilidades'),
+    ('score_escolaridade', 'score_escolaridade'),
+    ('score_localizacao', 'score_localizacao'),
+    ('score_salario', 'score_salario'),
+    ('score_texto', 'score_texto'),
+    ('config_versao', 'config_versao'),
+    ('data_calculo', 'data_calculo'),
+)
+
+TAMANHO_LOTE = 2000
+
+
+def exportar_ndjson(queryset, nome_arquivo: str = 'matching.ndjson') -> StreamingHttpResponse:
+    """Resultados de matching como NDJSON (um objeto JSON plano por linha), em streaming.
+
+    As linhas são lidas em lotes direto das colunas, sem instanciar modelos nem
+    serializers aninhados, na mesma ordem da paginação. detalhes_matching não é
+    exportado: é calculado apenas quando o resultado é exibido.
+    """
+    nomes = [nome for nome, _ in CAMPOS_EXPORTACAO]
+    linhas = (
+        queryset.order_by(*PaginacaoMatching.ordenacao)
+        .values_list(*[coluna for _, coluna in CAMPOS_EXPORTACAO])
+        .iterator(chunk_size=TAMANHO_LOTE)
+    )
+
+    def gerar():
+        for linha in linhas:
+            yield json.dumps(dict(zip(nomes, linha)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    response = StreamingHttpResponse(gerar(), content_type='application/x-ndjson; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    return response
+
+
+def quer_ndjson(request) -> bool:
+    """Exportação pedida com ?formato=ndjson (?format= é reservado pelo DRF)"""
+    return request.query_params.get('formato') == 'ndjson'
@@ -0,0 +1,99 @@
+from typing import List
+
+from curriculos.models import Curriculo
+from .agendamento import agendar_apos_commit
+from .indice import indexar
+from .models import CurriculoFeatures, TermoIndice, TermoTexto
+from .texto import frequencias_curriculo
+
+NIVEL_ESCOLARIDADE = {
+    'fundamental_incompleto': 1,
+    'fundamental_completo': 2,
+    'medio_incompleto': 3,
+    'medio_completo': 4,
+    'tecnico': 5,
+    'superior_incompleto': 6,
+    'superior_completo': 7,
+    'pos_graduacao': 8,
+    'mestrado': 9,
+    'doutorado': 10
+}
+
+CURRICULO_PREFETCH = ('experiencias', 'habilidades', 'escolaridades', 'tipo_vaga_procurada')
+
+
+def construir_features(curriculo: Curriculo) -> CurriculoFeatures:
+    """Monta o registro de features de um currículo com relacionamentos carregados"""
+    experiencias = []
+    for exp in curriculo.experiencias.all():
+        # Experiências em aberto guardam só o início; os dias são contados no uso
+        dias = (exp.data_fim - exp.data_inicio).days if exp.data_fim else None
+        experiencias.append([dias, exp.data_inicio.toordinal(), exp.cargo.lower(), exp.descricao.lower()])
+
+    escolaridades = curriculo.escolaridades.all()
+    maior_nivel = max([NIVEL_ESCOLARIDADE.get(e.nivel, 1) for e in escolaridades], default=0)
+
+    perfil = getattr(curriculo.trabalhador, 'perfil_trabalhador', None)
+    tipo_vaga = getattr(curriculo, 'tipo_vaga_procurada', None)
+    termos_texto, comprimento_texto = frequencias_curriculo(curriculo)
+
+    return CurriculoFeatures(
+        curriculo=curriculo,
+        trabalhador_id=curriculo.trabalhador_id,
+        experiencias=experiencias,
+        habilidades=[h.nome.lower() for h in curriculo.habilidades.all()],
+        maior_nivel_escolaridade=maior_nivel,
+        cursos=[e.curso.lower() for e in escolaridades],
+        tem_perfil=perfil is not None,
+        endereco=perfil.endereco.lower() if perfil else '',
+        latitude=perfil.latitude if perfil else None,
+        longitude=perfil.longitude if perfil else None,
+        tem_habilitacao=perfil.tem_habilitacao if perfil else False,
+        disponibilidade_mudanca=curriculo.disponibilidade_mudanca,
+        pretensao_salarial=curriculo.pretensao_salarial,
+        areas_interesse=tipo_vaga.areas_interesse.lower() if tipo_vaga else None,
+        termos_texto=termos_texto,
+        comprimento_texto=comprimento_texto,
+    )
+
+
+def atualizar_features(curriculo_id: int):
+    """Recalcula e grava as features de um currículo"""
+    curriculo = Curriculo.objects.select_related(
+        'trabalhador', 'trabalhador__perfil_trabalhador'
+    ).prefetch_related(*CURRICULO_PREFETCH).filter(id=curriculo_id).first()
+
+    if curriculo is None:
+        CurriculoFeatures.objects.filter(curriculo_id=curriculo_id).delete()
+        TermoIndice.objects.filter(curriculo_id=curriculo_id).delete()
+        TermoTexto.objects.filter(curriculo_id=curriculo_id).delete()
+        return None
+
+    features = construir_features(curriculo)
+    features.save()
+    indexar([features])
+    return features
+
+
+def agendar_atualizacao_features(curriculo_id: int):
+    """Agenda a atualização das features para o fim da transação atual"""
+    agendar_apos_commit(('features', curriculo_id), atualizar_features, curriculo_id)
+
+
+def garantir_features(curriculos):
+    """Cria as features (e entradas do índice) dos currículos que ainda não têm"""
+    faltando = curriculos.filter(features__isnull=True).select_related(
+        'trabalhador', 'trabalhador__perfil_trabalhador'
+    ).prefetch_related(*CURRICULO_PREFETCH)
+    novas = [construir_features(curriculo) for curriculo in faltando]
+    if novas:
+        CurriculoFeatures.objects.bulk_create(novas, ignore_conflicts=True)
+        indexar(novas)
+
+
+def carregar_features(curriculos) -> List[CurriculoFeatures]:
+    """Retorna as features dos currículos do queryset, criando as que faltarem"""
+    garantir_features(curriculos)
+    return list(
+        CurriculoFeatures.objects.filter(curriculo__in=curriculos.values('id')).order_by('curriculo_id')
+    )
@@ -0,0 +1,67 @@
+from typing import Iterable, List
+
+from django.db import transaction
+from django.db.models import Q
+
+from vagas.models import Vaga
+from .automato import AhoCorasick
+from .models import CurriculoFeatures, TermoIndice, TermoTexto
+from .texto import entradas_texto
+
+
+def normalizar_termo(termo: str) -> str:
+    """Normaliza um termo do índice.
+
+    Só aplica minúsculas e strip: o termo normalizado é sempre substring do
+    original em minúsculas, então o pré-filtro nunca descarta um candidato que
+    o teste de substring do engine aceitaria.
+    """
+    return termo.lower().strip()
+
+
+def termos_curriculo(features: CurriculoFeatures) -> List[TermoIndice]:
+    """Gera as entradas do índice para um currículo"""
+    termos = {('habilidade', normalizar_termo(h)) for h in features.habilidades}
+    if features.areas_interesse:
+        termos |= {('area', normalizar_termo(a)) for a in features.areas_interesse.split(',')}
+
+    return [
+        TermoIndice(tipo=tipo, termo=termo[:200], curriculo_id=features.curriculo_id)
+        for tipo, termo in termos if termo
+    ]
+
+
+def indexar(features_list: Iterable[CurriculoFeatures]):
+    """Substitui as entradas dos índices de termos e de texto dos currículos informados"""
+    features_list = list(features_list)
+    curriculo_ids = [features.curriculo_id for features in features_list]
+    entradas = [entrada for features in features_list for entrada in termos_curriculo(features)]
+
+    with transaction.atomic():
+        TermoIndice.objects.filter(curriculo_id__in=curriculo_ids).delete()
+        TermoIndice.objects.bulk_create(entradas, batch_size=1000, ignore_conflicts=True)
+        TermoTexto.objects.filter(curriculo_id__in=curriculo_ids).delete()
+        TermoTexto.objects.bulk_create(entradas_texto(features_list), batch_size=1000)
+
+
+def termos_relacionados(vaga: Vaga) -> dict:
+    """Retorna os termos do vocabulário do índice que a vaga aciona"""
+    requisitos_texto = f"{vaga.requisitos} {vaga.descricao}".lower()
+    area = vaga.area.lower()
+
+    habilidades = TermoIndice.objects.filter(tipo='habilidade').values_list('termo', flat=True).distinct()
+    areas = TermoIndice.objects.filter(tipo='area').values_list('termo', flat=True).distinct()
+
+    return {
+        'habilidade': list(AhoCorasick(habilidades).encontrar(requisitos_texto)),
+        'area': [termo for termo in areas if area and area in termo],
+    }
+
+
+def curriculos_relacionados(vaga: Vaga):
+    """Subquery com os ids de currículos que compartilham algum termo com a vaga"""
+    termos = termos_relacionados(vaga)
+    return TermoIndice.objects.filter(
+        Q(tipo='habilidade', termo__in=termos['habilidade']) |
+        Q(tipo='area', termo__in=termos['area'])
+    ).values('curriculo_id')
@@ -0,0 +1,107 @@
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Iterable
+
+from django.db import connection
+
+
+class Perfilador:
+    """Mede tempo de parede, chamadas e consultas SQL de uma execução de matching.
+
+    Fases (`fase`) podem ser aninhadas e registram tempo exclusivo: o tempo de
+    uma fase interna não é somado à externa. Cada consulta SQL é atribuída à
+    fase mais interna ativa. Componentes (`instrumentar`) registram tempo
+    inclusivo por chamada, então componentes que chamam outros (por exemplo
+    `_score_experiencia` e `_similar_text`) se sobrepõem.
+    """
+
+    def __init__(self):
+        self.fases = {}
+        self.componentes = {}
+        self.consultas = 0
+        self._pilha = []
+        self._inicio = None
+        self._duracao = 0.0
+
+    @contextmanager
+    def ativo(self):
+        """Conta as consultas SQL feitas na conexão padrão durante o bloco"""
+        self._inicio = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._contar_consulta):
+                yield self
+        finally:
+            self._duracao = time.perf_counter() - self._inicio
+
+    def _contar_consulta(self, execute, sql, params, many, context):
+        self.consultas += 1
+        if self._pilha:
+            self._registro(self.fases, self._pilha[-1][0])['consultas'] += 1
+        return execute(sql, params, many, context)
+
+    @staticmethod
+    def _registro(destino: dict, nome: str) -> dict:
+        if nome not in destino:
+            destino[nome] = {'chamadas': 0, 'segundos': 0.0, 'consultas': 0}
+        return destino[nome]
+
+    @contextmanager
+    def fase(self, nome: str):
+        # [nome, inicio, tempo gasto em fases internas]
+        entrada = [nome, time.perf_counter(), 0.0]
+        self._pilha.append(entrada)
+        try:
+            yield
+        finally:
+            self._pilha.pop()
+            decorrido = time.perf_counter() - entrada[1]
+            registro = self._registro(self.fases, nome)
+            registro['chamadas'] += 1
+            registro['segundos'] += decorrido - entrada[2]
+            if self._pilha:
+                self._pilha[-1][2] += decorrido
+
+    def envolver(self, nome: str, funcao: Callable) -> Callable:
+        """Retorna a função medida como o componente `nome`"""
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            consultas = self.consultas
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registro = self._registro(self.componentes, nome)
+                registro['chamadas'] += 1
+                registro['segundos'] += time.perf_counter() - inicio
+                registro['consultas'] += self.consultas - consultas
+        return medida
+
+    def instrumentar(self, objeto, metodos: Iterable[str], prefixo: str = ''):
+        """Substitui, apenas na instância, os métodos informados por versões medidas"""
+        for metodo in metodos:
+            setattr(objeto, metodo, self.envolver(prefixo + metodo, getattr(objeto, metodo)))
+
+    @staticmethod
+    def remover(objeto, metodos: Iterable[str]):
+        for metodo in metodos:
+            objeto.__dict__.pop(metodo, None)
+
+    @property
+    def relatorio(self) -> dict:
+        def arredondar(registros):
+            return {
+                nome: {**registro, 'segundos': round(registro['segundos'], 6)}
+                for nome, registro in registros.items()
+            }
+        return {
+            'duracao_segundos': round(self._duracao, 6),
+            'consultas': self.consultas,
+            'fases': arredondar(self.fases),
+            'componentes': arredondar(self.componentes),
+        }
+
+
+def fase(perfilador, nome: str):
+    """Contexto de fase do perfilador, ou um contexto vazio quando desativado"""
+    return perfilador.fase(nome) if perfilador is not None else nullcontext()
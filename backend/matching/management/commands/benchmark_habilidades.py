@@ -0,0 +1,56 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from matching.automato import AhoCorasick
+
+
+class Command(BaseCommand):
+    help = 'Compara o teste de substring por habilidade com o automato de Aho-Corasick'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidatos', type=int, default=20000)
+        parser.add_argument('--vocabulario', type=int, default=2000)
+        parser.add_argument('--habilidades', type=int, default=8, help='Habilidades por candidato')
+        parser.add_argument('--tamanho-texto', type=int, default=4000, help='Caracteres do texto da vaga')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+
+        vocabulario = list({
+            ''.join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(3, 12)))
+            for _ in range(options['vocabulario'])
+        })
+        palavras = vocabulario + [
+            ''.join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(2, 9)))
+            for _ in range(options['vocabulario'])
+        ]
+        texto = ''
+        while len(texto) < options['tamanho_texto']:
+            texto += rnd.choice(palavras) + ' '
+        candidatos = [
+            [rnd.choice(vocabulario) for _ in range(options['habilidades'])]
+            for _ in range(options['candidatos'])
+        ]
+
+        inicio = time.perf_counter()
+        por_laco = [sum(1 for h in habilidades if h in texto) for habilidades in candidatos]
+        tempo_laco = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        vocabulario_usado = {h for habilidades in candidatos for h in habilidades}
+        acertos = AhoCorasick(vocabulario_usado).encontrar(texto)
+        por_automato = [sum(1 for h in habilidades if h in acertos) for habilidades in candidatos]
+        tempo_automato = time.perf_counter() - inicio
+
+        if por_laco != por_automato:
+            self.stderr.write(self.style.ERROR('Resultados divergentes entre laço e automato.'))
+            return
+
+        self.stdout.write(f"Candidatos: {options['candidatos']} | vocabulário: {len(vocabulario_usado)} | texto: {len(texto)} caracteres")
+        self.stdout.write(f'Laço com substring: {tempo_laco:.4f}s')
+        self.stdout.write(f'Aho-Corasick:       {tempo_automato:.4f}s')
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {tempo_laco / tempo_automato:.1f}x'))
@@ -0,0 +1,176 @@
+import json
+import platform
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from curriculos.models import Curriculo
+from matching.engine import MatchingEngine
+from matching.sinteticos import DOMINIO, GeradorDadosSinteticos
+from usuarios.models import CustomUser
+from vagas.models import Vaga
+
+
+def _medir(funcao, repeticoes: int = 1) -> tuple:
+    """Executa a função e retorna (tempos em segundos, consultas SQL por execução)"""
+    tempos = []
+    consultas = []
+    for _ in range(repeticoes):
+        with CaptureQueriesContext(connection) as capturadas:
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        consultas.append(len(capturadas))
+    return tempos, consultas
+
+
+def _resumo(tempos, consultas) -> dict:
+    return {
+        'execucoes': len(tempos),
+        'media_segundos': round(statistics.mean(tempos), 6),
+        'mediana_segundos': round(statistics.median(tempos), 6),
+        'min_segundos': round(min(tempos), 6),
+        'max_segundos': round(max(tempos), 6),
+        'consultas_sql': round(statistics.mean(consultas), 1),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Mede o matching e os endpoints de listagem sobre dados sintéticos em várias escalas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escalas', nargs='+', default=['5x200x10', '10x1000x20', '20x5000x40'],
+                            help='Escalas no formato EMPRESASxTRABALHADORESxVAGAS')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--repeticoes', type=int, default=3)
+        parser.add_argument('--amostra-vagas', type=int, default=5,
+                            help='Vagas usadas em calcular_matching_vaga e nos endpoints')
+        parser.add_argument('--amostra-curriculos', type=int, default=5,
+                            help='Currículos usados no matching reverso e nos endpoints')
+        parser.add_argument('--saida', help='Arquivo JSON de saída (padrão: stdout)')
+        parser.add_argument('--manter', action='store_true',
+                            help='Mantém os dados sintéticos da última escala ao final')
+
+    def handle(self, *args, **options):
+        escalas = [self._parse_escala(escala) for escala in options['escalas']]
+
+        relatorio = {
+            'seed': options['seed'],
+            'repeticoes': options['repeticoes'],
+            'data_execucao': timezone.now().isoformat(),
+            'ambiente': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'banco': connection.vendor,
+            },
+            'escalas': [],
+        }
+
+        for empresas, trabalhadores, vagas in escalas:
+            self.stderr.write(f'Escala {empresas}x{trabalhadores}x{vagas}...')
+            GeradorDadosSinteticos.limpar()
+
+            inicio = time.perf_counter()
+            GeradorDadosSinteticos(seed=options['seed']).gerar(empresas, trabalhadores, vagas)
+            geracao = time.perf_counter() - inicio
+
+            relatorio['escalas'].append({
+                'empresas': empresas,
+                'trabalhadores': trabalhadores,
+                'vagas': vagas,
+                'geracao_segundos': round(geracao, 3),
+                'operacoes': self._medir_escala(options),
+            })
+
+        if not options['manter']:
+            GeradorDadosSinteticos.limpar()
+
+        saida = json.dumps(relatorio, indent=2, ensure_ascii=False)
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                arquivo.write(saida)
+            self.stderr.write(self.style.SUCCESS(f"Relatório gravado em {options['saida']}"))
+        else:
+            self.stdout.write(saida)
+
+    def _parse_escala(self, escala: str) -> tuple:
+        try:
+            empresas, trabalhadores, vagas = (int(parte) for parte in escala.lower().split('x'))
+        except ValueError:
+            raise CommandError(f'Escala inválida: {escala} (use EMPRESASxTRABALHADORESxVAGAS)')
+        return empresas, trabalhadores, vagas
+
+    def _medir_escala(self, options) -> dict:
+        repeticoes = options['repeticoes']
+        vagas = list(
+            Vaga.objects.filter(empresa__email__endswith=f'@{DOMINIO}')
+            .select_related('empresa').order_by('id')[:options['amostra_vagas']]
+        )
+        curriculos = list(
+            Curriculo.objects.filter(trabalhador__email__endswith=f'@{DOMINIO}')
+            .select_related('trabalhador').order_by('id')[:options['amostra_curriculos']]
+        )
+        engine = MatchingEngine()
+        operacoes = {}
+
+        # A primeira execução inclui a criação das features dos currículos
+        if vagas:
+            tempos, consultas = _medir(lambda: engine.calcular_matching_vaga(vagas[0]))
+            operacoes['calcular_matching_vaga_inicial'] = _resumo(tempos, consultas)
+
+        tempos, consultas = [], []
+        for vaga in vagas:
+            t, c = _medir(lambda: engine.calcular_matching_vaga(vaga), repeticoes)
+            tempos += t
+            consultas += c
+            engine.registrar_historico(vaga, [])
+        if tempos:
+            operacoes['calcular_matching_vaga'] = _resumo(tempos, consultas)
+
+        tempos, consultas = [], []
+        for curriculo in curriculos:
+            t, c = _medir(lambda: engine.calcular_matching_curriculo(curriculo), repeticoes)
+            tempos += t
+            consultas += c
+        if tempos:
+            operacoes['calcular_matching_curriculo'] = _resumo(tempos, consultas)
+
+        # Administrador não persistido: as views de admin não dependem do id
+        admin = CustomUser(tipo_usuario='admin', aprovado=True)
+        endpoints = {
+            'GET /api/vagas/': [(c.trabalhador, '/api/vagas/') for c in curriculos],
+            'GET /api/matching/vagas-recomendadas/': [
+                (c.trabalhador, '/api/matching/vagas-recomendadas/') for c in curriculos
+            ],
+            'GET /api/vagas/<id>/top-candidatos/': [
+                (v.empresa, f'/api/vagas/{v.id}/top-candidatos/') for v in vagas
+            ],
+            'GET /api/matching/historico/': [(v.empresa, '/api/matching/historico/') for v in vagas],
+            'GET /api/matching/estatisticas/': [(admin, '/api/matching/estatisticas/')],
+        }
+
+        cliente = APIClient()
+        for nome, chamadas in endpoints.items():
+            tempos, consultas = [], []
+            for usuario, url in chamadas:
+                cliente.force_authenticate(user=usuario)
+                t, c = _medir(lambda: self._get(cliente, url), repeticoes)
+                tempos += t
+                consultas += c
+            if tempos:
+                operacoes[nome] = _resumo(tempos, consultas)
+        cliente.force_authenticate(user=None)
+
+        return operacoes
+
+    def _get(self, cliente: APIClient, url: str):
+        resposta = cliente.get(url)
+        if resposta.status_code != 200:
+            raise CommandError(f'{url} retornou {resposta.status_code}')
+        return resposta
@@ -0,0 +1,136 @@
+import os
+import random
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from matching.engine import MatchingEngine
+from matching.paralelo import _inicializar_worker, parametros_pontuacao, pontuar_shard
+from matching.selecao import SelecaoResultados
+
+
+class Command(BaseCommand):
+    help = 'Mede o ganho da pontuação paralela sobre uma população sintética de currículos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidatos', type=int, default=50000)
+        parser.add_argument('--workers', type=int, nargs='+', default=None,
+                            help='Quantidades de processos a medir (padrão: 1, 2, 4... até os núcleos)')
+        parser.add_argument('--shards-por-worker', type=int, default=4)
+        parser.add_argument('--top-k', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        vaga_payload, registros = self._gerar_populacao(rnd, options['candidatos'])
+
+        workers = options['workers']
+        if not workers:
+            nucleos = os.cpu_count() or 1
+            workers = [1]
+            while workers[-1] * 2 <= nucleos:
+                workers.append(workers[-1] * 2)
+
+        self.stdout.write(f"Candidatos: {len(registros)} | núcleos: {os.cpu_count()}")
+
+        referencia = None
+        tempo_base = None
+        for quantidade in workers:
+            inicio = time.perf_counter()
+            ranking = self._executar(vaga_payload, registros, quantidade,
+                                     options['shards_por_worker'], options['top_k'])
+            tempo = time.perf_counter() - inicio
+
+            if referencia is None:
+                referencia, tempo_base = ranking, tempo
+            elif ranking != referencia:
+                self.stderr.write(self.style.ERROR(f'Ranking divergente com {quantidade} workers.'))
+                return
+
+            speedup = tempo_base / tempo
+            self.stdout.write(
+                f'{quantidade:>3} workers: {tempo:.3f}s | speedup {speedup:.2f}x | '
+                f'eficiência {speedup / quantidade:.0%}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Rankings idênticos em todas as execuções.'))
+
+    def _executar(self, vaga_payload, registros, workers, shards_por_worker, top_k):
+        selecao = SelecaoResultados(top_k=top_k, score_minimo=0.0)
+        engine = MatchingEngine()
+        argumentos = (parametros_pontuacao(engine), top_k, 0.0)
+
+        if workers == 1:
+            selecao.mesclar(*pontuar_shard(vaga_payload, registros, *argumentos))
+        else:
+            tamanho = -(-len(registros) // (workers * shards_por_worker))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker) as executor:
+                futuros = [
+                    executor.submit(pontuar_shard, vaga_payload, registros[i:i + tamanho], *argumentos)
+                    for i in range(0, len(registros), tamanho)
+                ]
+                for futuro in futuros:
+                    selecao.mesclar(*futuro.result())
+
+        return [
+            (trabalhador_id, score_data['score_total'])
+            for trabalhador_id, score_data in selecao.selecionados()
+        ]
+
+    def _gerar_populacao(self, rnd, candidatos):
+        palavras = [
+            ''.join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(3, 10)))
+            for _ in range(1500)
+        ]
+        cidades = [f'cidade {palavra}' for palavra in palavras[:200]]
+        areas = palavras[200:260]
+
+        vaga_payload = {
+            'campos': {
+                'id': 1,
+                'titulo': ' '.join(rnd.sample(palavras, 2)),
+                'descricao': ' '.join(rnd.choice(palavras) for _ in range(300)),
+                'requisitos': ' '.join(rnd.choice(palavras) for _ in range(100)),
+                'area': areas[0],
+                'local_trabalho': cidades[0],
+                'latitude': None,
+                'longitude': None,
+                'aceita_remoto': False,
+                'nivel_experiencia': 'pleno',
+                'salario_min': Decimal('3000'),
+                'salario_max': Decimal('6000'),
+            },
+        }
+
+        hoje = date.today()
+        registros = []
+        for i in range(candidatos):
+            experiencias = []
+            for _ in range(rnd.randint(0, 4)):
+                inicio = hoje - timedelta(days=rnd.randint(200, 6000))
+                dias = rnd.choice([None, rnd.randint(30, 1500)])
+                experiencias.append([
+                    dias, inicio.toordinal(),
+                    ' '.join(rnd.sample(palavras, 2)),
+                    ' '.join(rnd.choice(palavras) for _ in range(15)),
+                ])
+            registros.append((
+                i + 1, i + 1, experiencias,
+                rnd.sample(palavras, rnd.randint(0, 12)),
+                rnd.randint(0, 10),
+                [rnd.choice(areas) for _ in range(rnd.randint(0, 2))],
+                rnd.random() < 0.8,
+                rnd.choice(cidades),
+                # Cidades fictícias ficam fora da base de municípios
+                None, None,
+                rnd.random() < 0.5,
+                rnd.random() < 0.3,
+                Decimal(rnd.randint(1500, 9000)) if rnd.random() < 0.8 else None,
+                ' '.join(rnd.sample(areas, 3)) if rnd.random() < 0.7 else None,
+            ))
+
+        return vaga_payload, registros
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from matching.sinteticos import DOMINIO, GeradorDadosSinteticos
+
+
+class Command(BaseCommand):
+    help = 'Gera empresas, trabalhadores com currículo e vagas sintéticos de forma determinística'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empresas', type=int, default=10)
+        parser.add_argument('--trabalhadores', type=int, default=1000)
+        parser.add_argument('--vagas', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--limpar', action='store_true',
+                            help=f'Remove antes os usuários sintéticos (e-mail @{DOMINIO})')
+
+    def handle(self, *args, **options):
+        if options['limpar']:
+            removidos = GeradorDadosSinteticos.limpar()
+            self.stdout.write(f'{removidos} registros sintéticos removidos.')
+
+        inicio = time.perf_counter()
+        quantidades = GeradorDadosSinteticos(seed=options['seed']).gerar(
+            empresas=options['empresas'],
+            trabalhadores=options['trabalhadores'],
+            vagas=options['vagas'],
+        )
+        duracao = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{quantidades['empresas']} empresas, {quantidades['trabalhadores']} trabalhadores e "
+            f"{quantidades['vagas']} vagas gerados em {duracao:.2f}s (seed {options['seed']})."
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from matching.pendencias import pendencias_disponiveis, processar_pendencias
+
+
+class Command(BaseCommand):
+    help = 'Recalcula em lotes os pares (vaga, currículo) marcados como pendentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limite', type=int, default=500, help='Pendências processadas por lote')
+        parser.add_argument('--batch-size', type=int, default=None, help='Tamanho dos lotes de gravação')
+
+    def handle(self, *args, **options):
+        while pendencias_disponiveis().exists():
+            estatisticas = processar_pendencias(limite=options['limite'], batch_size=options['batch_size'])
+            self.stdout.write(
+                f"{estatisticas['pendencias']} pendências: {estatisticas['vagas']} vagas, "
+                f"{estatisticas['curriculos']} currículos, {estatisticas['pares']} pares "
+                f"({estatisticas['resultados_recalculados']} resultados)"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Nenhuma pendência restante.'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from curriculos.models import Curriculo
+from matching.features import construir_features, CURRICULO_PREFETCH
+from matching.indice import indexar
+from matching.models import CurriculoFeatures
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as features de matching e o índice de termos de todos os currículos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help='Currículos processados por lote')
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        ids = list(Curriculo.objects.order_by('id').values_list('id', flat=True))
+
+        for i in range(0, len(ids), lote):
+            curriculos = Curriculo.objects.filter(id__in=ids[i:i + lote]).select_related(
+                'trabalhador', 'trabalhador__perfil_trabalhador'
+            ).prefetch_related(*CURRICULO_PREFETCH)
+            features = [construir_features(curriculo) for curriculo in curriculos]
+            CurriculoFeatures.objects.bulk_create(
+                features,
+                update_conflicts=True,
+                unique_fields=['curriculo'],
+                update_fields=[
+                    f.name for f in CurriculoFeatures._meta.concrete_fields
+                    if not f.primary_key
+                ],
+            )
+            indexar(features)
+
+        self.stdout.write(self.style.SUCCESS(f'{len(ids)} currículos reindexados.'))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from matching.rematch import em_execucao, executar_rematch
+
+
+class Command(BaseCommand):
+    help = ('Recalcula o matching de todas as vagas ativas, retomando a última execução '
+            'interrompida (uso noturno, após mudanças no scoring)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processos por vaga (padrão: MATCHING_WORKERS)')
+        parser.add_argument('--tempo-maximo', type=float, default=None,
+                            help='Segundos disponíveis; a execução para antes de estourar e é retomada '
+                                 'na próxima (padrão: MATCHING_REMATCH_TEMPO_MAXIMO, 0 = sem limite)')
+        parser.add_argument('--lote-vagas', type=int, default=100, help='Vagas lidas por consulta')
+        parser.add_argument('--batch-size', type=int, default=None, help='Tamanho dos lotes de gravação')
+        parser.add_argument('--reiniciar', action='store_true',
+                            help='Ignora o ponto de retomada e recomeça da primeira vaga')
+        parser.add_argument('--forcar', action='store_true',
+                            help='Executa mesmo com outra execução em andamento')
+
+    def handle(self, *args, **options):
+        andamento = em_execucao()
+        if andamento is not None and not options['forcar']:
+            raise CommandError(f'{andamento} já está em andamento (use --forcar para ignorar).')
+
+        execucao = executar_rematch(
+            workers=options['workers'],
+            tempo_maximo=options['tempo_maximo'],
+            batch_size=options['batch_size'],
+            lote_vagas=options['lote_vagas'],
+            reiniciar=options['reiniciar'],
+        )
+
+        vazao = execucao.candidatos_avaliados / execucao.duracao_segundos if execucao.duracao_segundos else 0.0
+        self.stdout.write(
+            f'{execucao.vagas_processadas}/{execucao.total_vagas} vagas, '
+            f'{execucao.candidatos_avaliados} candidatos avaliados, '
+            f'{execucao.resultados_gravados} resultados em {execucao.duracao_segundos:.1f}s '
+            f'({vazao:.1f} candidatos/s)'
+        )
+        if execucao.status == 'interrompida':
+            self.stdout.write(self.style.WARNING(
+                f'Tempo máximo atingido; a próxima execução retoma após a vaga {execucao.ultima_vaga_id}.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Rematch {execucao.id} concluído.'))
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from matching.engine import MatchingEngine
+from matching.models import SCORE_INDICE_TOP, HistoricoMatching, MatchingResult
+from matching.paginacao import PaginacaoHistorico, PaginacaoMatching
+from usuarios.models import CustomUser
+from vagas.models import Vaga
+
+
+class Command(BaseCommand):
+    help = 'Confere por EXPLAIN que as consultas frequentes do matching usam os índices criados para elas'
+
+    def consultas(self):
+        """(descrição, queryset, índice esperado) das consultas das listagens paginadas"""
+        engine = MatchingEngine()
+        vaga = Vaga.objects.order_by('id').first() or Vaga(id=0)
+        trabalhador = CustomUser.objects.filter(tipo_usuario='trabalhador').order_by('id').first() or CustomUser(id=0)
+        tamanho = PaginacaoMatching.page_size + 1
+        # Posição de um cursor qualquer: (score_total, id)
+        apos = Q(score_total__lt=0.5) | Q(score_total=0.5, id__gt=0)
+
+        top = engine.get_top_candidatos(vaga, limit=None).order_by(*PaginacaoMatching.ordenacao)
+        trabalhador_matches = MatchingResult.objects.filter(trabalhador=trabalhador).order_by(*PaginacaoMatching.ordenacao)
+        recomendadas = engine.get_vagas_recomendadas(trabalhador, limit=None).order_by(*PaginacaoMatching.ordenacao)
+        historico = HistoricoMatching.objects.order_by(*PaginacaoHistorico.ordenacao)
+
+        consultas = [
+            ('matches do trabalhador', trabalhador_matches[:tamanho], 'matching_trab_score_idx'),
+            ('matches do trabalhador (cursor)', trabalhador_matches.filter(apos)[:tamanho], 'matching_trab_score_idx'),
+            ('vagas recomendadas', recomendadas[:tamanho], 'matching_trab_score_idx'),
+            ('histórico', historico[:tamanho], 'historico_data_idx'),
+        ]
+        # O índice parcial só cobre consultas com score mínimo a partir do seu limite
+        if engine.configuracao.score_minimo_top >= SCORE_INDICE_TOP:
+            consultas += [
+                ('top candidatos', top[:tamanho], 'matching_vaga_top_idx'),
+                ('top candidatos (cursor)', top.filter(apos)[:tamanho], 'matching_vaga_top_idx'),
+            ]
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'score_minimo_top abaixo de {SCORE_INDICE_TOP}: top candidatos não usam o índice parcial matching_vaga_top_idx'
+            ))
+        return consultas
+
+    def handle(self, *args, **options):
+        falhas = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Com tabelas pequenas o planner prefere varrer a tabela; aqui
+                # interessa saber se o índice atende a consulta
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for descricao, queryset, indice in self.consultas():
+                plano = queryset.explain()
+                if indice in plano:
+                    self.stdout.write(f'OK     {descricao}: {indice}')
+                else:
+                    self.stdout.write(self.style.ERROR(f'FALHA  {descricao}: {indice} não usado'))
+                    falhas.append(descricao)
+                if options['verbosity'] > 1:
+                    self.stdout.write(plano)
+
+        if falhas:
+            raise CommandError(f'{len(falhas)} consulta(s) sem o índice esperado: {", ".join(falhas)}')
+        self.stdout.write(self.style.SUCCESS('Todas as consultas usam os índices esperados.'))
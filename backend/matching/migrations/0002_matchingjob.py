@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vagas', '0002_vaga_data_limite_vaga_escolaridade_minima_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('matching', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluido', 'Concluído'), ('erro', 'Erro')], default='pendente', max_length=15)),
+                ('task_id', models.CharField(blank=True, max_length=255)),
+                ('total_candidatos', models.IntegerField(default=0)),
+                ('candidatos_processados', models.IntegerField(default=0)),
+                ('mensagem_erro', models.TextField(blank=True)),
+                ('data_criacao', models.DateTimeField(auto_now_add=True)),
+                ('data_inicio', models.DateTimeField(blank=True, null=True)),
+                ('data_fim', models.DateTimeField(blank=True, null=True)),
+                ('historico', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='matching.historicomatching')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('vaga', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matching_jobs', to='vagas.vaga')),
+            ],
+            options={
+                'ordering': ['-data_criacao'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('curriculos', '0002_alter_tipovagaprocurada_salario_minimo'),
+        ('matching', '0002_matchingjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurriculoFeatures',
+            fields=[
+                ('curriculo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='features', serialize=False, to='curriculos.curriculo')),
+                ('experiencias', models.JSONField(default=list)),
+                ('habilidades', models.JSONField(default=list)),
+                ('maior_nivel_escolaridade', models.IntegerField(default=0)),
+                ('cursos', models.JSONField(default=list)),
+                ('tem_perfil', models.BooleanField(default=False)),
+                ('endereco', models.TextField(blank=True)),
+                ('tem_habilitacao', models.BooleanField(default=False)),
+                ('disponibilidade_mudanca', models.BooleanField(default=False)),
+                ('pretensao_salarial', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('areas_interesse', models.TextField(blank=True, null=True)),
+                ('data_atualizacao', models.DateTimeField(auto_now=True)),
+                ('trabalhador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
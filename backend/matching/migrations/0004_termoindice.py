@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculos', '0002_alter_tipovagaprocurada_salario_minimo'),
+        ('matching', '0003_curriculofeatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermoIndice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('habilidade', 'Habilidade'), ('area', 'Área de interesse')], max_length=15)),
+                ('termo', models.CharField(max_length=200)),
+                ('curriculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='termos_indice', to='curriculos.curriculo')),
+            ],
+            options={
+                'unique_together': {('tipo', 'termo', 'curriculo')},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculos', '0002_alter_tipovagaprocurada_salario_minimo'),
+        ('vagas', '0002_vaga_data_limite_vaga_escolaridade_minima_and_more'),
+        ('matching', '0004_termoindice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('motivo', models.CharField(blank=True, max_length=100)),
+                ('data_criacao', models.DateTimeField(auto_now_add=True)),
+                ('curriculo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='curriculos.curriculo')),
+                ('vaga', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='vagas.vaga')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='matchingpendente',
+            constraint=models.UniqueConstraint(fields=('vaga', 'curriculo'), name='matching_pendente_par_unico'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchingpendente',
+            constraint=models.UniqueConstraint(condition=models.Q(('curriculo__isnull', True)), fields=('vaga',), name='matching_pendente_vaga_unica'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchingpendente',
+            constraint=models.UniqueConstraint(condition=models.Q(('vaga__isnull', True)), fields=('curriculo',), name='matching_pendente_curriculo_unico'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchingpendente',
+            constraint=models.CheckConstraint(check=models.Q(('vaga__isnull', False), ('curriculo__isnull', False), _connector='OR'), name='matching_pendente_nao_vazio'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def criar_versao_inicial(apps, schema_editor):
+    # Versão 1 com os pesos e limiares que eram fixos no engine
+    ConfiguracaoMatching = apps.get_model('matching', 'ConfiguracaoMatching')
+    ConfiguracaoMatching.objects.get_or_create(
+        versao=1, defaults={'descricao': 'Configuração inicial'}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('matching', '0005_matchingpendente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingresult',
+            name='config_versao',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ConfiguracaoMatching',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('versao', models.PositiveIntegerField(unique=True)),
+                ('peso_experiencia', models.FloatField(default=0.3)),
+                ('peso_habilidades', models.FloatField(default=0.25)),
+                ('peso_escolaridade', models.FloatField(default=0.2)),
+                ('peso_localizacao', models.FloatField(default=0.15)),
+                ('peso_salario', models.FloatField(default=0.1)),
+                ('score_minimo_top', models.FloatField(default=0.3, help_text='Score mínimo para top candidatos e recomendações')),
+                ('score_compativel', models.FloatField(default=0.5, help_text='Score a partir do qual o candidato é compatível')),
+                ('descricao', models.TextField(blank=True)),
+                ('data_criacao', models.DateTimeField(auto_now_add=True)),
+                ('criado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-versao'],
+            },
+        ),
+        migrations.RunPython(criar_versao_inicial, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:17
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_coordenadas(apps, schema_editor):
+    # As features guardam as coordenadas do perfil para a pontuação em lote
+    CurriculoFeatures = apps.get_model('matching', 'CurriculoFeatures')
+    PerfilTrabalhador = apps.get_model('usuarios', 'PerfilTrabalhador')
+    perfil = PerfilTrabalhador.objects.filter(usuario_id=OuterRef('trabalhador_id'))
+    CurriculoFeatures.objects.update(
+        latitude=Subquery(perfil.values('latitude')[:1]),
+        longitude=Subquery(perfil.values('longitude')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0006_configuracaomatching'),
+        ('usuarios', '0002_perfiltrabalhador_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculofeatures',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='curriculofeatures',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(copiar_coordenadas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculos', '0002_alter_tipovagaprocurada_salario_minimo'),
+        ('matching', '0007_curriculofeatures_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='configuracaomatching',
+            name='peso_texto',
+            field=models.FloatField(default=0.0, help_text='Peso da relevância textual (BM25)'),
+        ),
+        migrations.AddField(
+            model_name='curriculofeatures',
+            name='comprimento_texto',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='curriculofeatures',
+            name='termos_texto',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='matchingresult',
+            name='score_texto',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.CreateModel(
+            name='TermoTexto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('termo', models.CharField(max_length=100)),
+                ('frequencia', models.PositiveIntegerField()),
+                ('curriculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='termos_texto', to='curriculos.curriculo')),
+            ],
+            options={
+                'unique_together': {('termo', 'curriculo')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0008_configuracaomatching_peso_texto_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecucaoRematch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('executando', 'Executando'), ('interrompida', 'Interrompida'), ('concluida', 'Concluída'), ('erro', 'Erro')], default='executando', max_length=15)),
+                ('config_versao', models.PositiveIntegerField(blank=True, null=True)),
+                ('total_vagas', models.IntegerField(default=0)),
+                ('ultima_vaga_id', models.IntegerField(default=0)),
+                ('vagas_processadas', models.IntegerField(default=0)),
+                ('candidatos_avaliados', models.BigIntegerField(default=0)),
+                ('resultados_gravados', models.BigIntegerField(default=0)),
+                ('duracao_segundos', models.FloatField(default=0.0)),
+                ('sessoes', models.PositiveIntegerField(default=0)),
+                ('mensagem_erro', models.TextField(blank=True)),
+                ('data_inicio', models.DateTimeField(auto_now_add=True)),
+                ('data_atualizacao', models.DateTimeField(auto_now=True)),
+                ('data_fim', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-data_inicio'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0009_execucaorematch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicomatching',
+            index=models.Index(fields=['-data_execucao', '-id'], name='historico_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchingresult',
+            index=models.Index(condition=models.Q(('score_total__gte', 0.3)), fields=['vaga', '-score_total', 'id'], name='matching_vaga_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchingresult',
+            index=models.Index(fields=['trabalhador', '-score_total', 'id'], name='matching_trab_score_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0010_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingpendente',
+            name='data_reserva',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
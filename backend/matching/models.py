@@ -3,6 +3,10 @@ from usuarios.models import CustomUser
 from vagas.models import Vaga
 from curriculos.models import Curriculo
 
+# Limite do índice parcial dos top candidatos: o score_minimo_top padrão.
+# Com um score mínimo menor, a consulta volta a usar o índice do par único
+SCORE_INDICE_TOP = 0.3
+
 class MatchingResult(models.Model):
     vaga = models.ForeignKey(Vaga, on_delete=models.CASCADE, related_name='matches')
     trabalhador = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='matches')
@@ -12,12 +16,23 @@ class MatchingResult(models.Model):
     score_escolaridade = models.FloatField()
     score_localizacao = models.FloatField()
     score_salario = models.FloatField()
+    score_texto = models.FloatField(default=0.0)
     detalhes_matching = models.JSONField(default=dict)
+    # Versão de ConfiguracaoMatching usada no score_total
+    config_versao = models.PositiveIntegerField(null=True, blank=True)
     data_calculo = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         unique_together = ('vaga', 'trabalhador')
         ordering = ['-score_total']
+        # Na ordem da paginação por cursor (-score_total, id)
+        indexes = [
+            models.Index(
+                fields=['vaga', '-score_total', 'id'], condition=models.Q(score_total__gte=SCORE_INDICE_TOP),
+                name='matching_vaga_top_idx'
+            ),
+            models.Index(fields=['trabalhador', '-score_total', 'id'], name='matching_trab_score_idx'),
+        ]
     
     def __str__(self):
         return f"Match: {self.trabalhador.get_full_name()} x {self.vaga.titulo} ({self.score_total:.2f})"
@@ -30,5 +45,211 @@ class HistoricoMatching(models.Model):
     data_execucao = models.DateTimeField(auto_now_add=True)
     parametros_utilizados = models.JSONField(default=dict)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['-data_execucao', '-id'], name='historico_data_idx'),
+        ]
+    
     def __str__(self):
         return f"Histórico: {self.vaga.titulo} - {self.data_execucao}"
+
+class MatchingJob(models.Model):
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('executando', 'Executando'),
+        ('concluido', 'Concluído'),
+        ('erro', 'Erro'),
+    ]
+    
+    vaga = models.ForeignKey(Vaga, on_delete=models.CASCADE, related_name='matching_jobs')
+    solicitado_por = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pendente')
+    task_id = models.CharField(max_length=255, blank=True)
+    total_candidatos = models.IntegerField(default=0)
+    candidatos_processados = models.IntegerField(default=0)
+    historico = models.ForeignKey(HistoricoMatching, on_delete=models.SET_NULL, null=True, blank=True)
+    mensagem_erro = models.TextField(blank=True)
+    data_criacao = models.DateTimeField(auto_now_add=True)
+    data_inicio = models.DateTimeField(null=True, blank=True)
+    data_fim = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-data_criacao']
+    
+    @property
+    def progresso(self):
+        if self.status == 'concluido':
+            return 100
+        if not self.total_candidatos:
+            return 0
+        return int(self.candidatos_processados * 100 / self.total_candidatos)
+    
+    def __str__(self):
+        return f"Job {self.id}: {self.vaga.titulo} ({self.get_status_display()})"
+
+class CurriculoFeatures(models.Model):
+    """Dados do currículo já pré-processados para o matching"""
+    curriculo = models.OneToOneField(
+        Curriculo, on_delete=models.CASCADE, primary_key=True, related_name='features'
+    )
+    trabalhador = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    # [dias (None se emprego atual), data_inicio ordinal, cargo, descricao]
+    experiencias = models.JSONField(default=list)
+    habilidades = models.JSONField(default=list)
+    maior_nivel_escolaridade = models.IntegerField(default=0)
+    cursos = models.JSONField(default=list)
+    tem_perfil = models.BooleanField(default=False)
+    endereco = models.TextField(blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    tem_habilitacao = models.BooleanField(default=False)
+    disponibilidade_mudanca = models.BooleanField(default=False)
+    pretensao_salarial = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    areas_interesse = models.TextField(null=True, blank=True)
+    # Frequência de cada termo do texto do currículo e total de termos (BM25)
+    termos_texto = models.JSONField(default=dict)
+    comprimento_texto = models.PositiveIntegerField(default=0)
+    data_atualizacao = models.DateTimeField(auto_now=True)
+    
+    def total_anos(self, hoje):
+        """Anos de experiência somados na mesma ordem do cálculo original"""
+        total_anos = 0
+        for dias, inicio, _, _ in self.experiencias:
+            if dias is None:
+                dias = hoje.toordinal() - inicio
+            total_anos += dias / 365
+        return total_anos
+    
+    def __str__(self):
+        return f"Features do currículo {self.curriculo_id}"
+
+class TermoIndice(models.Model):
+    """Índice invertido de termos normalizados (habilidades e áreas) por currículo"""
+    TIPO_CHOICES = [
+        ('habilidade', 'Habilidade'),
+        ('area', 'Área de interesse'),
+    ]
+    
+    tipo = models.CharField(max_length=15, choices=TIPO_CHOICES)
+    termo = models.CharField(max_length=200)
+    curriculo = models.ForeignKey(Curriculo, on_delete=models.CASCADE, related_name='termos_indice')
+    
+    class Meta:
+        unique_together = ('tipo', 'termo', 'curriculo')
+    
+    def __str__(self):
+        return f"{self.get_tipo_display()}: {self.termo}"
+
+class TermoTexto(models.Model):
+    """Índice invertido do texto dos currículos: frequência de cada termo por currículo"""
+    termo = models.CharField(max_length=100)
+    curriculo = models.ForeignKey(Curriculo, on_delete=models.CASCADE, related_name='termos_texto')
+    frequencia = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ('termo', 'curriculo')
+    
+    def __str__(self):
+        return f"{self.termo} ({self.frequencia})"
+
+class MatchingPendente(models.Model):
+    """Par (vaga, currículo) que precisa ter o matching recalculado.
+
+    Sem currículo, a vaga inteira deve ser recalculada; sem vaga, o currículo
+    deve ser recalculado contra todas as vagas ativas.
+    """
+    vaga = models.ForeignKey(Vaga, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    curriculo = models.ForeignKey(Curriculo, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    motivo = models.CharField(max_length=100, blank=True)
+    data_criacao = models.DateTimeField(auto_now_add=True)
+    # Quando uma execução de processar_pendencias pegou a pendência; vazio se
+    # está livre. Reservas antigas são de execuções interrompidas e são retomadas
+    data_reserva = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['vaga', 'curriculo'], name='matching_pendente_par_unico'),
+            models.UniqueConstraint(
+                fields=['vaga'], condition=models.Q(curriculo__isnull=True),
+                name='matching_pendente_vaga_unica'
+            ),
+            models.UniqueConstraint(
+                fields=['curriculo'], condition=models.Q(vaga__isnull=True),
+                name='matching_pendente_curriculo_unico'
+            ),
+            models.CheckConstraint(
+                check=models.Q(vaga__isnull=False) | models.Q(curriculo__isnull=False),
+                name='matching_pendente_nao_vazio'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Pendente: vaga {self.vaga_id or '*'} x currículo {self.curriculo_id or '*'}"
+
+class ConfiguracaoMatching(models.Model):
+    """Versão imutável dos pesos e limiares do matching; vale a de maior versão"""
+    versao = models.PositiveIntegerField(unique=True)
+    peso_experiencia = models.FloatField(default=0.3)
+    peso_habilidades = models.FloatField(default=0.25)
+    peso_escolaridade = models.FloatField(default=0.2)
+    peso_localizacao = models.FloatField(default=0.15)
+    peso_salario = models.FloatField(default=0.1)
+    peso_texto = models.FloatField(default=0.0, help_text="Peso da relevância textual (BM25)")
+    score_minimo_top = models.FloatField(default=0.3, help_text="Score mínimo para top candidatos e recomendações")
+    score_compativel = models.FloatField(default=0.5, help_text="Score a partir do qual o candidato é compatível")
+    descricao = models.TextField(blank=True)
+    criado_por = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True)
+    data_criacao = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-versao']
+    
+    @property
+    def pesos(self):
+        return {
+            'experiencia': self.peso_experiencia,
+            'habilidades': self.peso_habilidades,
+            'escolaridade': self.peso_escolaridade,
+            'localizacao': self.peso_localizacao,
+            'salario': self.peso_salario,
+            'texto': self.peso_texto,
+        }
+    
+    def __str__(self):
+        return f"Configuração de matching v{self.versao}"
+
+class ExecucaoRematch(models.Model):
+    """Rematch completo de todas as vagas ativas (manage.py rematch_matching).
+
+    As vagas são processadas em ordem de id e `ultima_vaga_id` é o ponto de
+    retomada: uma execução interrompida continua da vaga seguinte enquanto a
+    versão da configuração não mudar.
+    """
+    STATUS_CHOICES = [
+        ('executando', 'Executando'),
+        ('interrompida', 'Interrompida'),
+        ('concluida', 'Concluída'),
+        ('erro', 'Erro'),
+    ]
+    
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='executando')
+    config_versao = models.PositiveIntegerField(null=True, blank=True)
+    total_vagas = models.IntegerField(default=0)
+    ultima_vaga_id = models.IntegerField(default=0)
+    vagas_processadas = models.IntegerField(default=0)
+    candidatos_avaliados = models.BigIntegerField(default=0)
+    resultados_gravados = models.BigIntegerField(default=0)
+    # Soma das sessões (uma execução retomada tem várias)
+    duracao_segundos = models.FloatField(default=0.0)
+    sessoes = models.PositiveIntegerField(default=0)
+    mensagem_erro = models.TextField(blank=True)
+    data_inicio = models.DateTimeField(auto_now_add=True)
+    # Atualizada a cada vaga: serve de sinal de vida da execução em andamento
+    data_atualizacao = models.DateTimeField(auto_now=True)
+    data_fim = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-data_inicio']
+    
+    def __str__(self):
+        return f"Rematch {self.id} ({self.get_status_display()}): {self.vagas_processadas}/{self.total_vagas} vagas"
@@ -0,0 +1,107 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PaginacaoKeyset(BasePagination):
+    """Paginação por cursor opaco sobre uma ordenação total (keyset).
+
+    Cada página é lida com `WHERE (chave) após (cursor) ORDER BY chave LIMIT n`,
+    então o custo não cresce com a profundidade da página (ao contrário de
+    OFFSET) e inserções entre duas requisições não duplicam nem pulam itens.
+    O último campo de `ordenacao` deve ser único (o id) para desempatar.
+    """
+    ordenacao = ('-score_total', 'id')
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None) -> List[Any]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.campos = [queryset.model._meta.get_field(campo.lstrip('-')) for campo in self.ordenacao]
+
+        queryset = queryset.order_by(*self.ordenacao)
+        posicao = self.decodificar_cursor(request)
+        if posicao is not None:
+            queryset = queryset.filter(self.apos(posicao))
+
+        # Um item a mais indica se há próxima página sem contar a lista inteira
+        pagina = list(queryset[:self.page_size + 1])
+        self.proximo = pagina[self.page_size - 1] if len(pagina) > self.page_size else None
+        return pagina[:self.page_size]
+
+    def get_page_size(self, request) -> int:
+        try:
+            tamanho = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(tamanho, 1), self.max_page_size)
+
+    def apos(self, posicao: List[Any]) -> Q:
+        """Itens que vêm depois da posição na ordenação (comparação lexicográfica)"""
+        condicao = Q()
+        iguais = {}
+        for ordem, campo, valor in zip(self.ordenacao, self.campos, posicao):
+            operador = 'lt' if ordem.startswith('-') else 'gt'
+            condicao |= Q(**iguais, **{f'{campo.name}__{operador}': valor})
+            iguais[campo.name] = valor
+        return condicao
+
+    def codificar_cursor(self, item) -> str:
+        posicao = [campo.value_to_string(item) for campo in self.campos]
+        return base64.urlsafe_b64encode(json.dumps(posicao).encode()).decode()
+
+    def decodificar_cursor(self, request) -> Optional[List[Any]]:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            posicao = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(posicao, list) or len(posicao) != len(self.campos):
+                raise ValueError
+            return [campo.to_python(valor) for campo, valor in zip(self.campos, posicao)]
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.proximo is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.codificar_cursor(self.proximo))
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class PaginacaoMatching(PaginacaoKeyset):
+    """Resultados de matching do maior para o menor score"""
+    ordenacao = ('-score_total', 'id')
+
+
+class PaginacaoHistorico(PaginacaoKeyset):
+    """Execuções de matching da mais recente para a mais antiga"""
+    ordenacao = ('-data_execucao', '-id')
@@ -0,0 +1,162 @@
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+import django
+from django.db import connection, connections
+
+from vagas.models import Vaga
+from .batch import BatchScorer
+from .models import ConfiguracaoMatching, CurriculoFeatures
+from .selecao import SelecaoResultados
+
+# Campos de CurriculoFeatures enviados aos workers, na ordem das tuplas
+CAMPOS_FEATURES = (
+    'curriculo_id', 'trabalhador_id', 'experiencias', 'habilidades',
+    'maior_nivel_escolaridade', 'cursos', 'tem_perfil', 'endereco',
+    'latitude', 'longitude', 'tem_habilitacao', 'disponibilidade_mudanca',
+    'pretensao_salarial', 'areas_interesse',
+)
+
+CAMPOS_VAGA = (
+    'id', 'titulo', 'descricao', 'requisitos', 'area', 'local_trabalho',
+    'latitude', 'longitude', 'aceita_remoto', 'nivel_experiencia', 'salario_min', 'salario_max',
+)
+
+
+
+def serializar_vaga(vaga: Vaga) -> Dict:
+    """Payload compacto da vaga para os workers"""
+    return {
+        'campos': {campo: getattr(vaga, campo) for campo in CAMPOS_VAGA},
+    }
+
+
+def parametros_pontuacao(engine) -> Dict:
+    """Parâmetros do engine usados na pontuação, enviados aos workers.
+
+    Com eles o worker monta o próprio engine sem consultar a configuração
+    vigente: os processos filhos nunca abrem conexão com o banco (com "fork",
+    dentro de um bloco atômico, usariam o socket herdado do pai).
+    """
+    return {
+        'similaridade': engine.similaridade.nome,
+        'pesos': dict(engine.pesos),
+        'raio_local_km': engine.raio_local_km,
+        'raio_deslocamento_km': engine.raio_deslocamento_km,
+    }
+
+
+def dividir_em_shards(ids: List[int], quantidade: int) -> List[Tuple[int, int]]:
+    """Divide a lista ordenada de ids em intervalos contíguos (inicio, fim) inclusivos"""
+    if not ids:
+        return []
+    tamanho = -(-len(ids) // quantidade)
+    return [
+        (ids[i], ids[min(i + tamanho, len(ids)) - 1])
+        for i in range(0, len(ids), tamanho)
+    ]
+
+
+def _inicializar_worker():
+    # Com o método "spawn" o processo filho começa sem o Django configurado
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def pontuar_shard(vaga_payload: Dict, registros: List[Tuple], parametros: Dict,
+                  top_k: int, score_minimo: float, score_compativel: float = 0.5,
+                  relevancias: Dict[int, float] = None):
+    """Pontua um shard de currículos sem acessar o banco.
+
+    Retorna os itens mantidos pela seleção local como (curriculo_id,
+    score_total, (trabalhador_id, score_data)) e as estatísticas do shard.
+    `relevancias` traz a relevância de texto já calculada pelo processo pai.
+    """
+    from .engine import MatchingEngine
+
+    # Configuração não salva, só com os pesos: nada aqui consulta o banco
+    configuracao = ConfiguracaoMatching(**{f'peso_{nome}': peso for nome, peso in parametros['pesos'].items()})
+    engine = MatchingEngine(
+        similaridade=parametros['similaridade'], configuracao=configuracao,
+        raio_local_km=parametros['raio_local_km'], raio_deslocamento_km=parametros['raio_deslocamento_km'],
+    )
+    vaga = Vaga(**vaga_payload['campos'])
+    features = [CurriculoFeatures(**dict(zip(CAMPOS_FEATURES, registro))) for registro in registros]
+
+    scorer = BatchScorer(engine)
+    selecao = SelecaoResultados(top_k=top_k, score_minimo=score_minimo, score_compativel=score_compativel)
+    for registro, linha in zip(features, scorer.pontuar(features, vaga, relevancias or {})):
+        selecao.adicionar(registro.curriculo_id, linha[0], (registro, linha))
+
+    mantidos = selecao.selecionados()
+    scores = scorer.montar([linha for _, linha in mantidos])
+    itens = [
+        (registro.curriculo_id, score_data['score_total'], (registro.trabalhador_id, score_data))
+        for (registro, _), score_data in zip(mantidos, scores)
+    ]
+    return itens, selecao.avaliados, selecao.compativeis, selecao.soma_scores
+
+
+def pode_criar_processos() -> bool:
+    """Processos daemon (como os filhos do pool prefork do Celery) não podem ter filhos"""
+    return not multiprocessing.current_process().daemon
+
+
+def pontuar_em_paralelo(engine, curriculos, vaga: Vaga, selecao: SelecaoResultados,
+                        workers: int, shards_por_worker: int = 4,
+                        callback_progresso: Callable[[int, int], None] = None) -> List[Tuple[int, Dict]]:
+    """Pontua os currículos em shards distribuídos entre processos.
+
+    Os shards são lidos do banco sob demanda e no máximo `2 * workers` ficam
+    em andamento: o processo pai nunca guarda o payload da população inteira.
+    """
+    ids = list(curriculos.order_by('id').values_list('id', flat=True))
+    vaga_payload = serializar_vaga(vaga)
+    parametros = parametros_pontuacao(engine)
+    relevancias = engine._relevancia(vaga).scores()
+    base = CurriculoFeatures.objects.filter(curriculo__in=curriculos.values('id'))
+
+    def shards():
+        for intervalo in dividir_em_shards(ids, workers * shards_por_worker):
+            registros = list(
+                base.filter(curriculo__id__range=intervalo).order_by('curriculo_id').values_list(*CAMPOS_FEATURES)
+            )
+            yield registros, {
+                registro[0]: relevancias[registro[0]] for registro in registros if registro[0] in relevancias
+            }
+
+    pendentes = shards()
+    primeiro = next(pendentes, None)
+    if primeiro is None:
+        return selecao.selecionados()
+    pendentes = itertools.chain([primeiro], pendentes)
+    del primeiro
+
+    # Com "fork" os processos são criados no primeiro submit; as conexões
+    # herdadas não podem ser usadas pelos filhos, então são fechadas antes e o
+    # processo pai reabre uma conexão própria para ler os shards seguintes
+    if not connection.in_atomic_block:
+        connections.close_all()
+
+    def mesclar(futuro):
+        selecao.mesclar(*futuro.result())
+        if callback_progresso:
+            callback_progresso(selecao.avaliados, len(ids))
+
+    em_andamento = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker) as executor:
+        for registros, relevancias_shard in pendentes:
+            em_andamento.append(executor.submit(
+                pontuar_shard, vaga_payload, registros, parametros,
+                selecao.top_k, selecao.score_minimo, selecao.score_compativel, relevancias_shard
+            ))
+            if len(em_andamento) >= 2 * workers:
+                mesclar(em_andamento.popleft())
+        while em_andamento:
+            mesclar(em_andamento.popleft())
+
+    return selecao.selecionados()
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from curriculos.models import Curriculo
+from vagas.models import Vaga
+from .agendamento import agendar_apos_commit
+from .engine import MatchingEngine
+from .models import MatchingPendente
+
+# Campos da vaga que alteram o resultado do matching
+CAMPOS_MATCHING_VAGA = (
+    'titulo', 'descricao', 'requisitos', 'salario_min', 'salario_max',
+    'tipo_contrato', 'local_trabalho', 'aceita_remoto', 'area',
+    'nivel_experiencia', 'escolaridade_minima', 'status',
+)
+
+# Depois desse tempo a reserva de uma execução que não terminou (worker
+# encerrado no meio do recálculo) expira e a pendência volta a ser processada
+RESERVA_EXPIRA_EM = timedelta(minutes=30)
+
+
+def pendencias_disponiveis():
+    """Pendências livres ou com reserva expirada"""
+    return MatchingPendente.objects.filter(
+        Q(data_reserva__isnull=True) | Q(data_reserva__lt=timezone.now() - RESERVA_EXPIRA_EM)
+    )
+
+
+def _registrar(vaga_id, curriculo_id, motivo):
+    # Só registra se os objetos ainda existem (a marcação pode vir de uma
+    # exclusão em cascata)
+    if vaga_id and not Vaga.objects.filter(id=vaga_id).exists():
+        return
+    if curriculo_id and not Curriculo.objects.filter(id=curriculo_id).exists():
+        return
+    # Uma pendência já reservada volta a ficar livre: a execução que a reservou
+    # pode ter lido os dados antes desta alteração e não a remove ao terminar
+    marcadas = MatchingPendente.objects.filter(vaga_id=vaga_id, curriculo_id=curriculo_id).update(
+        data_reserva=None, motivo=motivo[:100]
+    )
+    if not marcadas:
+        MatchingPendente.objects.bulk_create(
+            [MatchingPendente(vaga_id=vaga_id, curriculo_id=curriculo_id, motivo=motivo[:100])],
+            ignore_conflicts=True
+        )
+
+
+def marcar_pendente(vaga_id=None, curriculo_id=None, motivo=''):
+    """Marca um par (ou uma vaga/currículo inteiro) para recálculo após o commit"""
+    from .tasks import processar_pendencias_matching
+
+    agendar_apos_commit(('pendente', vaga_id, curriculo_id), _registrar, vaga_id, curriculo_id, motivo)
+    agendar_apos_commit(('processar_pendencias',), processar_pendencias_matching.delay)
+
+
+def processar_pendencias(limite: int = 500, batch_size: int = None) -> dict:
+    """Recalcula apenas os pares marcados como pendentes.
+
+    As pendências são reservadas (data_reserva) e só são removidas depois que
+    os resultados foram gravados; em caso de erro a reserva é desfeita, e se o
+    processo morrer no meio ela expira após RESERVA_EXPIRA_EM. Alterações
+    feitas durante o processamento liberam a pendência, que não é removida.
+    Execuções simultâneas (beat e a disparada pelo commit) pegam lotes
+    disjuntos: as linhas travadas ou reservadas por uma são puladas pela outra.
+    """
+    reserva = timezone.now()
+    with transaction.atomic():
+        pendencias = list(pendencias_disponiveis().select_for_update(skip_locked=True).order_by('id')[:limite])
+        MatchingPendente.objects.filter(id__in=[p.id for p in pendencias]).update(data_reserva=reserva)
+    reservadas = MatchingPendente.objects.filter(id__in=[p.id for p in pendencias], data_reserva=reserva)
+
+    vagas_completas = {p.vaga_id for p in pendencias if p.curriculo_id is None}
+    curriculos_completos = {p.curriculo_id for p in pendencias if p.vaga_id is None}
+    pares = defaultdict(set)
+    for p in pendencias:
+        if p.vaga_id and p.curriculo_id and p.vaga_id not in vagas_completas \
+                and p.curriculo_id not in curriculos_completos:
+            pares[p.vaga_id].add(p.curriculo_id)
+
+    engine = MatchingEngine()
+    recalculados = 0
+    try:
+        for vaga in Vaga.objects.filter(id__in=vagas_completas | set(pares)):
+            curriculos_ids = None if vaga.id in vagas_completas else pares[vaga.id]
+            recalculados += len(engine.calcular_matching_vaga(
+                vaga, batch_size=batch_size, curriculos_ids=curriculos_ids
+            ))
+        for curriculo in Curriculo.objects.filter(id__in=curriculos_completos):
+            recalculados += len(engine.calcular_matching_curriculo(curriculo, batch_size=batch_size))
+    except Exception:
+        reservadas.update(data_reserva=None)
+        raise
+    reservadas.delete()
+
+    return {
+        'pendencias': len(pendencias),
+        'vagas': len(vagas_completas),
+        'curriculos': len(curriculos_completos),
+        'pares': sum(len(ids) for ids in pares.values()),
+        'resultados_recalculados': recalculados,
+        'restantes': pendencias_disponiveis().count(),
+    }
@@ -0,0 +1,72 @@
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+
+from .models import MatchingResult
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_SCORE = [
+    'score_total',
+    'score_experiencia',
+    'score_habilidades',
+    'score_escolaridade',
+    'score_localizacao',
+    'score_salario',
+    'score_texto',
+    # Sem a chave em score_data volta a {}: os detalhes do par são recalculados sob demanda
+    'detalhes_matching',
+    'config_versao',
+]
+
+
+class MatchingResultWriter:
+    """Persiste resultados de matching em lotes via INSERT ... ON CONFLICT DO UPDATE"""
+
+    def __init__(self, batch_size: int = None, config_versao: int = None):
+        self.batch_size = batch_size or getattr(settings, 'MATCHING_BULK_BATCH_SIZE', 1000)
+        self.config_versao = config_versao
+        self.estatisticas = {}
+
+    def salvar(self, pares: Iterable[Tuple[int, int, Dict]],
+               callback_progresso: Callable[[int, int], None] = None) -> List[MatchingResult]:
+        """Grava os resultados de pares (vaga_id, trabalhador_id, score_data).
+
+        Os objetos retornados refletem os valores gravados, mas não têm a chave
+        primária preenchida (o Django 4.2 não a devolve em upserts).
+        """
+        objetos = [
+            MatchingResult(
+                vaga_id=vaga_id, trabalhador_id=trabalhador_id, config_versao=self.config_versao, **score_data
+            )
+            for vaga_id, trabalhador_id, score_data in pares
+        ]
+
+        inicio = time.perf_counter()
+        # Cada lote é confirmado isoladamente para que o progresso fique visível
+        # fora da transação; o upsert é idempotente se a execução for repetida
+        for i in range(0, len(objetos), self.batch_size):
+            MatchingResult.objects.bulk_create(
+                objetos[i:i + self.batch_size],
+                update_conflicts=True,
+                unique_fields=['vaga', 'trabalhador'],
+                update_fields=CAMPOS_SCORE,
+            )
+            if callback_progresso:
+                callback_progresso(min(i + self.batch_size, len(objetos)), len(objetos))
+        duracao = time.perf_counter() - inicio
+
+        self.estatisticas = {
+            'linhas_gravadas': len(objetos),
+            'lotes': -(-len(objetos) // self.batch_size),
+            'batch_size': self.batch_size,
+            'duracao_segundos': round(duracao, 4),
+            'linhas_por_segundo': round(len(objetos) / duracao, 1) if duracao > 0 else 0.0,
+        }
+        logger.info(
+            'MatchingResult: %(linhas_gravadas)d linhas em %(lotes)d lotes '
+            '(%(linhas_por_segundo).1f linhas/s)', self.estatisticas
+        )
+        return objetos
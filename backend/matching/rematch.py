@@ -0,0 +1,126 @@
+import logging
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from vagas.models import Vaga
+from .engine import MatchingEngine
+from .models import ExecucaoRematch
+
+logger = logging.getLogger(__name__)
+
+# Execução sem atualização há mais tempo que isso é considerada abandonada
+# (processo morto) e pode ser retomada por outra
+INTERVALO_SINAL_DE_VIDA = timedelta(minutes=30)
+
+
+def vagas_ativas():
+    return Vaga.objects.filter(status='ativa', empresa__aprovado=True, empresa__ativo=True)
+
+
+def em_execucao() -> Optional[ExecucaoRematch]:
+    """Execução em andamento com sinal de vida recente, se houver"""
+    return ExecucaoRematch.objects.filter(
+        status='executando', data_atualizacao__gte=timezone.now() - INTERVALO_SINAL_DE_VIDA
+    ).first()
+
+
+def _execucao_para_retomar(config_versao: int, reiniciar: bool) -> ExecucaoRematch:
+    pendentes = ExecucaoRematch.objects.exclude(status='concluida')
+    anterior = pendentes.first()
+    if anterior is not None and not reiniciar and anterior.config_versao == config_versao:
+        return anterior
+    # Resultados de outra versão da configuração não podem ser misturados
+    pendentes.update(status='interrompida', data_fim=timezone.now())
+    return ExecucaoRematch.objects.create(config_versao=config_versao, total_vagas=vagas_ativas().count())
+
+
+def executar_rematch(workers: int = None, tempo_maximo: float = None, batch_size: int = None,
+                     lote_vagas: int = 100, reiniciar: bool = False) -> ExecucaoRematch:
+    """Recalcula o matching de todas as vagas ativas, retomando a última execução interrompida.
+
+    As vagas são lidas em lotes de `lote_vagas` ids a partir do ponto de
+    retomada e cada uma é pontuada pelo caminho vetorizado (em `workers`
+    processos), que já lê os candidatos em lotes; a memória fica limitada aos
+    resultados de uma vaga. O ponto de retomada é gravado após cada vaga, e
+    uma vaga é iniciada apenas se o tempo médio por vaga ainda cabe em
+    `tempo_maximo` segundos (0 ou None = sem limite). Cada vaga registra um
+    HistoricoMatching com a vazão medida.
+    """
+    if workers is None:
+        workers = getattr(settings, 'MATCHING_WORKERS', 1)
+    if tempo_maximo is None:
+        tempo_maximo = getattr(settings, 'MATCHING_REMATCH_TEMPO_MAXIMO', 0)
+
+    engine = MatchingEngine()
+    execucao = _execucao_para_retomar(engine.configuracao.versao, reiniciar)
+    ExecucaoRematch.objects.filter(id=execucao.id).update(
+        status='executando', sessoes=F('sessoes') + 1, data_fim=None
+    )
+    logger.info('Rematch %d: retomando após a vaga %d (configuração v%s)',
+                execucao.id, execucao.ultima_vaga_id, execucao.config_versao)
+
+    inicio = time.perf_counter()
+    vagas_sessao = 0
+    status = 'concluida'
+    try:
+        while status == 'concluida':
+            lote = list(vagas_ativas().filter(id__gt=execucao.ultima_vaga_id).order_by('id')[:lote_vagas])
+            if not lote:
+                break
+            for vaga in lote:
+                decorrido = time.perf_counter() - inicio
+                if tempo_maximo and vagas_sessao and decorrido + decorrido / vagas_sessao > tempo_maximo:
+                    status = 'interrompida'
+                    break
+                _rematch_vaga(engine, execucao, vaga, workers, batch_size)
+                vagas_sessao += 1
+    except Exception as e:
+        _encerrar(execucao, 'erro', time.perf_counter() - inicio, mensagem_erro=str(e))
+        raise
+
+    _encerrar(execucao, status, time.perf_counter() - inicio)
+    logger.info('Rematch %d %s: %d vagas nesta sessão, %d de %d no total',
+                execucao.id, status, vagas_sessao, execucao.vagas_processadas, execucao.total_vagas)
+    return execucao
+
+
+def _rematch_vaga(engine: MatchingEngine, execucao: ExecucaoRematch, vaga: Vaga,
+                  workers: int, batch_size: int = None):
+    inicio = time.perf_counter()
+    resultados = engine.calcular_matching_vaga(vaga, batch_size=batch_size, workers=workers)
+    duracao = time.perf_counter() - inicio
+    avaliados = engine.estatisticas_execucao['total_candidatos']
+
+    engine.registrar_historico(vaga, resultados, extras={
+        'rematch': {
+            'execucao': execucao.id,
+            'workers': workers,
+            'duracao_segundos': round(duracao, 4),
+            'candidatos_por_segundo': round(avaliados / duracao, 1) if duracao > 0 else 0.0,
+            'resultados_gravados': len(resultados),
+            'persistencia': engine.estatisticas_persistencia,
+        }
+    })
+
+    # Ponto de retomada: a vaga só conta depois de gravada por inteiro
+    execucao.ultima_vaga_id = vaga.id
+    execucao.vagas_processadas += 1
+    execucao.candidatos_avaliados += avaliados
+    execucao.resultados_gravados += len(resultados)
+    execucao.save(update_fields=[
+        'ultima_vaga_id', 'vagas_processadas', 'candidatos_avaliados', 'resultados_gravados', 'data_atualizacao'
+    ])
+
+
+def _encerrar(execucao: ExecucaoRematch, status: str, duracao: float, mensagem_erro: str = ''):
+    execucao.refresh_from_db(fields=['duracao_segundos'])
+    execucao.status = status
+    execucao.duracao_segundos += duracao
+    execucao.mensagem_erro = mensagem_erro
+    execucao.data_fim = timezone.now()
+    execucao.save(update_fields=['status', 'duracao_segundos', 'mensagem_erro', 'data_fim', 'data_atualizacao'])
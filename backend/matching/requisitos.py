@@ -0,0 +1,171 @@
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from core.geo import normalizar
+from vagas.models import RequisitoVaga
+from .automato import AhoCorasick
+from .features import NIVEL_ESCOLARIDADE
+from .restricoes import NIVEL_MINIMO_VAGA
+
+# Palavra da descrição de um requisito de escolaridade e a chave de
+# NIVEL_MINIMO_VAGA correspondente, da mais para a menos específica
+PALAVRAS_ESCOLARIDADE = (
+    ('doutorado', 'doutorado'),
+    ('mestrado', 'mestrado'),
+    ('pos', 'pos_graduacao'),
+    ('especializacao', 'pos_graduacao'),
+    ('mba', 'pos_graduacao'),
+    ('superior', 'superior'),
+    ('graduacao', 'superior'),
+    ('bacharelado', 'superior'),
+    ('licenciatura', 'superior'),
+    ('tecnologo', 'superior'),
+    ('tecnico', 'tecnico'),
+    ('medio', 'medio'),
+    ('fundamental', 'fundamental'),
+)
+
+CONTADORES = {
+    'obrigatorio': 'obrigatorios',
+    'desejavel': 'desejaveis',
+    'diferencial': 'diferenciais',
+}
+
+
+def nivel_minimo_escolaridade(descricao: str) -> Optional[int]:
+    """Nível (na escala de NIVEL_ESCOLARIDADE) exigido por um requisito de escolaridade, ou None"""
+    palavras = set(normalizar(descricao).split())
+    for palavra, chave in PALAVRAS_ESCOLARIDADE:
+        if palavra in palavras:
+            if 'incompleto' in palavras and f'{chave}_incompleto' in NIVEL_ESCOLARIDADE:
+                return NIVEL_ESCOLARIDADE[f'{chave}_incompleto']
+            return NIVEL_MINIMO_VAGA[chave]
+    return None
+
+
+class ItemRequisito(NamedTuple):
+    tipo: str
+    # Descrição em minúsculas (habilidade) e nível mínimo (escolaridade)
+    termo: str
+    nivel_minimo: Optional[int]
+    contador: str
+    peso: int
+
+
+class PlanoRequisitos(NamedTuple):
+    """Requisitos detalhados de uma vaga compilados uma vez para avaliar muitos candidatos.
+
+    Imutável: pode ser compartilhado entre currículos e execuções. Uma
+    habilidade é atendida quando o termo ocorre no texto das habilidades do
+    candidato (como `termo in ' '.join(habilidades)`); todos os termos são
+    procurados em uma única passada do automato e os obrigatórios são
+    conferidos por inclusão de conjuntos, depois da habilitação e da
+    escolaridade mínimas.
+    """
+    itens: Tuple[ItemRequisito, ...]
+    # termo -> posições em `itens` dos requisitos de habilidade com esse termo
+    por_termo: Mapping[str, Tuple[int, ...]]
+    automato: AhoCorasick
+    habilitacao: Tuple[int, ...]
+    escolaridade: Tuple[int, ...]
+    # Restrições dos requisitos obrigatórios
+    termos_obrigatorios: frozenset
+    exige_habilitacao: bool
+    escolaridade_minima: int
+    # Soma dos pesos dos requisitos verificáveis
+    peso_total: int
+
+    def avaliar(self, habilidades: Iterable[str], tem_habilitacao: bool, nivel_escolaridade: int) -> Dict:
+        """Requisitos atendidos por importância, se todos os obrigatórios são atendidos e
+        a pontuação ponderada por RequisitoVaga.peso (zero se falta algum obrigatório)"""
+        # As contagens exibidas precisam dos termos encontrados mesmo quando um
+        # piso dos obrigatórios falha; sem requisitos de habilidade não há busca
+        encontrados = self.automato.encontrar(' '.join(habilidades)) if self.por_termo else set()
+        obrigatorios = (
+            self._atende_pisos(tem_habilitacao, nivel_escolaridade)
+            and self.termos_obrigatorios <= encontrados
+        )
+
+        atendidos = [posicao for termo in encontrados for posicao in self.por_termo[termo]]
+        if tem_habilitacao:
+            atendidos += self.habilitacao
+        atendidos += [
+            posicao for posicao in self.escolaridade if nivel_escolaridade >= self.itens[posicao].nivel_minimo
+        ]
+
+        contagem = dict.fromkeys(CONTADORES.values(), 0)
+        peso = 0
+        for posicao in atendidos:
+            item = self.itens[posicao]
+            contagem[item.contador] += 1
+            peso += item.peso
+
+        if not obrigatorios:
+            pontuacao = 0.0
+        elif self.peso_total:
+            pontuacao = round(peso / self.peso_total, 2)
+        else:
+            pontuacao = 1.0
+        return {
+            'requisitos_atendidos': contagem,
+            'obrigatorios_atendidos': obrigatorios,
+            'pontuacao_requisitos': pontuacao,
+        }
+
+    def _atende_pisos(self, tem_habilitacao: bool, nivel_escolaridade: int) -> bool:
+        # Restrições dos obrigatórios que não dependem da busca de termos
+        if self.exige_habilitacao and not tem_habilitacao:
+            return False
+        return nivel_escolaridade >= self.escolaridade_minima
+
+
+def compilar_requisitos(requisitos: Iterable[RequisitoVaga]) -> PlanoRequisitos:
+    """Compila os requisitos detalhados de uma vaga em um PlanoRequisitos"""
+    itens = []
+    por_termo = {}
+    habilitacao = []
+    escolaridade = []
+    termos_obrigatorios = set()
+    exige_habilitacao = False
+    escolaridade_minima = 0
+    peso_total = 0
+
+    # Idioma, certificação, experiência e escolaridade sem nível reconhecido
+    # ainda não são verificados: nunca contam como atendidos, mas também não
+    # bloqueiam os obrigatórios nem entram no peso total
+    for posicao, requisito in enumerate(requisitos):
+        contador = CONTADORES.get(requisito.nivel_importancia, 'diferenciais')
+        obrigatorio = requisito.nivel_importancia == 'obrigatorio'
+        termo = requisito.descricao.lower()
+        nivel_minimo = None
+
+        if requisito.tipo == 'habilidade':
+            por_termo.setdefault(termo, []).append(posicao)
+            if obrigatorio:
+                termos_obrigatorios.add(termo)
+            peso_total += requisito.peso
+        elif requisito.tipo == 'habilitacao':
+            habilitacao.append(posicao)
+            exige_habilitacao = exige_habilitacao or obrigatorio
+            peso_total += requisito.peso
+        elif requisito.tipo == 'escolaridade':
+            nivel_minimo = nivel_minimo_escolaridade(requisito.descricao)
+            if nivel_minimo is not None:
+                escolaridade.append(posicao)
+                if obrigatorio:
+                    escolaridade_minima = max(escolaridade_minima, nivel_minimo)
+                peso_total += requisito.peso
+
+        itens.append(ItemRequisito(requisito.tipo, termo, nivel_minimo, contador, requisito.peso))
+
+    return PlanoRequisitos(
+        itens=tuple(itens),
+        por_termo=MappingProxyType({termo: tuple(posicoes) for termo, posicoes in por_termo.items()}),
+        automato=AhoCorasick(por_termo),
+        habilitacao=tuple(habilitacao),
+        escolaridade=tuple(escolaridade),
+        termos_obrigatorios=frozenset(termos_obrigatorios),
+        exige_habilitacao=exige_habilitacao,
+        escolaridade_minima=escolaridade_minima,
+        peso_total=peso_total,
+    )
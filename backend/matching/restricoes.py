@@ -0,0 +1,183 @@
+import re
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Q
+
+from core.geo import caixa_delimitadora
+from curriculos.models import Curriculo, Escolaridade
+from vagas.models import Vaga
+from .features import NIVEL_ESCOLARIDADE
+
+# Nível mínimo (na escala de NIVEL_ESCOLARIDADE) exigido por Vaga.escolaridade_minima
+NIVEL_MINIMO_VAGA = {
+    'fundamental': NIVEL_ESCOLARIDADE['fundamental_completo'],
+    'medio': NIVEL_ESCOLARIDADE['medio_completo'],
+    'tecnico': NIVEL_ESCOLARIDADE['tecnico'],
+    'superior': NIVEL_ESCOLARIDADE['superior_completo'],
+    'pos_graduacao': NIVEL_ESCOLARIDADE['pos_graduacao'],
+    'mestrado': NIVEL_ESCOLARIDADE['mestrado'],
+    'doutorado': NIVEL_ESCOLARIDADE['doutorado'],
+}
+
+RESTRICOES = ('salario', 'localizacao', 'escolaridade', 'area', 'tipo_contrato')
+
+
+def _restricao_salario(vaga: Vaga):
+    if not vaga.salario_max:
+        return None
+    # Pretensão ou salário mínimo aceito acima do teto da vaga
+    return (
+        (Q(pretensao_salarial__isnull=True) | Q(pretensao_salarial__lte=vaga.salario_max)) &
+        (Q(tipo_vaga_procurada__salario_minimo__isnull=True) |
+         Q(tipo_vaga_procurada__salario_minimo__lte=vaga.salario_max))
+    )
+
+
+def _restricao_localizacao(vaga: Vaga):
+    if vaga.aceita_remoto:
+        return None
+    aceita_mudanca = Q(disponibilidade_mudanca=True) | Q(tipo_vaga_procurada__aceita_mudanca=True)
+
+    if vaga.latitude is not None:
+        # Caixa em torno do raio de deslocamento, sobre o índice (latitude,
+        # longitude) do perfil; sem coordenadas o candidato é mantido
+        lat_min, lat_max, lon_min, lon_max = caixa_delimitadora(
+            vaga.latitude, vaga.longitude, getattr(settings, 'MATCHING_RAIO_DESLOCAMENTO_KM', 100)
+        )
+        return (
+            Q(trabalhador__perfil_trabalhador__latitude__isnull=True) |
+            Q(trabalhador__perfil_trabalhador__latitude__range=(lat_min, lat_max),
+              trabalhador__perfil_trabalhador__longitude__range=(lon_min, lon_max)) |
+            aceita_mudanca
+        )
+
+    cidade = re.split(r'[,/-]', vaga.local_trabalho)[0].strip()
+    if not cidade:
+        return None
+    # Presencial em outra cidade só serve a quem aceita mudança; sem perfil o
+    # endereço é desconhecido e o candidato é mantido
+    return (
+        Q(trabalhador__perfil_trabalhador__isnull=True) |
+        Q(trabalhador__perfil_trabalhador__endereco__icontains=cidade) |
+        aceita_mudanca
+    )
+
+
+def _restricao_escolaridade(vaga: Vaga):
+    nivel_minimo = NIVEL_MINIMO_VAGA.get(vaga.escolaridade_minima)
+    if not nivel_minimo:
+        return None
+    niveis = [nivel for nivel, valor in NIVEL_ESCOLARIDADE.items() if valor >= nivel_minimo]
+    # Sem escolaridade cadastrada o nível é desconhecido e o candidato é mantido
+    return (
+        Q(Exists(Escolaridade.objects.filter(curriculo=OuterRef('pk'), nivel__in=niveis))) |
+        ~Q(Exists(Escolaridade.objects.filter(curriculo=OuterRef('pk'))))
+    )
+
+
+def _restricao_area(vaga: Vaga):
+    if not vaga.area:
+        return None
+    # Sem preferências declaradas o candidato não é descartado
+    return Q(tipo_vaga_procurada__isnull=True) | Q(tipo_vaga_procurada__areas_interesse__icontains=vaga.area)
+
+
+def _restricao_tipo_contrato(vaga: Vaga):
+    if not vaga.tipo_contrato:
+        return None
+    return Q(tipo_vaga_procurada__isnull=True) | Q(tipo_vaga_procurada__tipo_contrato=vaga.tipo_contrato)
+
+
+_CONSTRUTORES = {
+    'salario': _restricao_salario,
+    'localizacao': _restricao_localizacao,
+    'escolaridade': _restricao_escolaridade,
+    'area': _restricao_area,
+    'tipo_contrato': _restricao_tipo_contrato,
+}
+
+
+def normalizar_restricoes(restricoes) -> Tuple[str, ...]:
+    """Aceita True (todas), um iterável de nomes ou uma string separada por vírgula"""
+    if restricoes is True:
+        return RESTRICOES
+    if not restricoes:
+        return ()
+    if isinstance(restricoes, str):
+        restricoes = restricoes.split(',')
+    nomes = tuple(nome.strip() for nome in restricoes if nome.strip())
+    desconhecidas = set(nomes) - set(RESTRICOES)
+    if desconhecidas:
+        raise ValueError(f"Restrições desconhecidas: {', '.join(sorted(desconhecidas))}")
+    return nomes
+
+
+def condicoes_restricoes(vaga: Vaga, restricoes: Iterable[str]) -> Dict[str, Q]:
+    """Condição que um currículo precisa satisfazer em cada restrição aplicável à vaga"""
+    condicoes = {}
+    for nome in restricoes:
+        condicao = _CONSTRUTORES[nome](vaga)
+        if condicao is not None:
+            condicoes[nome] = condicao
+    return condicoes
+
+
+# Cada vaga vira uma coluna da consulta; o PostgreSQL aceita no máximo 1664
+VAGAS_POR_CONSULTA = 500
+
+
+def _combinar(condicoes: Dict[str, Q]) -> Q:
+    todas = Q()
+    for condicao in condicoes.values():
+        todas &= condicao
+    return todas
+
+
+def aplicar_restricoes(curriculos, vaga: Vaga, restricoes) -> Tuple[object, Dict]:
+    """Filtra no banco os currículos que violam restrições eliminatórias da vaga.
+
+    Retorna o queryset filtrado e as estatísticas do corte, calculadas em uma
+    única consulta: total de candidatos, descartados e descartados por
+    restrição (um candidato pode violar mais de uma).
+    """
+    condicoes = condicoes_restricoes(vaga, normalizar_restricoes(restricoes))
+    if not condicoes:
+        return curriculos, {}
+
+    todas = _combinar(condicoes)
+    contagens = curriculos.aggregate(
+        total=Count('id'),
+        mantidos=Count('id', filter=todas),
+        **{nome: Count('id', filter=~condicao) for nome, condicao in condicoes.items()}
+    )
+    estatisticas = {
+        'restricoes': list(condicoes),
+        'candidatos_descartados': contagens['total'] - contagens['mantidos'],
+        'descartados_por_restricao': {nome: contagens[nome] for nome in condicoes},
+    }
+    return curriculos.filter(todas), estatisticas
+
+
+def vagas_bloqueadas(curriculo, vagas, restricoes, lote: int = VAGAS_POR_CONSULTA) -> set:
+    """Ids das vagas cujas restrições eliminatórias o currículo viola (uma consulta a cada `lote` vagas)"""
+    restricoes = normalizar_restricoes(restricoes)
+    if not restricoes:
+        return set()
+
+    filtros = {}
+    for vaga in vagas:
+        condicoes = condicoes_restricoes(vaga, restricoes)
+        if condicoes:
+            filtros[f'vaga_{vaga.id}'] = Count('id', filter=_combinar(condicoes))
+    if not filtros:
+        return set()
+
+    bloqueadas = set()
+    chaves = list(filtros)
+    for inicio in range(0, len(chaves), lote):
+        contagens = Curriculo.objects.filter(pk=curriculo.pk).aggregate(
+            **{chave: filtros[chave] for chave in chaves[inicio:inicio + lote]}
+        )
+        bloqueadas.update(int(chave[len('vaga_'):]) for chave, mantido in contagens.items() if not mantido)
+    return bloqueadas
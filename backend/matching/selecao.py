@@ -0,0 +1,63 @@
+import heapq
+from typing import Any, List
+
+
+class SelecaoResultados:
+    """Seleciona, em streaming, os resultados que devem ser persistidos.
+
+    Mantém apenas os `top_k` maiores scores (heap limitado) e descarta os
+    abaixo de `score_minimo`, enquanto acumula as estatísticas da população
+    inteira avaliada.
+    """
+
+    def __init__(self, top_k: int = None, score_minimo: float = 0.0, score_compativel: float = 0.5):
+        self.top_k = top_k or None
+        self.score_minimo = score_minimo or 0.0
+        self.score_compativel = score_compativel
+        self._heap = []
+        self.avaliados = 0
+        self.compativeis = 0
+        self.soma_scores = 0.0
+
+    def adicionar(self, identificador: int, score_total: float, item: Any):
+        self.avaliados += 1
+        self.soma_scores += score_total
+        if score_total >= self.score_compativel:
+            self.compativeis += 1
+
+        self._inserir(identificador, score_total, item)
+
+    def _inserir(self, identificador: int, score_total: float, item: Any):
+        if score_total < self.score_minimo:
+            return
+
+        # Em caso de empate vence o menor identificador
+        entrada = (score_total, -identificador, item)
+        if self.top_k is None or len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entrada)
+        elif entrada[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entrada)
+
+    def mesclar(self, itens, avaliados: int, compativeis: int, soma_scores: float):
+        """Incorpora a seleção feita em outro processo: itens (id, score, item) e estatísticas"""
+        self.avaliados += avaliados
+        self.compativeis += compativeis
+        self.soma_scores += soma_scores
+        for identificador, score_total, item in itens:
+            self._inserir(identificador, score_total, item)
+
+    def selecionados(self) -> List[Any]:
+        """Itens mantidos, do maior para o menor score"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    @property
+    def filtrando(self) -> bool:
+        return self.top_k is not None or self.score_minimo > 0
+
+    @property
+    def estatisticas(self) -> dict:
+        return {
+            'total_candidatos': self.avaliados,
+            'candidatos_compativeis': self.compativeis,
+            'score_medio': self.soma_scores / self.avaliados if self.avaliados else 0,
+        }
@@ -1,7 +1,18 @@
+from django.db import models
 from rest_framework import serializers
-from .models import MatchingResult, HistoricoMatching
+from .configuracao import configuracao_atual
+from .detalhes import preencher_detalhes
+from .models import MatchingResult, HistoricoMatching, MatchingJob, ConfiguracaoMatching
 from usuarios.serializers import CustomUserSerializer
-from vagas.serializers import VagaSerializer
+from vagas.models import Vaga, RequisitoVaga
+from vagas.serializers import VagaSerializer, VagaCreateSerializer
+
+class MatchingResultListSerializer(serializers.ListSerializer):
+    """Calcula de uma vez os detalhes pendentes dos resultados listados"""
+    
+    def to_representation(self, data):
+        resultados = data.all() if isinstance(data, models.Manager) else data
+        return super().to_representation(preencher_detalhes(resultados))
 
 class MatchingResultSerializer(serializers.ModelSerializer):
     trabalhador = CustomUserSerializer(read_only=True)
@@ -10,10 +21,95 @@ class MatchingResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = MatchingResult
         fields = '__all__'
+        list_serializer_class = MatchingResultListSerializer
+    
+    def to_representation(self, instance):
+        # detalhes_matching é calculado na primeira exibição do resultado
+        if not instance.detalhes_matching:
+            preencher_detalhes([instance])
+        return super().to_representation(instance)
 
 class HistoricoMatchingSerializer(serializers.ModelSerializer):
     vaga = VagaSerializer(read_only=True)
+    instrumentacao = serializers.SerializerMethodField()
+    
+    def get_instrumentacao(self, obj):
+        return (obj.parametros_utilizados or {}).get('instrumentacao')
     
     class Meta:
         model = HistoricoMatching
         fields = '__all__'
+
+class MatchingJobSerializer(serializers.ModelSerializer):
+    progresso = serializers.IntegerField(read_only=True)
+    vaga_titulo = serializers.CharField(source='vaga.titulo', read_only=True)
+    
+    class Meta:
+        model = MatchingJob
+        fields = '__all__'
+
+class SimulacaoPesosSerializer(serializers.Serializer):
+    """Pesos alternativos para a simulação; os omitidos mantêm o valor atual"""
+    PESOS = ('experiencia', 'habilidades', 'escolaridade', 'localizacao', 'salario', 'texto')
+    
+    experiencia = serializers.FloatField(min_value=0, required=False)
+    habilidades = serializers.FloatField(min_value=0, required=False)
+    escolaridade = serializers.FloatField(min_value=0, required=False)
+    localizacao = serializers.FloatField(min_value=0, required=False)
+    salario = serializers.FloatField(min_value=0, required=False)
+    texto = serializers.FloatField(min_value=0, required=False)
+    normalizar = serializers.BooleanField(default=True, help_text="Divide os pesos pela soma")
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=20)
+    
+    def pesos(self, atuais: dict) -> dict:
+        """Combina os pesos informados com os atuais"""
+        pesos = {campo: self.validated_data.get(campo, atuais[campo]) for campo in self.PESOS}
+        total = sum(pesos.values())
+        if self.validated_data['normalizar'] and total:
+            pesos = {campo: peso / total for campo, peso in pesos.items()}
+        return pesos
+    
+    def validate(self, data):
+        atuais = configuracao_atual().pesos
+        if not sum(data.get(campo, atuais[campo]) for campo in self.PESOS) > 0:
+            raise serializers.ValidationError('Ao menos um peso deve ser maior que zero.')
+        return data
+
+class PreviaMatchingSerializer(VagaCreateSerializer):
+    """Rascunho de vaga para a prévia do matching; nada é salvo"""
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=20, write_only=True)
+    
+    def construir(self):
+        """Vaga e requisitos (não salvos) a partir dos dados validados"""
+        dados = dict(self.validated_data)
+        dados.pop('limit')
+        requisitos = [RequisitoVaga(**requisito) for requisito in dados.pop('requisitos_detalhados', [])]
+        return Vaga(**dados), requisitos
+
+class ConfiguracaoMatchingSerializer(serializers.ModelSerializer):
+    """Nova versão da configuração; campos omitidos mantêm o valor vigente"""
+    PESOS = (
+        'peso_experiencia', 'peso_habilidades', 'peso_escolaridade', 'peso_localizacao',
+        'peso_salario', 'peso_texto',
+    )
+    
+    class Meta:
+        model = ConfiguracaoMatching
+        fields = '__all__'
+        read_only_fields = ('versao', 'criado_por', 'data_criacao')
+        extra_kwargs = {
+            'peso_experiencia': {'required': False, 'min_value': 0},
+            'peso_habilidades': {'required': False, 'min_value': 0},
+            'peso_escolaridade': {'required': False, 'min_value': 0},
+            'peso_localizacao': {'required': False, 'min_value': 0},
+            'peso_salario': {'required': False, 'min_value': 0},
+            'peso_texto': {'required': False, 'min_value': 0},
+            'score_minimo_top': {'required': False, 'min_value': 0, 'max_value': 1},
+            'score_compativel': {'required': False, 'min_value': 0, 'max_value': 1},
+        }
+    
+    def validate(self, data):
+        atual = configuracao_atual()
+        if not sum(data.get(campo, getattr(atual, campo)) for campo in self.PESOS) > 0:
+            raise serializers.ValidationError('Ao menos um peso deve ser maior que zero.')
+        return data
@@ -0,0 +1,110 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from curriculos.models import (
+    Curriculo, ExperienciaProfissional, Habilidade, Escolaridade, TipoVagaProcurada
+)
+from usuarios.models import CustomUser, PerfilTrabalhador
+from vagas.models import Vaga, RequisitoVaga
+from .agendamento import agendar_apos_commit
+from .configuracao import limpar_cache
+from .estatisticas import invalidar_estatisticas
+from .features import agendar_atualizacao_features
+from .models import ConfiguracaoMatching
+from .pendencias import CAMPOS_MATCHING_VAGA, marcar_pendente
+
+
+def curriculo_modificado(curriculo_id, motivo='curriculo'):
+    """Atualiza as features e marca o currículo para recálculo contra as vagas"""
+    agendar_atualizacao_features(curriculo_id)
+    marcar_pendente(curriculo_id=curriculo_id, motivo=motivo)
+
+
+@receiver(post_save, sender=Curriculo)
+def curriculo_alterado(sender, instance, **kwargs):
+    curriculo_modificado(instance.id)
+
+
+@receiver(post_save, sender=ExperienciaProfissional)
+@receiver(post_delete, sender=ExperienciaProfissional)
+@receiver(post_save, sender=Habilidade)
+@receiver(post_delete, sender=Habilidade)
+@receiver(post_save, sender=Escolaridade)
+@receiver(post_delete, sender=Escolaridade)
+@receiver(post_save, sender=TipoVagaProcurada)
+@receiver(post_delete, sender=TipoVagaProcurada)
+def componente_curriculo_alterado(sender, instance, **kwargs):
+    curriculo_modificado(instance.curriculo_id, motivo=sender.__name__.lower())
+
+
+@receiver(post_save, sender=PerfilTrabalhador)
+@receiver(post_delete, sender=PerfilTrabalhador)
+def perfil_trabalhador_alterado(sender, instance, **kwargs):
+    for curriculo_id in Curriculo.objects.filter(trabalhador_id=instance.usuario_id).values_list('id', flat=True):
+        curriculo_modificado(curriculo_id, motivo='perfil_trabalhador')
+
+
+@receiver(pre_save, sender=Vaga)
+def vaga_antes_de_salvar(sender, instance, **kwargs):
+    # Vagas novas já têm o matching agendado na criação
+    instance._campos_matching_alterados = []
+    update_fields = kwargs.get('update_fields')
+    if instance.pk is None or (update_fields and not set(update_fields) & set(CAMPOS_MATCHING_VAGA)):
+        return
+    anterior = Vaga.objects.filter(pk=instance.pk).values(*CAMPOS_MATCHING_VAGA).first()
+    if anterior is not None:
+        instance._campos_matching_alterados = [
+            campo for campo in CAMPOS_MATCHING_VAGA if anterior[campo] != getattr(instance, campo)
+        ]
+
+
+@receiver(post_save, sender=Vaga)
+def vaga_alterada(sender, instance, created, **kwargs):
+    alterados = getattr(instance, '_campos_matching_alterados', [])
+    if alterados and not created:
+        marcar_pendente(vaga_id=instance.pk, motivo=f"vaga: {', '.join(alterados)}")
+
+
+@receiver(post_save, sender=RequisitoVaga)
+@receiver(post_delete, sender=RequisitoVaga)
+def requisito_vaga_alterado(sender, instance, **kwargs):
+    marcar_pendente(vaga_id=instance.vaga_id, motivo='requisito_vaga')
+
+
+@receiver(pre_save, sender=CustomUser)
+def usuario_antes_de_salvar(sender, instance, **kwargs):
+    # Aprovação/ativação muda quem participa do matching
+    instance._participacao_matching_alterada = False
+    update_fields = kwargs.get('update_fields')
+    if instance.pk is None or instance.tipo_usuario not in ('trabalhador', 'empresa'):
+        return
+    if update_fields and not set(update_fields) & {'aprovado', 'ativo'}:
+        return
+    anterior = CustomUser.objects.filter(pk=instance.pk).values('aprovado', 'ativo').first()
+    instance._participacao_matching_alterada = (
+        anterior is not None and (anterior['aprovado'], anterior['ativo']) != (instance.aprovado, instance.ativo)
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def usuario_alterado(sender, instance, **kwargs):
+    if not getattr(instance, '_participacao_matching_alterada', False):
+        return
+    
+    if instance.tipo_usuario == 'trabalhador':
+        for curriculo_id in Curriculo.objects.filter(trabalhador_id=instance.pk).values_list('id', flat=True):
+            marcar_pendente(curriculo_id=curriculo_id, motivo='usuario')
+    else:
+        for vaga_id in Vaga.objects.filter(empresa_id=instance.pk).values_list('id', flat=True):
+            marcar_pendente(vaga_id=vaga_id, motivo='usuario')
+
+
+@receiver(post_save, sender=ConfiguracaoMatching)
+def configuracao_criada(sender, instance, created, **kwargs):
+    limpar_cache()
+    invalidar_estatisticas()
+    if created:
+        from .tasks import recalcular_scores_configuracao
+        agendar_apos_commit(
+            ('recalcular_scores', instance.versao), recalcular_scores_configuracao.delay, instance.versao
+        )
@@ -0,0 +1,290 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from core.geo import coordenadas
+from curriculos.models import (
+    Curriculo, Escolaridade, ExperienciaProfissional, Habilidade, Idioma, TipoVagaProcurada
+)
+from usuarios.models import CustomUser, PerfilEmpresa, PerfilTrabalhador
+from vagas.models import Vaga, RequisitoVaga
+
+# Usuários gerados são identificados pelo domínio do e-mail
+DOMINIO = 'sintetico.local'
+
+# Data de referência fixa para que a mesma seed gere sempre os mesmos dados
+DATA_REFERENCIA = date(2024, 1, 1)
+
+AREAS = {
+    'tecnologia': {
+        'cargos': ['Desenvolvedor Python', 'Desenvolvedor Java', 'Analista de Sistemas',
+                   'Analista de Suporte', 'Cientista de Dados', 'Desenvolvedor Front-end'],
+        'habilidades': ['python', 'django', 'java', 'sql', 'react', 'javascript', 'docker',
+                        'linux', 'git', 'aws', 'excel', 'power bi'],
+        'cursos': ['Ciência da Computação', 'Sistemas de Informação', 'Análise e Desenvolvimento de Sistemas'],
+    },
+    'vendas': {
+        'cargos': ['Vendedor', 'Representante Comercial', 'Consultor de Vendas',
+                   'Operador de Caixa', 'Gerente de Loja'],
+        'habilidades': ['negociação', 'atendimento ao cliente', 'crm', 'excel', 'vendas',
+                        'prospecção', 'pós-venda'],
+        'cursos': ['Administração', 'Marketing', 'Gestão Comercial'],
+    },
+    'saude': {
+        'cargos': ['Técnico de Enfermagem', 'Enfermeiro', 'Recepcionista de Clínica',
+                   'Auxiliar de Farmácia', 'Cuidador de Idosos'],
+        'habilidades': ['primeiros socorros', 'atendimento ao paciente', 'prontuário eletrônico',
+                        'administração de medicamentos', 'biossegurança'],
+        'cursos': ['Enfermagem', 'Técnico em Enfermagem', 'Farmácia'],
+    },
+    'logistica': {
+        'cargos': ['Auxiliar de Logística', 'Motorista', 'Conferente', 'Operador de Empilhadeira',
+                   'Almoxarife'],
+        'habilidades': ['empilhadeira', 'controle de estoque', 'roteirização', 'wms', 'excel',
+                        'direção defensiva'],
+        'cursos': ['Logística', 'Administração', 'Gestão da Cadeia de Suprimentos'],
+    },
+    'gastronomia': {
+        'cargos': ['Cozinheiro', 'Auxiliar de Cozinha', 'Garçom', 'Confeiteiro', 'Chefe de Cozinha'],
+        'habilidades': ['cozinha industrial', 'boas práticas de manipulação', 'confeitaria',
+                        'atendimento ao cliente', 'controle de estoque'],
+        'cursos': ['Gastronomia', 'Nutrição', 'Técnico em Cozinha'],
+    },
+}
+
+CIDADES = [
+    'São Paulo - SP', 'Campinas - SP', 'Santos - SP', 'Rio de Janeiro - RJ', 'Niterói - RJ',
+    'Belo Horizonte - MG', 'Curitiba - PR', 'Porto Alegre - RS', 'Salvador - BA', 'Recife - PE',
+]
+
+NOMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique',
+         'Isabela', 'João', 'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael']
+SOBRENOMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Almeida',
+              'Ferreira', 'Rodrigues', 'Gomes', 'Martins']
+
+IDIOMAS = ['Inglês', 'Espanhol', 'Francês', 'Alemão']
+NIVEIS_IDIOMA = [nivel for nivel, _ in Idioma.NIVEL_CHOICES]
+NIVEIS_HABILIDADE = [nivel for nivel, _ in Habilidade.NIVEL_CHOICES]
+NIVEIS_ESCOLARIDADE = [nivel for nivel, _ in Escolaridade.NIVEL_CHOICES]
+TIPOS_CONTRATO = [tipo for tipo, _ in Vaga.TIPO_CONTRATO_CHOICES]
+JORNADAS = [jornada for jornada, _ in Vaga.JORNADA_CHOICES]
+NIVEIS_EXPERIENCIA = ['estagiario', 'junior', 'pleno', 'senior', 'especialista']
+ESCOLARIDADES_MINIMAS = ['', 'fundamental', 'medio', 'tecnico', 'superior']
+
+
+class GeradorDadosSinteticos:
+    """Gera empresas, trabalhadores com currículo completo e vagas com requisitos.
+
+    Os dados são determinísticos a partir da seed e gravados com bulk_create,
+    sem disparar os signals de matching: as features dos currículos são
+    criadas sob demanda na primeira execução do matching.
+    """
+
+    def __init__(self, seed: int = 42, lote: int = 1000):
+        self.seed = seed
+        self.lote = lote
+        self.rnd = random.Random(seed)
+        self.senha = make_password(None)
+
+    @staticmethod
+    def limpar() -> int:
+        """Remove todos os usuários sintéticos (e, em cascata, seus dados)"""
+        removidos, _ = CustomUser.objects.filter(email__endswith=f'@{DOMINIO}').delete()
+        return removidos
+
+    @transaction.atomic
+    def gerar(self, empresas: int, trabalhadores: int, vagas: int) -> dict:
+        """Cria os registros e retorna as quantidades geradas por modelo"""
+        usuarios_empresa = self._criar_empresas(empresas)
+        curriculos = self._criar_trabalhadores(trabalhadores)
+        vagas_criadas = self._criar_vagas(vagas, usuarios_empresa)
+        return {
+            'empresas': len(usuarios_empresa),
+            'trabalhadores': len(curriculos),
+            'vagas': len(vagas_criadas),
+        }
+
+    def _usuario(self, tipo: str, indice: int) -> CustomUser:
+        nome = self.rnd.choice(NOMES)
+        sobrenome = self.rnd.choice(SOBRENOMES)
+        identificador = f'{self.seed}-{tipo[0]}{indice}'
+        return CustomUser(
+            username=f'sint-{identificador}',
+            email=f'{identificador}@{DOMINIO}',
+            password=self.senha,
+            first_name=nome,
+            last_name=sobrenome,
+            tipo_usuario=tipo,
+            aprovado=True,
+            cpf_cnpj=f'S{identificador}',
+        )
+
+    def _criar_empresas(self, quantidade: int):
+        usuarios = CustomUser.objects.bulk_create(
+            [self._usuario('empresa', i) for i in range(quantidade)], batch_size=self.lote
+        )
+        PerfilEmpresa.objects.bulk_create([
+            PerfilEmpresa(
+                usuario=usuario,
+                nome_empresa=f'{usuario.last_name} {self.rnd.choice(["Ltda", "S.A.", "ME"])} {i}',
+                cnpj=usuario.cpf_cnpj,
+                endereco=self.rnd.choice(CIDADES),
+                descricao='Empresa gerada para benchmark',
+                setor=self.rnd.choice(list(AREAS)),
+                tamanho_empresa=self.rnd.choice(['micro', 'pequena', 'media', 'grande']),
+            )
+            for i, usuario in enumerate(usuarios)
+        ], batch_size=self.lote)
+        return usuarios
+
+    def _criar_trabalhadores(self, quantidade: int):
+        usuarios = CustomUser.objects.bulk_create(
+            [self._usuario('trabalhador', i) for i in range(quantidade)], batch_size=self.lote
+        )
+
+        perfis = []
+        curriculos = []
+        for usuario in usuarios:
+            if self.rnd.random() < 0.9:
+                perfis.append(PerfilTrabalhador(
+                    usuario=usuario,
+                    cpf=usuario.cpf_cnpj[:14],
+                    data_nascimento=DATA_REFERENCIA - timedelta(days=self.rnd.randint(18 * 365, 60 * 365)),
+                    endereco=f'Rua {self.rnd.choice(SOBRENOMES)}, {self.rnd.randint(1, 2000)} - '
+                             f'{self.rnd.choice(CIDADES)}',
+                    tem_habilitacao=self.rnd.random() < 0.5,
+                ))
+            curriculos.append(Curriculo(
+                trabalhador=usuario,
+                objetivo='Busco uma oportunidade na minha área',
+                resumo_profissional='Profissional gerado para benchmark',
+                pretensao_salarial=Decimal(self.rnd.randrange(1400, 15000, 100)) if self.rnd.random() < 0.8 else None,
+                disponibilidade_viagem=self.rnd.random() < 0.4,
+                disponibilidade_mudanca=self.rnd.random() < 0.3,
+            ))
+        # bulk_create não chama save(), que preenche as coordenadas
+        for perfil in perfis:
+            perfil.latitude, perfil.longitude = coordenadas(perfil.endereco)
+        PerfilTrabalhador.objects.bulk_create(perfis, batch_size=self.lote)
+        curriculos = Curriculo.objects.bulk_create(curriculos, batch_size=self.lote)
+
+        experiencias, habilidades, escolaridades, idiomas, preferencias = [], [], [], [], []
+        for curriculo in curriculos:
+            area = self.rnd.choice(list(AREAS))
+            dados = AREAS[area]
+
+            inicio = DATA_REFERENCIA - timedelta(days=self.rnd.randint(180, 20 * 365))
+            for _ in range(self.rnd.randint(0, 4)):
+                duracao = self.rnd.randint(90, 5 * 365)
+                fim = inicio + timedelta(days=duracao)
+                atual = fim >= DATA_REFERENCIA
+                experiencias.append(ExperienciaProfissional(
+                    curriculo=curriculo,
+                    empresa=f'{self.rnd.choice(SOBRENOMES)} Ltda',
+                    cargo=self.rnd.choice(dados['cargos']),
+                    descricao=f'Atuação na área de {area} com {", ".join(self.rnd.sample(dados["habilidades"], 2))}',
+                    data_inicio=inicio,
+                    data_fim=None if atual else fim,
+                    emprego_atual=atual,
+                ))
+                if atual:
+                    break
+                inicio = fim + timedelta(days=self.rnd.randint(0, 180))
+
+            for nome in self.rnd.sample(dados['habilidades'], self.rnd.randint(1, min(6, len(dados['habilidades'])))):
+                habilidades.append(Habilidade(
+                    curriculo=curriculo, nome=nome, nivel=self.rnd.choice(NIVEIS_HABILIDADE)
+                ))
+
+            for _ in range(self.rnd.randint(0, 2)):
+                ano_inicio = self.rnd.randint(1995, 2022)
+                escolaridades.append(Escolaridade(
+                    curriculo=curriculo,
+                    nivel=self.rnd.choice(NIVEIS_ESCOLARIDADE),
+                    instituicao=f'Instituição {self.rnd.choice(SOBRENOMES)}',
+                    curso=self.rnd.choice(dados['cursos']),
+                    ano_inicio=ano_inicio,
+                    ano_conclusao=ano_inicio + self.rnd.randint(1, 5),
+                    situacao='concluido',
+                ))
+
+            for idioma in self.rnd.sample(IDIOMAS, self.rnd.randint(0, 2)):
+                idiomas.append(Idioma(
+                    curriculo=curriculo,
+                    idioma=idioma,
+                    nivel_leitura=self.rnd.choice(NIVEIS_IDIOMA),
+                    nivel_escrita=self.rnd.choice(NIVEIS_IDIOMA),
+                    nivel_conversacao=self.rnd.choice(NIVEIS_IDIOMA),
+                ))
+
+            if self.rnd.random() < 0.7:
+                outras = self.rnd.sample([a for a in AREAS if a != area], self.rnd.randint(0, 1))
+                preferencias.append(TipoVagaProcurada(
+                    curriculo=curriculo,
+                    areas_interesse=', '.join([area] + outras),
+                    cargos_interesse=', '.join(self.rnd.sample(dados['cargos'], 2)),
+                    tipo_contrato=self.rnd.choice(TIPOS_CONTRATO[:3]),
+                    jornada_trabalho=self.rnd.choice(JORNADAS),
+                    salario_minimo=curriculo.pretensao_salarial,
+                    aceita_viagem=curriculo.disponibilidade_viagem,
+                    aceita_mudanca=curriculo.disponibilidade_mudanca,
+                ))
+
+        ExperienciaProfissional.objects.bulk_create(experiencias, batch_size=self.lote)
+        Habilidade.objects.bulk_create(habilidades, batch_size=self.lote)
+        Escolaridade.objects.bulk_create(escolaridades, batch_size=self.lote)
+        Idioma.objects.bulk_create(idiomas, batch_size=self.lote)
+        TipoVagaProcurada.objects.bulk_create(preferencias, batch_size=self.lote)
+        return curriculos
+
+    def _criar_vagas(self, quantidade: int, empresas):
+        if not empresas:
+            return []
+
+        vagas = []
+        for i in range(quantidade):
+            area = self.rnd.choice(list(AREAS))
+            dados = AREAS[area]
+            habilidades = self.rnd.sample(dados['habilidades'], 3)
+            salario_min = self.rnd.randrange(1400, 9000, 100)
+            vagas.append(Vaga(
+                empresa=empresas[i % len(empresas)],
+                titulo=self.rnd.choice(dados['cargos']),
+                descricao=f'Vaga na área de {area}. Conhecimentos em {", ".join(habilidades)}.',
+                requisitos=', '.join(habilidades + self.rnd.sample(dados['habilidades'], 2)),
+                salario_min=Decimal(salario_min) if self.rnd.random() < 0.8 else None,
+                salario_max=Decimal(salario_min + self.rnd.randrange(500, 6000, 100)) if self.rnd.random() < 0.7 else None,
+                tipo_contrato=self.rnd.choice(TIPOS_CONTRATO),
+                jornada_trabalho=self.rnd.choice(JORNADAS),
+                local_trabalho=self.rnd.choice(CIDADES),
+                aceita_remoto=self.rnd.random() < 0.2,
+                area=area,
+                nivel_experiencia=self.rnd.choice(NIVEIS_EXPERIENCIA),
+                escolaridade_minima=self.rnd.choice(ESCOLARIDADES_MINIMAS),
+                experiencia_minima=self.rnd.randint(0, 5),
+            ))
+        for vaga in vagas:
+            vaga.latitude, vaga.longitude = coordenadas(vaga.local_trabalho)
+        vagas = Vaga.objects.bulk_create(vagas, batch_size=self.lote)
+
+        requisitos = []
+        for vaga in vagas:
+            dados = AREAS[vaga.area]
+            for nome in self.rnd.sample(dados['habilidades'], self.rnd.randint(1, 4)):
+                requisitos.append(RequisitoVaga(
+                    vaga=vaga,
+                    tipo='habilidade',
+                    descricao=nome,
+                    nivel_importancia=self.rnd.choice(['obrigatorio', 'desejavel', 'diferencial']),
+                    peso=self.rnd.randint(1, 10),
+                ))
+            if self.rnd.random() < 0.3:
+                requisitos.append(RequisitoVaga(
+                    vaga=vaga, tipo='habilitacao', descricao='CNH categoria B',
+                    nivel_importancia=self.rnd.choice(['obrigatorio', 'desejavel']), peso=self.rnd.randint(1, 5),
+                ))
+        RequisitoVaga.objects.bulk_create(requisitos, batch_size=self.lote)
+        return vagas
@@ -0,0 +1,92 @@
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from .configuracao import configuracao_atual, limpar_cache, recalcular_scores
+from .engine import MatchingEngine
+from .models import ConfiguracaoMatching, MatchingJob
+
+
+def agendar_matching(vaga, solicitado_por=None) -> MatchingJob:
+    """Cria um job de matching e o enfileira após o commit da transação atual"""
+    job = MatchingJob.objects.create(vaga=vaga, solicitado_por=solicitado_por)
+    transaction.on_commit(lambda: executar_matching_job.delay(job.id))
+    return job
+
+
+@shared_task
+def executar_matching_job(job_id):
+    """Executa o matching de uma vaga em background e registra o histórico"""
+    job = MatchingJob.objects.select_related('vaga').get(id=job_id)
+    
+    MatchingJob.objects.filter(id=job.id).update(
+        status='executando',
+        task_id=executar_matching_job.request.id or '',
+        data_inicio=timezone.now()
+    )
+    
+    # Chamado a cada lote de candidatos pontuados
+    def atualizar_progresso(processados, total):
+        MatchingJob.objects.filter(id=job.id).update(
+            candidatos_processados=processados,
+            total_candidatos=total
+        )
+    
+    try:
+        matching_engine = MatchingEngine()
+        resultados = matching_engine.calcular_matching_vaga(
+            job.vaga, callback_progresso=atualizar_progresso
+        )
+        historico = matching_engine.registrar_historico(job.vaga, resultados)
+    except Exception as e:
+        MatchingJob.objects.filter(id=job.id).update(
+            status='erro',
+            mensagem_erro=str(e),
+            data_fim=timezone.now()
+        )
+        raise
+    
+    MatchingJob.objects.filter(id=job.id).update(
+        status='concluido',
+        total_candidatos=matching_engine.estatisticas_execucao['total_candidatos'],
+        candidatos_processados=matching_engine.estatisticas_execucao['total_candidatos'],
+        historico=historico,
+        data_fim=timezone.now()
+    )
+    return historico.id
+
+
+@shared_task
+def processar_pendencias_matching(limite=500):
+    """Recalcula os pares (vaga, currículo) marcados como pendentes"""
+    from .pendencias import processar_pendencias
+    
+    return processar_pendencias(limite=limite)
+
+
+@shared_task
+def rematch_noturno():
+    """Rematch completo de todas as vagas ativas (ver manage.py rematch_matching)"""
+    from .rematch import em_execucao, executar_rematch
+    
+    if em_execucao() is not None:
+        return None
+    return executar_rematch().id
+
+
+@shared_task
+def recalcular_scores_configuracao(versao):
+    """Recalcula score_total dos resultados gravados com os pesos de uma nova versão"""
+    # O cache do worker ainda pode ter a versão anterior
+    limpar_cache()
+    configuracao = ConfiguracaoMatching.objects.filter(versao=versao).first()
+    # Uma versão mais nova agenda o próprio recálculo
+    if configuracao is None or configuracao.versao != configuracao_atual().versao:
+        return 0
+    
+    # Versões que só mudam limiares não alteram score_total
+    anterior = ConfiguracaoMatching.objects.filter(versao__lt=versao).first()
+    if anterior is not None and anterior.pesos == configuracao.pesos:
+        return 0
+    
+    return recalcular_scores(configuracao)
@@ -0,0 +1,206 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from curriculos.models import Curriculo, Escolaridade, Habilidade
+from usuarios.models import CustomUser
+from vagas.models import RequisitoVaga, Vaga
+from .configuracao import CAMPOS_PESO, nova_versao
+from .engine import MatchingEngine
+from .models import MatchingJob, MatchingPendente, MatchingResult
+from .paralelo import parametros_pontuacao, pontuar_shard, serializar_vaga
+from .pendencias import RESERVA_EXPIRA_EM, _registrar, processar_pendencias
+from .requisitos import compilar_requisitos
+from .restricoes import aplicar_restricoes, vagas_bloqueadas
+from .tasks import executar_matching_job
+
+
+def requisito(tipo, descricao, importancia, peso=1):
+    return RequisitoVaga(tipo=tipo, descricao=descricao, nivel_importancia=importancia, peso=peso)
+
+
+class PlanoRequisitosTests(SimpleTestCase):
+    def setUp(self):
+        self.plano = compilar_requisitos([
+            requisito('habilidade', 'Python', 'obrigatorio', peso=3),
+            requisito('habilidade', 'Django', 'desejavel', peso=2),
+            requisito('habilitacao', 'CNH B', 'obrigatorio'),
+            requisito('escolaridade', 'Ensino superior', 'obrigatorio'),
+        ])
+
+    def test_todos_os_obrigatorios_atendidos(self):
+        resultado = self.plano.avaliar(['python', 'django rest'], True, 7)
+        self.assertEqual(resultado['requisitos_atendidos'], {'obrigatorios': 3, 'desejaveis': 1, 'diferenciais': 0})
+        self.assertTrue(resultado['obrigatorios_atendidos'])
+        self.assertEqual(resultado['pontuacao_requisitos'], 1.0)
+
+    def test_piso_nao_atendido_zera_a_pontuacao_e_mantem_as_contagens(self):
+        for tem_habilitacao, nivel in ((False, 7), (True, 4)):
+            with self.subTest(tem_habilitacao=tem_habilitacao, nivel=nivel):
+                resultado = self.plano.avaliar(['python', 'django'], tem_habilitacao, nivel)
+                self.assertFalse(resultado['obrigatorios_atendidos'])
+                self.assertEqual(resultado['pontuacao_requisitos'], 0.0)
+                # As habilidades continuam contadas para exibição
+                self.assertEqual(resultado['requisitos_atendidos']['desejaveis'], 1)
+
+    def test_termo_obrigatorio_ausente(self):
+        resultado = self.plano.avaliar(['django'], True, 7)
+        self.assertFalse(resultado['obrigatorios_atendidos'])
+        self.assertEqual(resultado['requisitos_atendidos']['obrigatorios'], 2)
+
+    def test_sem_requisitos_de_habilidade_nao_busca_termos(self):
+        plano = compilar_requisitos([requisito('habilitacao', 'CNH B', 'obrigatorio')])
+        automato = mock.Mock()
+        resultado = plano._replace(automato=automato).avaliar(['python'], False, 7)
+        automato.encontrar.assert_not_called()
+        self.assertFalse(resultado['obrigatorios_atendidos'])
+
+    def test_requisito_nao_verificavel_nao_bloqueia(self):
+        plano = compilar_requisitos([requisito('idioma', 'Inglês', 'obrigatorio')])
+        resultado = plano.avaliar([], False, 0)
+        self.assertTrue(resultado['obrigatorios_atendidos'])
+        self.assertEqual(resultado['pontuacao_requisitos'], 1.0)
+
+
+class NovaVersaoConfiguracaoTests(TestCase):
+    def test_pesos_sao_normalizados_para_somar_um(self):
+        configuracao = nova_versao(peso_texto=0.2)
+        self.assertAlmostEqual(sum(getattr(configuracao, campo) for campo in CAMPOS_PESO), 1.0)
+        # As proporções informadas são mantidas
+        self.assertAlmostEqual(configuracao.peso_texto / configuracao.peso_habilidades, 0.2 / 0.25)
+
+    def test_pesos_que_ja_somam_um_sao_mantidos(self):
+        configuracao = nova_versao(peso_experiencia=0.2, peso_habilidades=0.3, peso_escolaridade=0.1,
+                                   peso_localizacao=0.2, peso_salario=0.1, peso_texto=0.1)
+        self.assertEqual(configuracao.peso_habilidades, 0.3)
+        self.assertEqual(configuracao.peso_texto, 0.1)
+
+    def test_pesos_zerados_sao_rejeitados(self):
+        with self.assertRaises(ValueError):
+            nova_versao(**{campo: 0 for campo in CAMPOS_PESO})
+
+
+class PontuarShardTests(SimpleTestCase):
+    """SimpleTestCase falha em qualquer consulta ao banco"""
+
+    def test_worker_nao_consulta_configuracao_nem_banco(self):
+        configuracao = mock.Mock(pesos={
+            'experiencia': 0.3, 'habilidades': 0.3, 'escolaridade': 0.1,
+            'localizacao': 0.1, 'salario': 0.1, 'texto': 0.1,
+        })
+        with mock.patch('matching.engine.configuracao_atual', return_value=configuracao):
+            parametros = parametros_pontuacao(MatchingEngine(raio_local_km=10, raio_deslocamento_km=50))
+        vaga = Vaga(id=1, titulo='Desenvolvedor Python', descricao='', requisitos='python',
+                    nivel_experiencia='junior', latitude=-23.55, longitude=-46.63)
+        registro = (7, 70, [], ['python'], 5, [], True, '', -23.55, -46.63, False, False, None, '')
+
+        with mock.patch('matching.engine.configuracao_atual', side_effect=AssertionError('consultou a configuração')):
+            itens, avaliados, _, _ = pontuar_shard(serializar_vaga(vaga), [registro], parametros, 10, 0.0)
+
+        self.assertEqual(avaliados, 1)
+        self.assertEqual([item[0] for item in itens], [7])
+        self.assertEqual(parametros['raio_local_km'], 10)
+        self.assertEqual(parametros['pesos']['experiencia'], 0.3)
+
+
+def criar_curriculo(nome, niveis=(), habilidades=()):
+    trabalhador = CustomUser.objects.create(username=nome, email=f'{nome}@exemplo.com', tipo_usuario='trabalhador',
+                                            cpf_cnpj=nome, aprovado=True)
+    curriculo = Curriculo.objects.create(trabalhador=trabalhador, objetivo='', resumo_profissional='')
+    for nivel in niveis:
+        Escolaridade.objects.create(curriculo=curriculo, nivel=nivel, instituicao='', curso='',
+                                    ano_inicio=2010, situacao='concluido')
+    for habilidade in habilidades:
+        Habilidade.objects.create(curriculo=curriculo, nome=habilidade, nivel='avancado')
+    return curriculo
+
+
+class RestricaoEscolaridadeTests(TestCase):
+    def setUp(self):
+        self.superior = criar_curriculo('superior', ['medio_completo', 'superior_completo'])
+        self.medio = criar_curriculo('medio', ['medio_completo'])
+        self.sem_escolaridade = criar_curriculo('sem_escolaridade')
+        self.vaga = Vaga(id=1, escolaridade_minima='superior')
+
+    def test_sem_escolaridade_cadastrada_e_mantido(self):
+        curriculos, estatisticas = aplicar_restricoes(Curriculo.objects.all(), self.vaga, ['escolaridade'])
+        self.assertEqual(set(curriculos), {self.superior, self.sem_escolaridade})
+        self.assertEqual(estatisticas['candidatos_descartados'], 1)
+
+    def test_vagas_bloqueadas(self):
+        self.assertEqual(vagas_bloqueadas(self.medio, [self.vaga], ['escolaridade']), {1})
+        self.assertEqual(vagas_bloqueadas(self.sem_escolaridade, [self.vaga], ['escolaridade']), set())
+
+
+def criar_vaga():
+    empresa = CustomUser.objects.create(username='empresa', email='empresa@exemplo.com', tipo_usuario='empresa',
+                                        cpf_cnpj='empresa', aprovado=True)
+    return Vaga.objects.create(
+        empresa=empresa, titulo='Desenvolvedor', descricao='Desenvolvimento de APIs', requisitos='Python e SQL',
+        tipo_contrato='clt', jornada_trabalho='integral', local_trabalho='Campinas - SP', area='tecnologia',
+        nivel_experiencia='junior',
+    )
+
+
+class PreFiltroHabilidadesTests(TestCase):
+    def setUp(self):
+        self.vaga = criar_vaga()
+        self.relacionado = criar_curriculo('relacionado', habilidades=['Python'])
+        self.sem_relacao = criar_curriculo('sem_relacao', habilidades=['Culinária'])
+
+    def executar_job(self):
+        executar_matching_job(MatchingJob.objects.create(vaga=self.vaga).id)
+        return set(MatchingResult.objects.filter(vaga=self.vaga).values_list('trabalhador_id', flat=True))
+
+    def test_sem_a_setting_todos_sao_pontuados(self):
+        self.assertEqual(self.executar_job(), {self.relacionado.trabalhador_id, self.sem_relacao.trabalhador_id})
+
+    def test_setting_liga_o_pre_filtro_no_job(self):
+        self.executar_job()
+        with override_settings(MATCHING_PRE_FILTRO_HABILIDADES=True):
+            # O resultado anterior de quem ficou de fora é removido
+            self.assertEqual(self.executar_job(), {self.relacionado.trabalhador_id})
+
+
+class ProcessarPendenciasTests(TestCase):
+    def setUp(self):
+        self.vaga = criar_vaga()
+        self.curriculo = criar_curriculo('candidato', habilidades=['Python'])
+        self.pendencia = MatchingPendente.objects.create(vaga=self.vaga, curriculo=self.curriculo)
+
+    def test_pendencia_removida_depois_do_recalculo(self):
+        estatisticas = processar_pendencias()
+        self.assertEqual((estatisticas['pares'], estatisticas['restantes']), (1, 0))
+        self.assertFalse(MatchingPendente.objects.exists())
+        self.assertTrue(MatchingResult.objects.filter(vaga=self.vaga).exists())
+
+    def test_erro_no_recalculo_libera_a_pendencia(self):
+        with mock.patch.object(MatchingEngine, 'calcular_matching_vaga', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                processar_pendencias()
+        self.pendencia.refresh_from_db()
+        self.assertIsNone(self.pendencia.data_reserva)
+
+    def test_reserva_expirada_e_retomada(self):
+        MatchingPendente.objects.update(data_reserva=timezone.now() - RESERVA_EXPIRA_EM * 2)
+        self.assertEqual(processar_pendencias()['pendencias'], 1)
+        self.assertFalse(MatchingPendente.objects.exists())
+
+    def test_reserva_ativa_e_pulada(self):
+        MatchingPendente.objects.update(data_reserva=timezone.now())
+        self.assertEqual(processar_pendencias()['pendencias'], 0)
+        self.assertTrue(MatchingPendente.objects.exists())
+
+    def test_marcacao_durante_o_recalculo_mantem_a_pendencia(self):
+        calcular = MatchingEngine.calcular_matching_vaga
+
+        def alterar_durante(engine, vaga, **kwargs):
+            _registrar(self.vaga.id, self.curriculo.id, 'alteração durante o recálculo')
+            return calcular(engine, vaga, **kwargs)
+
+        with mock.patch.object(MatchingEngine, 'calcular_matching_vaga', alterar_durante):
+            processar_pendencias()
+        self.pendencia.refresh_from_db()
+        self.assertIsNone(self.pendencia.data_reserva)
+        self.assertEqual(self.pendencia.motivo, 'alteração durante o recálculo')
@@ -0,0 +1,146 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from django.db.models import Avg, Count
+
+from vagas.models import Vaga
+from .models import CurriculoFeatures, TermoTexto
+
+# Parâmetros do BM25
+K1 = 1.2
+B = 0.75
+
+TAMANHO_MAXIMO_TERMO = 100
+
+STOPWORDS = {
+    'a', 'ao', 'aos', 'as', 'com', 'como', 'da', 'das', 'de', 'do', 'dos', 'e', 'em', 'entre',
+    'ate', 'essa', 'esse', 'esta', 'este', 'eu', 'foi', 'ha', 'isso', 'ja', 'la', 'mais',
+    'mas', 'me', 'meu', 'minha', 'muito', 'na', 'nas', 'no', 'nos', 'o', 'os', 'ou', 'para',
+    'pela', 'pelas', 'pelo', 'pelos', 'por', 'que', 'se', 'sem', 'ser', 'seu', 'sua', 'sao',
+    'tambem', 'tem', 'um', 'uma', 'umas', 'uns',
+}
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Termos do texto: minúsculas, sem acentos, sem stopwords"""
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return [
+        termo[:TAMANHO_MAXIMO_TERMO] for termo in re.findall(r'[a-z0-9]+', texto.lower())
+        if len(termo) > 1 and termo not in STOPWORDS
+    ]
+
+
+def frequencias_curriculo(curriculo) -> Tuple[Dict[str, int], int]:
+    """Frequência de cada termo do currículo e o total de termos.
+
+    Usa objetivo, resumo profissional, descrições das experiências e nomes das
+    habilidades; espera experiências e habilidades já carregadas.
+    """
+    textos = [curriculo.objetivo, curriculo.resumo_profissional]
+    textos += [experiencia.descricao for experiencia in curriculo.experiencias.all()]
+    textos += [habilidade.nome for habilidade in curriculo.habilidades.all()]
+    frequencias = Counter(termo for texto in textos for termo in tokenizar(texto))
+    return dict(frequencias), sum(frequencias.values())
+
+
+def termos_vaga(vaga: Vaga) -> List[str]:
+    """Termos distintos da vaga usados como consulta, em ordem"""
+    return sorted(set(tokenizar(f'{vaga.titulo} {vaga.descricao} {vaga.requisitos} {vaga.area}')))
+
+
+def entradas_texto(features_list: Iterable[CurriculoFeatures]) -> List[TermoTexto]:
+    """Entradas do índice invertido de texto dos currículos informados"""
+    return [
+        TermoTexto(termo=termo, curriculo_id=features.curriculo_id, frequencia=frequencia)
+        for features in features_list
+        for termo, frequencia in features.termos_texto.items()
+    ]
+
+
+class RelevanciaTexto:
+    """Relevância BM25 dos currículos indexados para o texto de uma vaga.
+
+    As estatísticas do corpus (documentos, comprimento médio e frequência de
+    documento de cada termo da vaga) são lidas do índice na criação, então
+    refletem sempre as últimas atualizações incrementais. O score é dividido
+    pelo máximo teórico da consulta (cada termo com idf * (K1 + 1)) e fica
+    entre 0 e 1.
+    """
+
+    def __init__(self, vaga: Vaga):
+        self.termos = termos_vaga(vaga)
+        corpus = CurriculoFeatures.objects.filter(comprimento_texto__gt=0).aggregate(
+            documentos=Count('pk'), comprimento_medio=Avg('comprimento_texto')
+        )
+        self.documentos = corpus['documentos']
+        self.comprimento_medio = corpus['comprimento_medio'] or 0.0
+
+        frequencia_documentos = dict(
+            TermoTexto.objects.filter(termo__in=self.termos).values('termo')
+            .annotate(documentos=Count('id')).values_list('termo', 'documentos')
+        )
+        # idf do BM25 com +1, sempre positivo; termos fora do corpus não contam
+        self.idf = {
+            termo: math.log(1 + (self.documentos - df + 0.5) / (df + 0.5))
+            for termo, df in sorted(frequencia_documentos.items())
+        }
+        self.maximo = sum(idf * (K1 + 1) for idf in self.idf.values())
+        self._scores = None
+
+    def score(self, frequencias: Dict[str, int], comprimento: int) -> float:
+        """Relevância de um documento a partir das frequências dos seus termos"""
+        if not self.maximo:
+            return 0.0
+        saturacao = K1 * (1 - B + B * comprimento / self.comprimento_medio)
+        total = 0.0
+        for termo in sorted(frequencias.keys() & self.idf.keys()):
+            tf = frequencias[termo]
+            total += self.idf[termo] * tf * (K1 + 1) / (tf + saturacao)
+        return min(total / self.maximo, 1.0)
+
+    def scores(self) -> Dict[int, float]:
+        """Relevância de todos os currículos com algum termo da vaga, por curriculo_id.
+
+        Um produto esparso matriz-vetor: as entradas do índice dos termos da
+        vaga são lidas em uma consulta e somadas por documento com NumPy, na
+        mesma ordem de termos de `score` para que os valores sejam idênticos.
+        O resultado é memorizado: a vaga é pontuada em vários lotes.
+        """
+        if self._scores is None:
+            self._scores = self._calcular_scores()
+        return self._scores
+
+    def _calcular_scores(self) -> Dict[int, float]:
+        if not self.maximo:
+            return {}
+        termos = sorted(self.idf)
+        posicao = {termo: i for i, termo in enumerate(termos)}
+        entradas = list(
+            TermoTexto.objects.filter(termo__in=termos).values_list(
+                'curriculo_id', 'termo', 'frequencia', 'curriculo__features__comprimento_texto'
+            )
+        )
+        if not entradas:
+            return {}
+
+        curriculo_ids = np.array([entrada[0] for entrada in entradas], dtype=np.int64)
+        indices_termos = np.array([posicao[entrada[1]] for entrada in entradas], dtype=np.int64)
+        tf = np.array([entrada[2] for entrada in entradas], dtype=float)
+        comprimento = np.array([entrada[3] or 0 for entrada in entradas], dtype=float)
+
+        ordem = np.lexsort((indices_termos, curriculo_ids))
+        curriculo_ids, indices_termos = curriculo_ids[ordem], indices_termos[ordem]
+        tf, comprimento = tf[ordem], comprimento[ordem]
+
+        idf = np.array([self.idf[termo] for termo in termos])[indices_termos]
+        saturacao = K1 * (1 - B + B * comprimento / self.comprimento_medio)
+        contribuicoes = idf * tf * (K1 + 1) / (tf + saturacao)
+
+        documentos, documento = np.unique(curriculo_ids, return_inverse=True)
+        totais = np.bincount(documento, weights=contribuicoes, minlength=len(documentos))
+        relevancias = np.minimum(totais / self.maximo, 1.0)
+        return dict(zip(documentos.tolist(), relevancias.tolist()))
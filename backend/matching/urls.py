@@ -4,6 +4,11 @@ from . import views
 urlpatterns = [
     path('vagas-recomendadas/', views.VagasRecomendadasView.as_view(), name='vagas_recomendadas'),
     path('executar/<int:vaga_id>/', views.executar_matching_vaga, name='executar_matching_vaga'),
+    path('previa/', views.previa_matching, name='previa_matching'),
+    path('simular/<int:vaga_id>/', views.simular_pesos_vaga, name='simular_pesos_vaga'),
+    path('jobs/<int:job_id>/', views.status_matching_job, name='status_matching_job'),
+    path('jobs/<int:job_id>/progresso/', views.progresso_matching_job, name='progresso_matching_job'),
+    path('configuracao/', views.ConfiguracaoMatchingView.as_view(), name='configuracao_matching'),
     path('estatisticas/', views.estatisticas_matching, name='estatisticas_matching'),
     path('historico/', views.HistoricoMatchingView.as_view(), name='historico_matching'),
     path('trabalhador/<int:trabalhador_id>/', views.detalhes_matching_trabalhador, name='detalhes_matching_trabalhador'),
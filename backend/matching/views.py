@@ -2,23 +2,48 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
-from .models import MatchingResult, HistoricoMatching
-from .serializers import MatchingResultSerializer, HistoricoMatchingSerializer
+from .models import MatchingResult, HistoricoMatching, MatchingJob, ConfiguracaoMatching
+from .serializers import (
+    MatchingResultSerializer, HistoricoMatchingSerializer, MatchingJobSerializer,
+    SimulacaoPesosSerializer, ConfiguracaoMatchingSerializer, PreviaMatchingSerializer
+)
+from .configuracao import nova_versao
 from .engine import MatchingEngine
+from .estatisticas import obter_estatisticas
+from .exportacao import exportar_ndjson, quer_ndjson
+from .paginacao import PaginacaoHistorico, PaginacaoMatching
+from .tasks import agendar_matching
+from usuarios.models import CustomUser
 from vagas.models import Vaga
 
+def com_relacionados(matches):
+    """Carrega junto os objetos aninhados em MatchingResultSerializer"""
+    return matches.select_related(
+        'trabalhador', 'vaga__empresa__perfil_empresa'
+    ).prefetch_related('vaga__requisitos_detalhados')
+
 class VagasRecomendadasView(generics.ListAPIView):
-    """Lista vagas recomendadas para o trabalhador logado"""
+    """Lista vagas recomendadas para o trabalhador logado (?formato=ndjson exporta todas)"""
     serializer_class = MatchingResultSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PaginacaoMatching
     
     def get_queryset(self):
         if self.request.user.tipo_usuario != 'trabalhador':
             return MatchingResult.objects.none()
         
         matching_engine = MatchingEngine()
-        return matching_engine.get_vagas_recomendadas(self.request.user, limit=20)
+        return matching_engine.get_vagas_recomendadas(self.request.user, limit=None)
+    
+    def list(self, request, *args, **kwargs):
+        if quer_ndjson(request):
+            return exportar_ndjson(self.get_queryset(), 'vagas_recomendadas.ndjson')
+        return super().list(request, *args, **kwargs)
+    
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(com_relacionados(queryset))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -34,68 +59,194 @@ def executar_matching_vaga(request, vaga_id):
         return Response({'error': 'Você só pode executar matching para suas próprias vagas.'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
+    job = agendar_matching(vaga, solicitado_por=request.user)
+    
+    return Response({
+        'message': 'Matching agendado com sucesso!',
+        'job_id': job.id,
+        'status': job.status
+    }, status=status.HTTP_202_ACCEPTED)
+
+def _get_job_permitido(request, job_id):
+    """Retorna o job se o usuário puder acompanhá-lo, ou None"""
+    job = get_object_or_404(MatchingJob.objects.select_related('vaga'), id=job_id)
+    
+    if request.user.tipo_usuario == 'admin':
+        return job
+    if request.user.tipo_usuario == 'empresa' and job.vaga.empresa_id == request.user.id:
+        return job
+    return None
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def status_matching_job(request, job_id):
+    """Retorna o status completo de um job de matching"""
+    job = _get_job_permitido(request, job_id)
+    if job is None:
+        return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response(MatchingJobSerializer(job).data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def progresso_matching_job(request, job_id):
+    """Retorna apenas o progresso de um job de matching"""
+    job = _get_job_permitido(request, job_id)
+    if job is None:
+        return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response({
+        'job_id': job.id,
+        'status': job.status,
+        'progresso': job.progresso,
+        'candidatos_processados': job.candidatos_processados,
+        'total_candidatos': job.total_candidatos
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def simular_pesos_vaga(request, vaga_id):
+    """Reordena os candidatos já pontuados de uma vaga com pesos alternativos"""
+    if request.user.tipo_usuario not in ['admin', 'empresa']:
+        return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    vaga = get_object_or_404(Vaga, id=vaga_id)
+    
+    if request.user.tipo_usuario == 'empresa' and request.user != vaga.empresa:
+        return Response({'error': 'Você só pode simular pesos para suas próprias vagas.'}, 
+                       status=status.HTTP_403_FORBIDDEN)
+    
+    serializer = SimulacaoPesosSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    
     matching_engine = MatchingEngine()
-    resultados = matching_engine.calcular_matching_vaga(vaga)
+    pesos = serializer.pesos(matching_engine.pesos)
+    ranking = matching_engine.simular_ranking(vaga, pesos, limit=serializer.validated_data['limit'])
     
-    # Criar histórico
-    HistoricoMatching.objects.create(
-        vaga=vaga,
-        total_candidatos=len(resultados),
-        candidatos_compatíveis=len([r for r in resultados if r.score_total >= 0.5]),
-        score_medio=sum([r.score_total for r in resultados]) / len(resultados) if resultados else 0,
-        parametros_utilizados=matching_engine.pesos
-    )
+    candidatos = []
+    for posicao, match in enumerate(ranking, start=1):
+        candidatos.append({
+            'posicao': posicao,
+            'posicao_atual': match.posicao_atual,
+            'trabalhador': {
+                'id': match.trabalhador.id,
+                'nome': match.trabalhador.get_full_name(),
+            },
+            'score_simulado': round(match.score_simulado, 4),
+            'score_total': match.score_total,
+            'scores': {
+                'experiencia': match.score_experiencia,
+                'habilidades': match.score_habilidades,
+                'escolaridade': match.score_escolaridade,
+                'localizacao': match.score_localizacao,
+                'salario': match.score_salario,
+                'texto': match.score_texto,
+            },
+        })
     
     return Response({
-        'message': 'Matching executado com sucesso!',
-        'total_candidatos': len(resultados),
-        'candidatos_compatíveis': len([r for r in resultados if r.score_total >= 0.5])
+        'vaga_id': vaga.id,
+        'pesos': pesos,
+        'candidatos': candidatos
     })
 
-@api_view(['GET'])
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def estatisticas_matching(request):
-    """Retorna estatísticas gerais do matching"""
-    if request.user.tipo_usuario != 'admin':
+def previa_matching(request):
+    """Pontua um rascunho de vaga e retorna os melhores candidatos, sem gravar resultados"""
+    if request.user.tipo_usuario not in ['admin', 'empresa']:
         return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
     
-    total_matches = MatchingResult.objects.count()
-    matches_alta_compatibilidade = MatchingResult.objects.filter(score_total__gte=0.7).count()
-    matches_media_compatibilidade = MatchingResult.objects.filter(
-        score_total__gte=0.5, score_total__lt=0.7
-    ).count()
+    serializer = PreviaMatchingSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    vaga, requisitos = serializer.construir()
+    
+    matching_engine = MatchingEngine()
+    ranking = matching_engine.previa_vaga(vaga, requisitos, limit=serializer.validated_data['limit'])
+    trabalhadores = CustomUser.objects.in_bulk([trabalhador_id for trabalhador_id, _ in ranking])
     
-    # Score médio geral
-    scores = MatchingResult.objects.values_list('score_total', flat=True)
-    score_medio = sum(scores) / len(scores) if scores else 0
+    candidatos = []
+    for posicao, (trabalhador_id, score_data) in enumerate(ranking, start=1):
+        trabalhador = trabalhadores[trabalhador_id]
+        candidatos.append({
+            'posicao': posicao,
+            'trabalhador': {
+                'id': trabalhador.id,
+                'nome': trabalhador.get_full_name(),
+            },
+            'score_total': score_data['score_total'],
+            'scores': {
+                'experiencia': score_data['score_experiencia'],
+                'habilidades': score_data['score_habilidades'],
+                'escolaridade': score_data['score_escolaridade'],
+                'localizacao': score_data['score_localizacao'],
+                'salario': score_data['score_salario'],
+                'texto': score_data['score_texto'],
+            },
+            'detalhes_matching': score_data['detalhes_matching'],
+        })
     
     return Response({
-        'total_matches': total_matches,
-        'alta_compatibilidade': matches_alta_compatibilidade,
-        'media_compatibilidade': matches_media_compatibilidade,
-        'baixa_compatibilidade': total_matches - matches_alta_compatibilidade - matches_media_compatibilidade,
-        'score_medio_geral': round(score_medio, 2)
+        'estatisticas': matching_engine.estatisticas_execucao,
+        'candidatos': candidatos
     })
 
+class ConfiguracaoMatchingView(generics.ListCreateAPIView):
+    """Lista as versões da configuração de matching e cria novas (apenas admin).
+    
+    Uma nova versão com pesos diferentes recalcula em background o
+    score_total dos resultados gravados a partir dos componentes.
+    """
+    serializer_class = ConfiguracaoMatchingSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        if self.request.user.tipo_usuario != 'admin':
+            raise PermissionDenied('Apenas administradores podem gerenciar a configuração de matching.')
+        return ConfiguracaoMatching.objects.all()
+    
+    def perform_create(self, serializer):
+        if self.request.user.tipo_usuario != 'admin':
+            raise PermissionDenied('Apenas administradores podem gerenciar a configuração de matching.')
+        serializer.instance = nova_versao(criado_por=self.request.user, **serializer.validated_data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def estatisticas_matching(request):
+    """Retorna estatísticas gerais do matching"""
+    if request.user.tipo_usuario != 'admin':
+        return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response(obter_estatisticas())
+
 class HistoricoMatchingView(generics.ListAPIView):
     """Lista histórico de execuções de matching"""
     serializer_class = HistoricoMatchingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PaginacaoHistorico
     
     def get_queryset(self):
         user = self.request.user
         
         if user.tipo_usuario == 'admin':
-            return HistoricoMatching.objects.all().order_by('-data_execucao')
+            queryset = HistoricoMatching.objects.all()
         elif user.tipo_usuario == 'empresa':
-            return HistoricoMatching.objects.filter(vaga__empresa=user).order_by('-data_execucao')
+            queryset = HistoricoMatching.objects.filter(vaga__empresa=user)
+        else:
+            return HistoricoMatching.objects.none()
+        
+        # Apenas execuções com instrumentação registrada
+        if self.request.query_params.get('instrumentado') in ('1', 'true'):
+            queryset = queryset.filter(parametros_utilizados__has_key='instrumentacao')
         
-        return HistoricoMatching.objects.none()
+        return queryset.select_related(
+            'vaga__empresa__perfil_empresa'
+        ).prefetch_related('vaga__requisitos_detalhados').order_by('-data_execucao')
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def detalhes_matching_trabalhador(request, trabalhador_id):
-    """Retorna detalhes do matching para um trabalhador específico"""
+    """Retorna os matches de um trabalhador, paginados por cursor (?formato=ndjson exporta todos)"""
     if request.user.tipo_usuario not in ['admin', 'empresa']:
         return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
     
@@ -105,5 +256,10 @@ def detalhes_matching_trabalhador(request, trabalhador_id):
         # Empresa só vê matches das suas vagas
         matches = matches.filter(vaga__empresa=request.user)
     
-    serializer = MatchingResultSerializer(matches.order_by('-score_total'), many=True)
-    return Response(serializer.data)
+    if quer_ndjson(request):
+        return exportar_ndjson(matches, f'matching_trabalhador_{trabalhador_id}.ndjson')
+    
+    paginacao = PaginacaoMatching()
+    pagina = paginacao.paginate_queryset(com_relacionados(matches), request)
+    serializer = MatchingResultSerializer(pagina, many=True)
+    return paginacao.get_paginated_response(serializer.data)
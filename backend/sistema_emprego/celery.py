@@ -0,0 +1,9 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sistema_emprego.settings')
+
+app = Celery('sistema_emprego')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+from celery.schedules import crontab
 from decouple import config
 import os
 
@@ -180,3 +181,63 @@ CORS_ALLOW_CREDENTIALS = True
 
 # Custom User Model
 AUTH_USER_MODEL = 'usuarios.CustomUser'
+
+# Celery
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://redis:6379/0')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://redis:6379/0')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'processar-pendencias-matching': {
+        'task': 'matching.tasks.processar_pendencias_matching',
+        'schedule': 60.0,
+    },
+    'rematch-noturno-matching': {
+        'task': 'matching.tasks.rematch_noturno',
+        'schedule': crontab(hour=config('MATCHING_REMATCH_HORA', default=3, cast=int), minute=0),
+    },
+}
+
+# Cache (sem CACHE_URL usa memória local do processo)
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+
+# Matching
+MATCHING_BULK_BATCH_SIZE = config('MATCHING_BULK_BATCH_SIZE', default=1000, cast=int)
+# Persistir apenas os K melhores por vaga (0 = todos) e/ou acima do score mínimo
+MATCHING_TOP_K = config('MATCHING_TOP_K', default=0, cast=int)
+MATCHING_SCORE_MINIMO = config('MATCHING_SCORE_MINIMO', default=0.0, cast=float)
+# Backend de similaridade textual: sequence_matcher, trigrama ou token. Os
+# limiares do engine foram calibrados com sequence_matcher; os outros mudam os scores
+MATCHING_SIMILARIDADE = config('MATCHING_SIMILARIDADE', default='sequence_matcher')
+# Processos usados para pontuar os candidatos de uma vaga (1 = sem paralelismo)
+MATCHING_WORKERS = config('MATCHING_WORKERS', default=1, cast=int)
+# Restrições eliminatórias aplicadas no banco antes da pontuação, separadas por
+# vírgula: salario, localizacao, escolaridade, area, tipo_contrato (vazio = nenhuma)
+MATCHING_RESTRICOES = config('MATCHING_RESTRICOES', default='')
+# Pontua só os candidatos que compartilham alguma habilidade ou área com a vaga
+# (índice TermoIndice); os demais perdem o resultado no recálculo da vaga
+MATCHING_PRE_FILTRO_HABILIDADES = config('MATCHING_PRE_FILTRO_HABILIDADES', default=False, cast=bool)
+# Distâncias (km) do score de localização: até o raio local o score é máximo e
+# cai linearmente até o raio de deslocamento, que também limita a restrição de
+# localização
+MATCHING_RAIO_LOCAL_KM = config('MATCHING_RAIO_LOCAL_KM', default=30, cast=float)
+MATCHING_RAIO_DESLOCAMENTO_KM = config('MATCHING_RAIO_DESLOCAMENTO_KM', default=100, cast=float)
+# Registra tempo, chamadas e consultas SQL por fase/componente de cada execução
+# em HistoricoMatching.parametros_utilizados['instrumentacao']
+MATCHING_INSTRUMENTACAO = config('MATCHING_INSTRUMENTACAO', default=False, cast=bool)
+# Segundos que a configuração de matching fica em cache em cada processo
+MATCHING_CONFIG_CACHE_TTL = config('MATCHING_CONFIG_CACHE_TTL', default=60, cast=int)
+# Segundos que /api/matching/estatisticas/ fica em cache (invalidado a cada matching)
+MATCHING_ESTATISTICAS_CACHE_TTL = config('MATCHING_ESTATISTICAS_CACHE_TTL', default=30, cast=int)
+# Segundos disponíveis para o rematch completo (MATCHING_REMATCH_HORA no beat);
+# o que faltar é retomado na execução seguinte (0 = sem limite)
+MATCHING_REMATCH_TEMPO_MAXIMO = config('MATCHING_REMATCH_TEMPO_MAXIMO', default=14400, cast=float)
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:16
+
+import csv
+import re
+import unicodedata
+from pathlib import Path
+
+from django.db import migrations, models
+
+# Cópia congelada de core.geo (localidade no fim do endereço) para que a
+# migração não mude junto com o código da aplicação
+ARQUIVO_MUNICIPIOS = Path(__file__).resolve().parents[2] / 'core' / 'dados' / 'municipios.csv'
+UFS = {
+    'ac', 'al', 'ap', 'am', 'ba', 'ce', 'df', 'es', 'go', 'ma', 'mt', 'ms', 'mg', 'pa',
+    'pb', 'pr', 'pe', 'pi', 'rj', 'rn', 'rs', 'ro', 'rr', 'sc', 'sp', 'se', 'to',
+}
+SUFIXOS_IGNORADOS = {'brasil', 'brazil'}
+SEPARADORES = re.compile(r'[,;/\n]|\s[-–]\s')
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.findall(r'[a-z]+', texto.lower()))
+
+
+def _municipios():
+    por_nome = {}
+    with open(ARQUIVO_MUNICIPIOS, encoding='utf-8') as arquivo:
+        for linha in csv.DictReader(arquivo):
+            por_nome.setdefault(_normalizar(linha['municipio']), []).append(
+                (linha['uf'].lower(), float(linha['latitude']), float(linha['longitude']))
+            )
+    return por_nome
+
+
+def _coordenadas(por_nome, endereco):
+    componentes = [c for c in (_normalizar(c) for c in SEPARADORES.split(endereco or '')) if c]
+    while componentes and componentes[-1] in SUFIXOS_IGNORADOS:
+        componentes.pop()
+    if not componentes:
+        return None, None
+    palavras = componentes[-1].split()
+    while palavras and palavras[-1] in SUFIXOS_IGNORADOS:
+        palavras.pop()
+    uf = None
+    if palavras and palavras[-1] in UFS:
+        uf = palavras.pop()
+        if not palavras:
+            componentes.pop()
+            palavras = componentes[-1].split() if componentes else []
+    candidatos = [m for m in por_nome.get(' '.join(palavras), []) if uf is None or m[0] == uf]
+    if not candidatos:
+        return None, None
+    return candidatos[0][1], candidatos[0][2]
+
+
+def geocodificar_perfis(apps, schema_editor):
+    PerfilTrabalhador = apps.get_model('usuarios', 'PerfilTrabalhador')
+    por_nome = _municipios()
+    perfis = list(PerfilTrabalhador.objects.only('id', 'endereco'))
+    for perfil in perfis:
+        perfil.latitude, perfil.longitude = _coordenadas(por_nome, perfil.endereco)
+    PerfilTrabalhador.objects.bulk_update(perfis, ['latitude', 'longitude'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfiltrabalhador',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='perfiltrabalhador',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='perfiltrabalhador',
+            index=models.Index(fields=['latitude', 'longitude'], name='perfil_trab_lat_lon_idx'),
+        ),
+        migrations.RunPython(geocodificar_perfis, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from core.geo import coordenadas
+
 class CustomUser(AbstractUser):
     TIPO_USUARIO_CHOICES = [
         ('admin', 'Administrador'),
@@ -66,6 +68,18 @@ class PerfilTrabalhador(models.Model):
     ])
     linkedin = models.URLField(blank=True)
     foto = models.ImageField(upload_to='fotos_perfil/', blank=True)
+    # Coordenadas do município do endereço (core.geo), preenchidas ao salvar
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='perfil_trab_lat_lon_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.latitude, self.longitude = coordenadas(self.endereco)
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return self.usuario.get_full_name()
@@ -1,4 +1,5 @@
 from django.db import models
+from core.geo import coordenadas
 from usuarios.models import CustomUser
 
 class Vaga(models.Model):
@@ -40,6 +41,9 @@ class Vaga(models.Model):
     tipo_contrato = models.CharField(max_length=15, choices=TIPO_CONTRATO_CHOICES)
     jornada_trabalho = models.CharField(max_length=15, choices=JORNADA_CHOICES)
     local_trabalho = models.CharField(max_length=200)
+    # Coordenadas do município de local_trabalho (core.geo), preenchidas ao salvar
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     aceita_remoto = models.BooleanField(default=False)
     requer_viagem = models.BooleanField(default=False)
     area = models.CharField(max_length=100)
@@ -70,6 +74,10 @@ class Vaga(models.Model):
     class Meta:
         ordering = ['-data_criacao']
     
+    def save(self, *args, **kwargs):
+        self.latitude, self.longitude = coordenadas(self.local_trabalho)
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.titulo} - {self.empresa.perfil_empresa.nome_empresa}"
 
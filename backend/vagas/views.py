@@ -10,6 +10,9 @@ from .serializers import (
     AvaliacaoCandidatoSerializer
 )
 from matching.engine import MatchingEngine
+from matching.exportacao import exportar_ndjson, quer_ndjson
+from matching.paginacao import PaginacaoMatching
+from matching.tasks import agendar_matching
 
 class VagaListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
@@ -72,9 +75,8 @@ class VagaListCreateView(generics.ListCreateAPIView):
         else:
             raise PermissionDenied("Apenas empresas e administradores podem criar vagas.")
         
-        # Executar matching automático
-        matching_engine = MatchingEngine()
-        matching_engine.calcular_matching_vaga(vaga)
+        # Agendar matching automático em background
+        agendar_matching(vaga, solicitado_por=user)
 
 class VagaDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
@@ -123,7 +125,7 @@ def candidatar_vaga(request, vaga_id):
     # Calcular score de compatibilidade
     if hasattr(request.user, 'curriculo'):
         matching_engine = MatchingEngine()
-        score_data = matching_engine._calcular_score_curriculo_vaga(request.user.curriculo, vaga)
+        score_data = matching_engine.pontuar_curriculo(request.user.curriculo, vaga)
         candidatura.score_compatibilidade = score_data['score_total']
         candidatura.save()
     
@@ -196,21 +198,32 @@ class VagasEmpresaView(generics.ListAPIView):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def top_candidatos_vaga(request, vaga_id):
-    """Retorna os melhores candidatos para uma vaga usando o sistema de matching"""
+    """Retorna os melhores candidatos para uma vaga usando o sistema de matching.
+    
+    Paginado por cursor; ?formato=ndjson exporta todos os candidatos.
+    """
     vaga = get_object_or_404(Vaga, id=vaga_id)
     
     if request.user != vaga.empresa and request.user.tipo_usuario != 'admin':
         return Response({'error': 'Acesso negado.'}, status=status.HTTP_403_FORBIDDEN)
     
     matching_engine = MatchingEngine()
-    top_matches = matching_engine.get_top_candidatos(vaga, limit=20)
+    top_matches = matching_engine.get_top_candidatos(vaga, limit=None)
+    if quer_ndjson(request):
+        return exportar_ndjson(top_matches, f'top_candidatos_vaga_{vaga.id}.ndjson')
+    
+    paginacao = PaginacaoMatching()
+    pagina = paginacao.paginate_queryset(top_matches.select_related('trabalhador'), request)
+    candidaturas = {
+        candidatura.trabalhador_id: candidatura
+        for candidatura in CandidaturaVaga.objects.filter(
+            vaga=vaga, trabalhador_id__in=[match.trabalhador_id for match in pagina]
+        )
+    }
     
     resultado = []
-    for match in top_matches:
-        candidatura = CandidaturaVaga.objects.filter(
-            vaga=vaga, 
-            trabalhador=match.trabalhador
-        ).first()
+    for match in pagina:
+        candidatura = candidaturas.get(match.trabalhador_id)
         
         resultado.append({
             'trabalhador': {
@@ -225,10 +238,11 @@ def top_candidatos_vaga(request, vaga_id):
                 'escolaridade': match.score_escolaridade,
                 'localizacao': match.score_localizacao,
                 'salario': match.score_salario,
+                'texto': match.score_texto,
             },
             'candidatou': candidatura is not None,
             'status_candidatura': candidatura.status if candidatura else None,
             'data_candidatura': candidatura.data_candidatura if candidatura else None,
         })
     
-    return Response(resultado)
+    return paginacao.get_paginated_response(resultado)